@@ -4,8 +4,11 @@ import os
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 
+from pure_authentication.metrics import timed
+
 
 class EncryptionServices:
+    @timed("encryption.encrypt")
     def encrypt(self, password: str):
         if not isinstance(password, str):
             raise ValueError(
@@ -20,6 +23,7 @@ class EncryptionServices:
         encrypted_password = encryptor.encrypt(password)
         return encrypted_password
 
+    @timed("encryption.decrypt")
     def decrypt(self, encrypted_password: str) -> str:
         if not isinstance(encrypted_password, str):
             raise ValueError(
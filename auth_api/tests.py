@@ -0,0 +1,25 @@
+import json
+
+from pure_authentication.benchmarks.data import BENCHMARK_PASSWORD
+from pure_authentication.testing import QueryBudgetTestCase
+
+
+class AuthViewQueryBudgetTests(QueryBudgetTestCase):
+    seed = 6
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.data.create_users(1)[0]
+
+    def test_login(self):
+        response = self.client.post(
+            "/auth/api/login", json.dumps({"email": self.user.email, "password": BENCHMARK_PASSWORD}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_user_details(self):
+        response = self.client.generic(
+            "GET", "/auth/api/user_details", json.dumps({"user_id": str(self.user.id)}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
@@ -8,12 +8,14 @@ from cart.models.order_summary import OrderSummary
 @admin.register(Cart)
 class CartAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'created_at')  # add created_at if you have timestamp fields
+    list_select_related = ('user',)
     search_fields = ('user__username',)
 
 @admin.register(CartItem)
 class CartItemAdmin(admin.ModelAdmin):
     list_display = ('id', 'user_name', 'product', 'quantity', 'cart_id')
     list_filter = ('product',)
+    list_select_related = ('product', 'cart__user')
     search_fields = ('cart__user__username', 'product__name')
     
     def user_name(self, obj):
@@ -27,7 +29,7 @@ class CartItemAdmin(admin.ModelAdmin):
 @admin.register(OrderSummary)
 class OrderSummaryAdmin(admin.ModelAdmin):
     list_display = (
-        'id', 'cart_amount', 'cart_item_discount', 'shipping_charge', 'round_of_val',
+        'id', 'cart_amount', 'cart_item_discount', 'cart_item_tax', 'cart_total', 'shipping_charge', 'round_of_val',
         'can_cod', 'total_items', 'total_quantity', 'payment_method', 'currency', 'created_at', 'updated_at'
     )
     search_fields = ('id', 'can_cod', 'payment_method', 'currency')
@@ -1,6 +1,23 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CartConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cart'
+
+    def ready(self):
+        interval = getattr(settings, "CART_RESERVATION_SWEEP_INTERVAL", 0)
+        if not interval:
+            return
+        # Only serving processes sweep: skip other management commands and runserver's reloader parent
+        if sys.argv[0].endswith("manage.py"):
+            if "runserver" not in sys.argv:
+                return
+            if "--noreload" not in sys.argv and os.environ.get("RUN_MAIN") != "true":
+                return
+        from cart.services.reservation_sweeper import start_reservation_sweeper
+        start_reservation_sweeper(interval)
@@ -0,0 +1,11 @@
+from typing import List, Optional, Dict
+import uuid
+from pydantic import BaseModel
+from cart.export_types.export_cart.export_cart_item import ExportCartItem
+
+class ExportCartDelta(BaseModel):
+    id: Optional[uuid.UUID] = None
+    user_id: uuid.UUID
+    changed_items: List[ExportCartItem] = []
+    removed_product_ids: List[uuid.UUID] = []
+    order_summary: Optional[Dict] = None
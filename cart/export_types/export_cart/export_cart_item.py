@@ -13,6 +13,8 @@ class ExportCartItem(BaseModel):
     category: Optional[str] = None
     brand: Optional[str] = None
     quantity: int = 1
+    tax_amount: Optional[Decimal] = None
+    line_total: Optional[Decimal] = None
     stock_left: int = 0
     is_active: bool = True
     is_available: bool = True
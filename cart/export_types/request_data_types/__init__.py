@@ -2,10 +2,14 @@ from .add_to_cart import AddToCartRequestType
 from .cart_product import CartProductRequestType
 from .remove_from_cart import RemoveFromCartRequestType
 from .get_cart import GetCartRequestType
+from .cart_operation import CartOperationRequestType
+from .update_cart import UpdateCartRequestType
 
 __all__ = [
     'AddToCartRequestType',
     'CartProductRequestType',
     'RemoveFromCartRequestType',
-    'GetCartRequestType'
+    'GetCartRequestType',
+    'CartOperationRequestType',
+    'UpdateCartRequestType'
 ]
@@ -0,0 +1,9 @@
+from typing import Literal, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+
+class CartOperationRequestType(BaseModel):
+    product_id: uuid.UUID = Field(..., description="Product ID the operation applies to")
+    op: Literal["add", "set", "remove"] = Field(..., description="add: increase quantity, set: replace quantity, remove: drop the line")
+    quantity: Optional[int] = Field(None, description="Units to add (add) or the new quantity (set)")
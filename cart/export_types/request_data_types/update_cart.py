@@ -0,0 +1,10 @@
+from typing import List
+import uuid
+from pydantic import BaseModel, Field
+
+from cart.export_types.request_data_types.cart_operation import CartOperationRequestType
+
+
+class UpdateCartRequestType(BaseModel):
+    user_id: uuid.UUID = Field(..., description="User ID")
+    operations: List[CartOperationRequestType] = Field(..., min_length=1, description="Operations applied in order, atomically")
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ReservationSweepResult(BaseModel):
+    """
+    Metrics of one run of the cart reservation expiry sweeper
+    """
+    batches: int = 0
+    released_items: int = 0
+    reclaimed_units: int = 0
+    products_restocked: int = 0
+    duration_seconds: Optional[float] = None
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_reserved_until(apps, schema_editor):
+    # Existing lines get a reservation window counted from their last update
+    CartItem = apps.get_model('cart', 'CartItem')
+    CartItem.objects.filter(reserved_until__isnull=True).update(
+        reserved_until=F('updated_at') + settings.CART_RESERVATION_TTL
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_ordersummary_cart_cart_cart_user_id_b645f9_idx_and_more'),
+        ('product', '0003_product_stock_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cartitem',
+            name='reserved_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cartitem',
+            index=models.Index(fields=['reserved_until'], name='cart_cartit_reserve_a88d28_idx'),
+        ),
+        migrations.RunPython(backfill_reserved_until, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def delete_ordered_cart_lines(apps, schema_editor):
+    # Orders used to leave their lines in the cart, where the reservation sweeper would
+    # hand the sold units back to stock. Lines added before the order was placed are the
+    # ones it sold: they go, their units stay out of stock.
+    CartItem = apps.get_model('cart', 'CartItem')
+    CartItem.objects.filter(
+        cart__order__isnull=False, created_at__lte=F('cart__order__order_date')
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_cartitem_reserved_until'),
+        ('order', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_ordered_cart_lines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0004_release_ordered_cart_lines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordersummary',
+            name='cart_item_tax',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='ordersummary',
+            name='cart_total',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+    ]
@@ -6,7 +6,7 @@ class Cart(GenericBaseModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='carts', db_index=True)
 
     def __str__(self):
-        return f"Cart {self.id} for user {self.user.id}"
+        return f"Cart {self.id} for user {self.user_id}"
 
     class Meta:
         indexes = [
@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
 from auth_api.models.base_models.base_model import GenericBaseModel
 from cart.models.cart import Cart
 from product.models.product import Product
@@ -7,13 +10,22 @@ class CartItem(GenericBaseModel):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)  # Quantity added
+    reserved_until = models.DateTimeField(null=True, blank=True)  # Stock is given back after this
 
     class Meta:
         unique_together = ('cart', 'product')  # Prevent same product multiple times in one cart
         indexes = [
             models.Index(fields=["cart"]),
             models.Index(fields=["product"]),
+            models.Index(fields=["reserved_until"]),
         ]
 
     def __str__(self):
-        return f"{self.product.stock} x {self.product.name} in cart {self.cart.id}"
\ No newline at end of file
+        # Never lazy-load the product just to print it
+        product = self.product.name if self._meta.get_field('product').is_cached(self) else self.product_id
+        return f"{self.quantity} x {product} in cart {self.cart_id}"
+
+    @staticmethod
+    def reservation_deadline():
+        """Expiry time for a reservation made or refreshed now."""
+        return timezone.now() + settings.CART_RESERVATION_TTL
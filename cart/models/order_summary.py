@@ -5,6 +5,9 @@ from auth_api.models.base_models.base_model import GenericBaseModel
 class OrderSummary(GenericBaseModel):
     cart_amount = models.DecimalField(max_digits=12, decimal_places=2)
     cart_item_discount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    cart_item_tax = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    # Sum of the priced line totals (discount off, tax on): what the placed order will charge
+    cart_total = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     shipping_charge = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     round_of_val = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     can_cod = models.CharField(max_length=3, null=True, blank=True)
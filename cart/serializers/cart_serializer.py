@@ -2,8 +2,6 @@ from rest_framework import serializers
 from typing import List, Optional
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
-from django.db.models import F
-from collections import defaultdict
 
 from auth_api.models.user_models.user import User
 from cart.export_types.request_data_types.add_to_cart import AddToCartRequestType
@@ -12,6 +10,9 @@ from cart.models.cart import Cart
 from cart.models.cart_item import CartItem
 from cart.services.cart_helper import validate_products_in_stock_all
 from product.models.product import Product
+from product.services.stock_service import StockService
+from pure_authentication.metrics import timed
+from pure_authentication.outbox import publish
 
 
 class CartCreateUpdateSerializer(serializers.ModelSerializer):
@@ -34,7 +35,8 @@ class CartCreateUpdateSerializer(serializers.ModelSerializer):
         if data.products is None:
             raise serializers.ValidationError("Products list cannot be empty")
         
-        # Validate each product
+        # Validate each product, reading them all in one query
+        products = Product.objects.in_bulk([product_data.product_id for product_data in data.products if product_data.product_id])
         for product_data in data.products:
             if not product_data.product_id:
                 raise serializers.ValidationError("Product ID is required")
@@ -43,12 +45,11 @@ class CartCreateUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(f"Invalid quantity for product {product_data.product_id}: Quantity must be greater than 0")
             
             # Check if product exists and is active
-            try:
-                product = Product.objects.get(id=product_data.product_id)
-                if not product.is_active:
-                    raise serializers.ValidationError(f"Product '{product.name}' is inactive")
-            except ObjectDoesNotExist:
+            product = products.get(product_data.product_id)
+            if product is None:
                 raise serializers.ValidationError(f"Invalid product_id: Product with ID {product_data.product_id} not found")
+            if not product.is_active:
+                raise serializers.ValidationError(f"Product '{product.name}' is inactive")
         
         # Validate stock availability
         if not validate_products_in_stock_all(data.products, str(data.user_id)):
@@ -68,15 +69,21 @@ class CartCreateUpdateSerializer(serializers.ModelSerializer):
             cart, cart_created = Cart.objects.get_or_create(user=user)
             requested_products: List[CartProductRequestType] = request_data.products or []
             product_ids = [p.product_id for p in requested_products]
-            # Remove cart items not in the new product_ids
-            CartItem.objects.filter(cart=cart).exclude(product_id__in=product_ids).delete()
-            # Bulk fetch products and cart items with select_for_update to prevent race conditions
-            products = Product.objects.select_for_update().filter(id__in=product_ids)
+            # Products are read without locks; stock is reserved below with one conditional UPDATE
+            products = Product.objects.filter(id__in=product_ids)
             product_map = {p.id: p for p in products}
-            cart_items = CartItem.objects.select_for_update().filter(cart=cart, product_id__in=product_ids)
-            cart_item_map = {item.product_id: item for item in cart_items}
-            # Prepare bulk operations
-            products_to_update = []
+            # Lock the whole cart once: requested lines are updated, the others are removed
+            requested_ids = set(product_ids)
+            cart_item_map = {}
+            removed_items = []
+            for item in CartItem.objects.select_for_update().filter(cart=cart):
+                if item.product_id in requested_ids:
+                    cart_item_map[item.product_id] = item
+                else:
+                    removed_items.append(item)
+            # Prepare bulk operations; every line touched by this request gets a fresh reservation window
+            reserved_until = CartItem.reservation_deadline()
+            stock_deltas = {}
             cart_items_to_update = []
             cart_items_to_create = []
             for product_data in requested_products:
@@ -87,57 +94,56 @@ class CartCreateUpdateSerializer(serializers.ModelSerializer):
                 cart_item = cart_item_map.get(product.id)
                 if cart_item:
                     # Update existing cart item
-                    old_quantity = cart_item.quantity
-                    new_quantity = quantity
-                    stock_adjustment = new_quantity - old_quantity
-                    if stock_adjustment != 0:
-                        # Use F() expression to prevent race conditions
-                        product.stock = F('stock') - stock_adjustment
-                        products_to_update.append(product)
-                    cart_item.quantity = new_quantity
+                    stock_deltas[product.id] = quantity - cart_item.quantity
+                    cart_item.quantity = quantity
+                    cart_item.reserved_until = reserved_until
                     cart_items_to_update.append(cart_item)
                 else:
                     # Create new cart item
-                    cart_item = CartItem(cart=cart, product=product, quantity=quantity)
+                    cart_item = CartItem(cart=cart, product=product, quantity=quantity, reserved_until=reserved_until)
                     cart_items_to_create.append(cart_item)
-                    # Use F() expression to prevent race conditions
-                    product.stock = F('stock') - quantity
-                    products_to_update.append(product)
+                    stock_deltas[product.id] = quantity
+            # Removed lines give their stock back, aggregated per product
+            for removed_item in removed_items:
+                stock_deltas[removed_item.product_id] = stock_deltas.get(removed_item.product_id, 0) - removed_item.quantity
+            # Reserve and give back stock for all lines in a single statement
+            reservation = StockService.apply_stock_deltas(stock_deltas)
+            if not reservation.is_success:
+                raise serializers.ValidationError([
+                    f"Product '{product_map[product_id].name if product_id in product_map else product_id}' "
+                    f"has insufficient stock for the requested quantity."
+                    for product_id in reservation.failed
+                ])
             # Execute bulk operations
-            if products_to_update:
-                Product.objects.bulk_update(products_to_update, ["stock"])
             if cart_items_to_update:
-                CartItem.objects.bulk_update(cart_items_to_update, ["quantity"])
+                CartItem.objects.bulk_update(cart_items_to_update, ["quantity", "reserved_until"])
             if cart_items_to_create:
                 CartItem.objects.bulk_create(cart_items_to_create)
-            # Restore stock for removed cart items before deleting
-            removed_items = list(CartItem.objects.filter(cart=cart).exclude(product_id__in=product_ids))
-            # Aggregate quantities for each product to avoid multiple updates
-            product_quantity_map = defaultdict(int)
-            for removed_item in removed_items:
-                product_quantity_map[removed_item.product_id] += removed_item.quantity
-            for product_id, quantity in product_quantity_map.items():
-                Product.objects.filter(id=product_id).update(stock=F('stock') + quantity)
-            # Now delete the removed items
             if removed_items:
                 CartItem.objects.filter(id__in=[item.id for item in removed_items]).delete()
+            publish("cart.updated", "cart", cart.id, {
+                "user_id": user.id, "action": "replace", "product_ids": list(stock_deltas),
+            })
             return cart
         except Exception as e:
             # Transaction will be rolled back automatically
             raise
 
+    @timed("cart.validate_stock_with_transaction")
     def validate_stock_with_transaction(self, request_data: AddToCartRequestType) -> bool:
         """
-        Validate stock availability within a transaction to prevent race conditions
+        Validate stock availability within a transaction.
+        Product rows are not locked here: this is an early, friendly check and the
+        authoritative one is the conditional UPDATE in create_or_update_cart_item.
         """
         with transaction.atomic():
             user = User.objects.get(id=request_data.user_id, is_deleted=False)
             cart, _ = Cart.objects.get_or_create(user=user)
             requested_products = request_data.products or []
             product_ids = [p.product_id for p in requested_products]
-            # Get products with select_for_update to lock them
-            products = Product.objects.select_for_update().filter(id__in=product_ids)
+            products = Product.objects.filter(id__in=product_ids)
             product_map = {p.id: p for p in products}
+            current_stock = StockService.get_current_stock(list(product_map.values()))
             # Get current cart items
             cart_items = CartItem.objects.select_for_update().filter(cart=cart, product_id__in=product_ids)
             cart_reservations = {item.product_id: item.quantity for item in cart_items}
@@ -152,7 +158,7 @@ class CartCreateUpdateSerializer(serializers.ModelSerializer):
                 # Get current cart reservation for this product
                 current_cart_quantity = cart_reservations.get(product_data.product_id, 0)
                 # Calculate available stock (current stock + what's already in cart)
-                available_stock = product.stock + current_cart_quantity
+                available_stock = current_stock[product.id] + current_cart_quantity
                 if available_stock < quantity:
                     raise serializers.ValidationError(
                         f"Product '{product.name}' has insufficient stock: {available_stock} available, but {quantity} requested."
@@ -1,5 +1,8 @@
 from typing import List
 from decimal import Decimal
+from django.conf import settings
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce, Round
 from rest_framework.exceptions import ValidationError
 from cart.export_types.request_data_types.cart_product import CartProductRequestType
 from cart.export_types.export_cart.export_cart import ExportCart
@@ -7,8 +10,11 @@ from cart.export_types.export_cart.export_cart_item import ExportCartItem
 from cart.models.cart import Cart
 from cart.models.cart_item import CartItem
 from product.models.product import Product
+from product.services.stock_service import StockService
 from auth_api.models.user_models.user import User
 from cart.models.order_summary import OrderSummary
+from cart.services.cart_pricing import price_product_line
+from pure_authentication.metrics import timed
 
 
 def validate_products_in_stock_all(requested_products: List[CartProductRequestType], user_id: str = None) -> bool:
@@ -24,6 +30,7 @@ def validate_products_in_stock_all(requested_products: List[CartProductRequestTy
     # Get all products in a single query
     products = Product.objects.filter(id__in=product_ids)
     product_map = {product.id: product for product in products}
+    current_stock = StockService.get_current_stock(list(product_map.values()))
 
     # Get current cart items for the user (if user_id provided)
     cart_reservations = {}
@@ -46,7 +53,7 @@ def validate_products_in_stock_all(requested_products: List[CartProductRequestTy
         current_cart_quantity = cart_reservations.get(item.product_id, 0)
         
         # Available stock = current stock + what's already in cart (since we'll be updating the cart)
-        available_stock = product.stock + current_cart_quantity if product else 0
+        available_stock = current_stock[product.id] + current_cart_quantity if product else 0
 
         if not product:
             errors.append(f"Product with ID {item.product_id} not found in database.")
@@ -108,25 +115,17 @@ def cart_item_to_export(cart_item: CartItem) -> ExportCartItem:
     """
     Convert CartItem models to ExportCartItem using model_to_dict()
     """
-    # Get cart item data using model_to_dict()
-    cart_item_data = cart_item.model_to_dict()
-    
+    # The item's own fields are read directly: model_to_dict() would also load its cart, one query per line
     # Get product data using model_to_dict()
     product_data = cart_item.product.model_to_dict()
     
     quantity = cart_item.quantity
     price = cart_item.product.price
     discount = cart_item.product.discount or 0
-    
-    # Calculate prices
-    total_price = price * quantity
-    
-    # Apply product discount (percentage)
-    discount_amount = total_price * (Decimal(discount) / Decimal('100'))
-    final_price = total_price - discount_amount
-    
+    line = price_product_line(cart_item.product, quantity)
+
     return ExportCartItem(
-        id=cart_item_data.get('id'),
+        id=cart_item.id,
         product_id=cart_item.product.id,
         product_name=product_data.get('name'),
         product_price=price,
@@ -136,22 +135,70 @@ def cart_item_to_export(cart_item: CartItem) -> ExportCartItem:
         category=cart_item.product.category.name if cart_item.product.category else None,
         brand=product_data.get('brand'),
         quantity=quantity,
+        tax_amount=line.tax_amount,
+        line_total=line.line_total,
         stock_left=product_data.get('stock'),
         is_active=product_data.get('is_active'),
         is_available=product_data.get('is_active') and product_data.get('stock', 0) >= 0,
-        created_at=str(cart_item_data.get('created_at')),
-        updated_at=str(cart_item_data.get('updated_at'))
+        created_at=str(cart_item.created_at),
+        updated_at=str(cart_item.updated_at)
+    )
+
+
+def order_summary_values(total_amount, total_discount, total_items: int, total_quantity: int, total_tax=0) -> dict:
+    """
+    Order summary fields derived from the cart totals. `cart_total` is what placing the
+    order charges: the sum of the priced line totals, tax included.
+    """
+    # Example: shipping charge and round off logic (customize as needed)
+    shipping_charge = 0
+    cart_total = total_amount - total_discount + total_tax
+    round_of_val = round(cart_total) - cart_total
+    can_cod = '' if total_items == 0 else 'Y'
+    return {
+        'cart_amount': total_amount,
+        'cart_item_discount': total_discount,
+        'cart_item_tax': total_tax,
+        'cart_total': cart_total,
+        'shipping_charge': shipping_charge,
+        'round_of_val': round_of_val,
+        'can_cod': can_cod,
+        'total_items': total_items,
+        'total_quantity': total_quantity,
+        'currency': 'INR',
+    }
+
+
+def cart_summary(cart: Cart) -> dict:
+    """
+    Order summary of a cart computed with one aggregate query, without loading its items.
+    """
+    line_total = ExpressionWrapper(F('quantity') * F('product__price'), output_field=DecimalField())
+    # Rounded per line like cart_pricing.price_line, so both paths agree to the cent
+    line_discount = Round(line_total * Coalesce(F('product__discount'), Decimal('0')) / Decimal('100'), 2)
+    line_tax = Round(
+        (line_total - line_discount) * Value(settings.ORDER_TAX_RATE, output_field=DecimalField()) / Decimal('100'), 2
+    )
+    totals = CartItem.objects.filter(cart=cart).aggregate(
+        total_items=Count('id'),
+        total_quantity=Coalesce(Sum('quantity'), 0),
+        total_amount=Coalesce(Sum(line_total), Decimal('0'), output_field=DecimalField()),
+        total_discount=Coalesce(Sum(line_discount, output_field=DecimalField()), Decimal('0'), output_field=DecimalField()),
+        total_tax=Coalesce(Sum(line_tax, output_field=DecimalField()), Decimal('0'), output_field=DecimalField()),
+    )
+    return order_summary_values(
+        totals['total_amount'], totals['total_discount'], totals['total_items'], totals['total_quantity'],
+        totals['total_tax'],
     )
 
 
+@timed("cart.cart_to_export")
 def cart_to_export(cart: Cart) -> ExportCart:
     """
-    Convert Cart models to ExportCart using model_to_dict(), and calculate OrderSummary.
+    Convert Cart models to ExportCart, and calculate OrderSummary. The cart's fields are read
+    directly, model_to_dict() would also load its user.
     Persist OrderSummary in the database for this cart.
     """
-    # Get cart data using model_to_dict()
-    cart_data = cart.model_to_dict()
-    
     # Get all cart items with related products
     cart_items = CartItem.objects.filter(cart=cart).select_related('product', 'product__category')
     
@@ -161,33 +208,18 @@ def cart_to_export(cart: Cart) -> ExportCart:
     # Calculate cart summary values
     total_amount = 0
     total_discount = 0
+    total_tax = 0
     total_items = len(export_items)
     total_quantity = sum(cart_item.quantity for cart_item in cart_items)
-    for item, cart_item in zip(export_items, cart_items):
-        quantity = cart_item.quantity
-        price = cart_item.product.price
-        discount = cart_item.product.discount or 0
-        item_total = price * quantity
-        discount_amount = item_total * (Decimal(discount) / Decimal('100'))
-        total_amount += item_total
-        total_discount += discount_amount
-    # Example: shipping charge and round off logic (customize as needed)
-    shipping_charge = 0
-    round_of_val = round(total_amount - total_discount) - (total_amount - total_discount)
-    can_cod = '' if total_items == 0 else 'Y'
+    for cart_item in cart_items:
+        line = price_product_line(cart_item.product, cart_item.quantity)
+        total_amount += line.gross
+        total_discount += line.discount_amount
+        total_tax += line.tax_amount
     # Persist OrderSummary in DB (update or create for this cart)
     order_summary_obj, _ = OrderSummary.objects.update_or_create(
         id=getattr(cart, 'order_summary_id', None),
-        defaults={
-            'cart_amount': total_amount,
-            'cart_item_discount': total_discount,
-            'shipping_charge': shipping_charge,
-            'round_of_val': round_of_val,
-            'can_cod': can_cod,
-            'total_items': total_items,
-            'total_quantity': total_quantity,
-            'currency': 'INR',
-        }
+        defaults=order_summary_values(total_amount, total_discount, total_items, total_quantity, total_tax)
     )
     # Optionally, link the summary to the cart if you add a OneToOneField
     # cart.order_summary = order_summary_obj
@@ -196,6 +228,8 @@ def cart_to_export(cart: Cart) -> ExportCart:
     order_summary = {
         'cart_amount': order_summary_obj.cart_amount,
         'cart_item_discount': order_summary_obj.cart_item_discount,
+        'cart_item_tax': order_summary_obj.cart_item_tax,
+        'cart_total': order_summary_obj.cart_total,
         'shipping_charge': order_summary_obj.shipping_charge,
         'round_of_val': order_summary_obj.round_of_val,
         'can_cod': order_summary_obj.can_cod,
@@ -203,13 +237,12 @@ def cart_to_export(cart: Cart) -> ExportCart:
         'total_quantity': order_summary_obj.total_quantity,
         'currency': order_summary_obj.currency,
     }
-    # Extract user_id from the User object (foreign key returns the object)
-    user_id = cart.user.id if cart.user else None
+    user_id = cart.user_id
     return ExportCart(
-        id=cart_data.get('id'),
+        id=cart.id,
         user_id=user_id,
         items=export_items,
         order_summary=order_summary,
-        created_at=cart_data.get('created_at'),
-        updated_at=cart_data.get('updated_at')
+        created_at=cart.created_at,
+        updated_at=cart.updated_at
     )
\ No newline at end of file
@@ -0,0 +1,45 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+
+CENT = Decimal('0.01')
+
+
+class PricedLine(NamedTuple):
+    unit_price: Decimal
+    quantity: int
+    gross: Decimal
+    discount: Decimal
+    discount_amount: Decimal
+    tax_rate: Decimal
+    tax_amount: Decimal
+    line_total: Decimal
+
+
+def price_line(unit_price, quantity: int, discount=None, tax_rate=None) -> PricedLine:
+    """
+    Price one cart / order line: the percentage discount comes off quantity * unit price,
+    tax (ORDER_TAX_RATE percent unless given) is charged on what is left. Every amount is
+    rounded to the cent, so line_total == gross - discount_amount + tax_amount exactly.
+    """
+    unit_price = Decimal(unit_price)
+    discount = Decimal(discount or 0)
+    tax_rate = Decimal(settings.ORDER_TAX_RATE if tax_rate is None else tax_rate)
+    gross = (unit_price * quantity).quantize(CENT, ROUND_HALF_UP)
+    discount_amount = (gross * discount / 100).quantize(CENT, ROUND_HALF_UP)
+    tax_amount = ((gross - discount_amount) * tax_rate / 100).quantize(CENT, ROUND_HALF_UP)
+    return PricedLine(
+        unit_price=unit_price,
+        quantity=quantity,
+        gross=gross,
+        discount=discount,
+        discount_amount=discount_amount,
+        tax_rate=tax_rate,
+        tax_amount=tax_amount,
+        line_total=gross - discount_amount + tax_amount,
+    )
+
+
+def price_product_line(product, quantity: int, tax_rate: Optional[Decimal] = None) -> PricedLine:
+    return price_line(product.price, quantity, product.discount, tax_rate)
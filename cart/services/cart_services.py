@@ -1,10 +1,20 @@
+from collections import defaultdict
+
+from django.db import transaction
+
 from auth_api.models.user_models.user import User
 from cart.export_types.export_cart.export_cart import ExportCart
+from cart.export_types.export_cart.export_cart_delta import ExportCartDelta
 from cart.export_types.request_data_types.add_to_cart import AddToCartRequestType
 from cart.export_types.request_data_types.add_item import AddItemRequestType
+from cart.export_types.request_data_types.update_cart import UpdateCartRequestType
 from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
 from cart.serializers.cart_serializer import CartCreateUpdateSerializer
-from cart.services.cart_helper import cart_to_export
+from cart.services.cart_helper import cart_item_to_export, cart_summary, cart_to_export
+from product.models.product import Product
+from product.services.stock_service import StockService
+from pure_authentication.outbox import publish
 from rest_framework import serializers
 
 
@@ -69,26 +79,22 @@ class CartServices:
         """
         try:
             user, cart = CartServices._get_user_and_cart(user_id)
-            
-            from cart.models.cart_item import CartItem
-            from product.models.product import Product
-            from django.db import transaction
-            
+
             with transaction.atomic():
                 # Use select_for_update to prevent race conditions
                 cart_item = CartItem.objects.select_for_update().get(cart=cart, product_id=product_id)
-                product = Product.objects.select_for_update().get(id=product_id)
-                
-                # Restore stock
-                restored_quantity = cart_item.quantity
-                product.stock += restored_quantity
-                product.save()
-                
+
+                # Restore stock without locking the product row
+                StockService.restore_stock({cart_item.product_id: cart_item.quantity})
+
                 # Remove cart item
                 cart_item.delete()
-            
+                publish("cart.updated", "cart", cart.id, {
+                    "user_id": user.id, "action": "remove", "product_ids": [cart_item.product_id],
+                })
+
             return cart_to_export(cart)
-            
+
         except (User.DoesNotExist, Cart.DoesNotExist, CartItem.DoesNotExist):
             raise ValueError("Cart or item not found")
 
@@ -99,26 +105,28 @@ class CartServices:
         """
         try:
             user, cart = CartServices._get_user_and_cart(user_id)
-            
-            from cart.models.cart_item import CartItem
-            from django.db import transaction
-            
+
             with transaction.atomic():
                 # Use select_for_update to prevent race conditions
-                cart_items = CartItem.objects.select_for_update().filter(cart=cart).select_related('product')
-                
-                # Restore stock for all items
-                for cart_item in cart_items:
-                    product = cart_item.product
-                    restored_quantity = cart_item.quantity
-                    product.stock += restored_quantity
-                    product.save()
-                
+                cart_items = list(
+                    CartItem.objects.select_for_update().filter(cart=cart).values_list('id', 'product_id', 'quantity')
+                )
+
+                # Restore stock for all items in one set-based UPDATE
+                quantities = defaultdict(int)
+                for _, product_id, quantity in cart_items:
+                    quantities[product_id] += quantity
+                StockService.restore_stock(quantities)
+
                 # Clear all cart items
-                cart_items.delete()
-            
+                CartItem.objects.filter(id__in=[item_id for item_id, _, _ in cart_items]).delete()
+                if cart_items:
+                    publish("cart.updated", "cart", cart.id, {
+                        "user_id": user.id, "action": "clear", "product_ids": list(quantities),
+                    })
+
             return cart_to_export(cart)
-            
+
         except (User.DoesNotExist, Cart.DoesNotExist):
             raise ValueError("Cart not found")
 
@@ -128,13 +136,12 @@ class CartServices:
         Debug method to check stock levels for a product
         """
         try:
-            from product.models.product import Product
-            from cart.models.cart_item import CartItem
-            
-            product = Product.objects.get(id=product_id)
-            cart_items = CartItem.objects.filter(product=product)
+            product = Product.objects.only('name', 'stock', 'reserved_quantity').get(id=product_id)
+            # Projection through the cart FK: one query, no Cart/User instances per line
+            cart_items = CartItem.objects.filter(product=product).values_list('cart__user_id', 'quantity')
             
-            total_reserved = sum(item.quantity for item in cart_items)
+            # Maintained with every cart mutation, no need to sum the cart lines
+            total_reserved = product.reserved_quantity
             
             return {
                 "product_name": product.name,
@@ -143,9 +150,9 @@ class CartServices:
                 "available_for_purchase": product.stock + total_reserved,
                 "cart_items": [
                     {
-                        "user_id": str(item.cart.user.id),
-                        "quantity": item.quantity
-                    } for item in cart_items
+                        "user_id": str(user_id),
+                        "quantity": quantity
+                    } for user_id, quantity in cart_items
                 ]
             }
         except Product.DoesNotExist:
@@ -187,4 +194,102 @@ class CartServices:
                 raise serializers.ValidationError("Failed to add item to cart")
             return cart_to_export(cart)
         except Exception as e:
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def apply_cart_operations(request_data: UpdateCartRequestType) -> ExportCartDelta:
+        """
+        Apply a list of add / set / remove operations to the user's cart atomically.
+        Only the cart lines named in the request are locked and written, stock for all of
+        them is adjusted with one conditional UPDATE, and the response carries the changed
+        lines plus the new summary, so the work scales with the change, not the cart size.
+        """
+        user, cart = CartServices._get_user_and_cart(request_data.user_id)
+        product_ids = {operation.product_id for operation in request_data.operations}
+
+        with transaction.atomic():
+            lines = {
+                item.product_id: item
+                for item in CartItem.objects.select_for_update().filter(cart=cart, product_id__in=product_ids)
+            }
+            products = {
+                product.id: product
+                for product in Product.objects.select_related('category').filter(id__in=product_ids)
+            }
+
+            # Replay the operations on the current quantities
+            errors = []
+            quantities = {product_id: item.quantity for product_id, item in lines.items()}
+            for operation in request_data.operations:
+                product = products.get(operation.product_id)
+                current = quantities.get(operation.product_id, 0)
+                if operation.op == "remove":
+                    quantities[operation.product_id] = 0
+                elif not product:
+                    errors.append(f"Product with ID {operation.product_id} not found")
+                elif not product.is_active:
+                    errors.append(f"Product '{product.name}' is inactive")
+                elif operation.op == "add":
+                    if not operation.quantity or operation.quantity <= 0:
+                        errors.append(f"Product '{product.name}': Quantity to add must be greater than 0.")
+                    else:
+                        quantities[operation.product_id] = current + operation.quantity
+                elif operation.quantity is None or operation.quantity < 0:
+                    errors.append(f"Product '{product.name}': Quantity must be 0 or more.")
+                else:
+                    quantities[operation.product_id] = operation.quantity
+            if errors:
+                raise serializers.ValidationError(errors)
+
+            stock_deltas = {
+                product_id: quantity - (lines[product_id].quantity if product_id in lines else 0)
+                for product_id, quantity in quantities.items()
+            }
+            reservation = StockService.apply_stock_deltas(stock_deltas)
+            if not reservation.is_success:
+                raise serializers.ValidationError([
+                    f"Product '{products[product_id].name}' has insufficient stock for the requested quantity."
+                    for product_id in reservation.failed
+                ])
+
+            reserved_until = CartItem.reservation_deadline()
+            items_to_create, items_to_update, removed_product_ids = [], [], []
+            for product_id, quantity in quantities.items():
+                item = lines.get(product_id)
+                if quantity == 0:
+                    if item:
+                        removed_product_ids.append(product_id)
+                    continue
+                if item is None:
+                    items_to_create.append(
+                        CartItem(cart=cart, product=products[product_id], quantity=quantity, reserved_until=reserved_until)
+                    )
+                elif stock_deltas[product_id]:
+                    item.quantity = quantity
+                    item.reserved_until = reserved_until
+                    items_to_update.append(item)
+            if removed_product_ids:
+                CartItem.objects.filter(cart=cart, product_id__in=removed_product_ids).delete()
+            if items_to_update:
+                CartItem.objects.bulk_update(items_to_update, ["quantity", "reserved_until"])
+            if items_to_create:
+                CartItem.objects.bulk_create(items_to_create)
+            publish("cart.updated", "cart", cart.id, {
+                "user_id": user.id, "action": "update", "product_ids": list(quantities),
+            })
+
+            changed_items = items_to_update + items_to_create
+            for item in changed_items:
+                product = products[item.product_id]
+                item.product = product
+                if not product.is_stock_sharded and product.id in reservation.applied:
+                    product.stock = reservation.applied[product.id]
+            order_summary = cart_summary(cart)
+
+        return ExportCartDelta(
+            id=cart.id,
+            user_id=user.id,
+            changed_items=[cart_item_to_export(item) for item in changed_items],
+            removed_product_ids=removed_product_ids,
+            order_summary=order_summary,
+        )
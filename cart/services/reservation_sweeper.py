@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from cart.export_types.reservation_sweep_result import ReservationSweepResult
+from cart.models.cart_item import CartItem
+from product.services.stock_service import StockService
+from pure_authentication.outbox import publish_many
+
+logger = logging.getLogger(__name__)
+
+_sweeper_thread = None
+_sweeper_lock = threading.Lock()
+
+
+def release_expired_reservations(batch_size: int = 500, max_batches: int = None) -> ReservationSweepResult:
+    """
+    Give back the stock held by cart lines whose reservation has expired and drop those lines.
+    Works in chunks of `batch_size` lines, each in its own short transaction: the chunk is
+    claimed with SELECT ... FOR UPDATE SKIP LOCKED (so carts being edited right now and
+    concurrent sweepers are skipped), quantities are aggregated per product and restored with
+    one set-based UPDATE, then the lines are deleted.
+    """
+    started = time.monotonic()
+    result = ReservationSweepResult()
+    restocked_products = set()
+    now = timezone.now()
+
+    while max_batches is None or result.batches < max_batches:
+        with transaction.atomic():
+            expired = list(
+                CartItem.objects.select_for_update(skip_locked=True)
+                .filter(reserved_until__lt=now)
+                .order_by('reserved_until')
+                .values_list('id', 'product_id', 'quantity', 'cart_id')[:batch_size]
+            )
+            if not expired:
+                break
+            quantities = defaultdict(int)
+            released = defaultdict(list)
+            for _, product_id, quantity, cart_id in expired:
+                quantities[product_id] += quantity
+                released[cart_id].append(product_id)
+            StockService.restore_stock(quantities)
+            CartItem.objects.filter(id__in=[item_id for item_id, _, _, _ in expired]).delete()
+            publish_many("cart.updated", "cart", {
+                cart_id: {"action": "expire", "product_ids": product_ids} for cart_id, product_ids in released.items()
+            })
+
+        result.batches += 1
+        result.released_items += len(expired)
+        result.reclaimed_units += sum(quantities.values())
+        restocked_products.update(quantities)
+        if len(expired) < batch_size:
+            break
+
+    result.products_restocked = len(restocked_products)
+    result.duration_seconds = round(time.monotonic() - started, 3)
+    if result.released_items:
+        logger.info(
+            f"Released {result.released_items} expired cart lines, reclaimed {result.reclaimed_units} units "
+            f"for {result.products_restocked} products in {result.duration_seconds}s"
+        )
+    return result
+
+
+def start_reservation_sweeper(interval: int, batch_size: int = 500) -> threading.Thread:
+    """
+    Start the expiry sweeper in a daemon thread of the current process, running every
+    `interval` seconds. Only one sweeper thread is started per process.
+    """
+    global _sweeper_thread
+    with _sweeper_lock:
+        if _sweeper_thread is not None and _sweeper_thread.is_alive():
+            return _sweeper_thread
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    close_old_connections()
+                    release_expired_reservations(batch_size=batch_size)
+                except Exception as e:
+                    logger.error(f"Cart reservation sweep failed: {e}")
+                finally:
+                    close_old_connections()
+
+        _sweeper_thread = threading.Thread(target=run, name="cart-reservation-sweeper", daemon=True)
+        _sweeper_thread.start()
+        return _sweeper_thread
@@ -1,3 +1,104 @@
-from django.test import TestCase
+import json
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from cart.services.cart_helper import cart_summary, cart_to_export
+from cart.services.cart_services import CartServices
+from order.services.order_service import OrderService
+from pure_authentication.benchmarks.data import SyntheticData
+from pure_authentication.query_budget import assert_query_budget
+from pure_authentication.testing import QueryBudgetTestCase
+
+
+class StockDiagnosticsQueryTests(TestCase):
+
+    def setUp(self):
+        data = SyntheticData(seed=5)
+        self.product = data.create_catalog(1, 1, stock=100)[0]
+        data.create_carts(data.create_users(10), [self.product], 1)
+
+    def test_debug_stock_levels_does_not_query_per_cart(self):
+        # The product, then every cart line with its user id in one join
+        levels = assert_query_budget(2, CartServices.debug_stock_levels, str(self.product.id))
+        self.assertEqual(len(levels["cart_items"]), 10)
+
+    def test_cart_item_str_does_not_load_relations(self):
+        item = CartItem.objects.filter(product=self.product).first()
+        assert_query_budget(0, str, item)
+        assert_query_budget(0, str, CartItem.objects.select_related('cart').get(id=item.id).cart)
+
+
+class CartViewQueryBudgetTests(QueryBudgetTestCase):
+    seed = 8
+
+    def setUp(self):
+        super().setUp()
+        self.products = self.data.create_catalog(1, 20, stock=100)
+        self.user = self.data.create_users(1)[0]
+        self.data.create_carts([self.user], self.products[:5], 5)
+
+    def post(self, path: str, payload: dict):
+        return self.client.post(path, json.dumps({"user_id": str(self.user.id), **payload}), content_type="application/json")
+
+    def test_add_to_cart(self):
+        # Same budget as for a single line: no statement is repeated per line
+        products = [{"product_id": str(product.id), "quantity": 1} for product in self.products]
+        response = self.post("/cart/add_to_cart", {"products": products})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len(response.json()["data"]["items"]), 20)
+
+    def test_add_item(self):
+        response = self.post("/cart/add_item", {"product_id": str(self.products[10].id), "quantity": "1"})
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_update_cart(self):
+        operations = [
+            {"op": "add", "product_id": str(self.products[10].id), "quantity": 1},
+            {"op": "set", "product_id": str(self.products[0].id), "quantity": 3},
+        ]
+        response = self.client.patch(
+            "/cart/update_cart", json.dumps({"user_id": str(self.user.id), "operations": operations}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_get_cart(self):
+        response = self.client.get("/cart/get_cart", {"user_id": str(self.user.id)})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_remove_from_cart(self):
+        response = self.post("/cart/remove_from_cart", {"product_id": str(self.products[0].id)})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_clear_cart(self):
+        response = self.post("/cart/clear_cart", {})
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+@override_settings(ORDER_TAX_RATE=Decimal("18"))
+class CartTotalTests(TestCase):
+    """The cart shows what placing the order will charge, tax included"""
+
+    def setUp(self):
+        data = SyntheticData(seed=11)
+        # Discounts of 0, 5, 10 and 25% with odd prices, so per-line rounding matters
+        self.cart = data.create_carts(data.create_users(1), data.create_catalog(1, 20, stock=100), 20)[0]
+
+    def test_cart_total_equals_order_total(self):
+        summary = cart_summary(self.cart)
+        export = cart_to_export(Cart.objects.get(id=self.cart.id))
+
+        order = OrderService.create_order_from_cart(self.cart.id, "1 Test Street")
+
+        self.assertGreater(summary['cart_item_tax'], 0)
+        self.assertEqual(summary['cart_total'], order.total_amount)
+        self.assertEqual(export.order_summary['cart_total'], order.total_amount)
+        self.assertEqual(export.order_summary['cart_item_tax'], summary['cart_item_tax'])
+        self.assertEqual(sum(item.line_total for item in export.items), order.total_amount)
+        self.assertEqual(
+            sorted((item.product_id, item.tax_amount, item.line_total) for item in export.items),
+            sorted((item.product_id, item.tax_amount, item.line_total) for item in order.order_items.all())
+        )
@@ -5,6 +5,7 @@ from cart.views.get_cart import GetCartView
 from cart.views.remove_from_cart import RemoveFromCartView
 from cart.views.clear_cart import ClearCartView
 from cart.views.add_item import AddItemView
+from cart.views.update_cart import UpdateCartView
 
 urlpatterns = [
     path("add_to_cart", AddToCartView.as_view(), name="Add to Cart"),
@@ -12,4 +13,5 @@ urlpatterns = [
     path("remove_from_cart", RemoveFromCartView.as_view(), name="Remove from Cart"),
     path("clear_cart", ClearCartView.as_view(), name="Clear Cart"),
     path('add_item', AddItemView.as_view(), name='add_item'),
+    path("update_cart", UpdateCartView.as_view(), name="Update Cart"),
 ]
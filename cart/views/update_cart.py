@@ -0,0 +1,36 @@
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_api.services.helpers import validate_user_uid
+from cart.export_types.request_data_types.update_cart import UpdateCartRequestType
+from cart.services.cart_services import CartServices
+from auth_api.services.handlers.exception_handlers import ExceptionHandler
+
+
+class UpdateCartView(APIView):
+    renderer_classes = [JSONRenderer]
+
+    def patch(self, request: Request):
+        try:
+            # Validate request data using Pydantic models
+            request_data = UpdateCartRequestType(**request.data)
+
+            if not validate_user_uid(uid=str(request_data.user_id)).is_validated:
+                raise ValueError("Invalid user_id format")
+
+            result = CartServices.apply_cart_operations(request_data=request_data)
+
+            return Response(
+                data={
+                    "message": "Cart updated successfully.",
+                    "data": result.model_dump(),
+                },
+                status=status.HTTP_200_OK,
+                content_type="application/json",
+            )
+
+        except Exception as e:
+            return ExceptionHandler().handle_exception(e)
@@ -1,12 +1,16 @@
 from django.contrib import admin
 from order.models.order import Order
 from order.models.order_item import OrderItem
+from order.models.idempotency_key import IdempotencyKey
+from order.models.order_sales_rollup import OrderSalesRollup
+from order.models.rollup_watermark import RollupWatermark
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     extra = 0
-    readonly_fields = ('product_name', 'get_subtotal')
-    fields = ('product', 'product_name', 'quantity', 'price', 'get_subtotal')
+    readonly_fields = ('product_name', 'product_sku', 'discount_amount', 'tax_amount', 'line_total')
+    fields = ('product', 'product_name', 'product_sku', 'quantity', 'price', 'discount', 'discount_amount',
+              'tax_rate', 'tax_amount', 'line_total')
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -41,8 +45,25 @@ class OrderAdmin(admin.ModelAdmin):
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
-    list_display = ('order', 'product', 'product_name', 'quantity', 'price', 'get_subtotal')
+    list_display = ('order', 'product', 'product_name', 'quantity', 'price', 'discount_amount', 'tax_amount', 'line_total')
     list_filter = ('order__order_status', 'order__payment_status')
-    search_fields = ('order__order_number', 'product_name', 'product__name')
-    readonly_fields = ('get_subtotal',)
+    search_fields = ('order__order_number', 'product_name', 'product_sku')
+    readonly_fields = ('discount_amount', 'tax_amount', 'line_total')
     raw_id_fields = ('order', 'product')
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('key', 'customer', 'response_status', 'created_at')
+    list_select_related = ('customer',)
+    search_fields = ('key', 'customer__username')
+    readonly_fields = ('key', 'customer', 'request_hash', 'response_status', 'response_body', 'created_at')
+
+@admin.register(OrderSalesRollup)
+class OrderSalesRollupAdmin(admin.ModelAdmin):
+    list_display = ('granularity', 'bucket_start', 'dimension', 'dimension_id', 'order_status', 'orders', 'units', 'revenue')
+    list_filter = ('granularity', 'dimension', 'order_status')
+    date_hierarchy = 'bucket_start'
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('name', 'watermark', 'updated_at')
@@ -0,0 +1,36 @@
+import datetime
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ExportOrderItem(BaseModel):
+    id: uuid.UUID
+    product_id: uuid.UUID
+    product_name: str
+    product_sku: Optional[str] = None
+    product_slug: Optional[str] = None
+    quantity: int
+    price: Decimal
+    discount: Decimal = Decimal("0")
+    discount_amount: Decimal = Decimal("0")
+    tax_amount: Decimal = Decimal("0")
+    subtotal: Decimal
+
+
+class ExportOrder(BaseModel):
+    id: uuid.UUID
+    order_number: str
+    customer_id: uuid.UUID
+    cart_id: Optional[uuid.UUID] = None
+    order_status: str
+    payment_status: str
+    total_amount: Decimal
+    total_quantity: int = 0
+    shipping_address: Optional[str] = None
+    billing_address: Optional[str] = None
+    order_date: datetime.datetime
+    delivery_date: Optional[datetime.datetime] = None
+    items: List[ExportOrderItem] = []
@@ -0,0 +1,35 @@
+import datetime
+import uuid
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ExportOrderHistoryItem(BaseModel):
+    product_id: uuid.UUID
+    product_name: str
+    quantity: int
+    price: Decimal
+    line_total: Decimal
+
+
+class ExportOrderHistoryEntry(BaseModel):
+    """
+    One order of a history page: only columns of the order row itself, so a page is
+    read from the (customer, order_date) index without joins.
+    """
+    id: uuid.UUID
+    order_number: str
+    order_status: str
+    payment_status: str
+    total_amount: Decimal
+    order_date: datetime.datetime
+    delivery_date: Optional[datetime.datetime] = None
+    items: Optional[List[ExportOrderHistoryItem]] = None
+
+
+class ExportOrderHistory(BaseModel):
+    orders: List[ExportOrderHistoryEntry] = []
+    next_cursor: Optional[str] = None
+    has_more: bool = False
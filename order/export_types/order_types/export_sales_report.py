@@ -0,0 +1,42 @@
+import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ExportSalesBucket(BaseModel):
+    bucket_start: datetime.datetime
+    dimension_id: Optional[UUID] = None
+    orders: int = 0
+    units: int = 0
+    revenue: Decimal = Decimal("0")
+
+
+class ExportSalesReport(BaseModel):
+    """
+    Sales per time bucket and dimension value. Buckets up to `watermark` come from the
+    rollup table; `live_from` is set when the rest was aggregated from the orders.
+    """
+    granularity: str
+    dimension: str
+    start: datetime.datetime
+    end: datetime.datetime
+    watermark: Optional[datetime.datetime] = None
+    live_from: Optional[datetime.datetime] = None
+    buckets: List[ExportSalesBucket] = []
+    orders: int = 0
+    units: int = 0
+    revenue: Decimal = Decimal("0")
+
+
+class SalesRollupRefreshResult(BaseModel):
+    previous_watermark: Optional[datetime.datetime] = None
+    watermark: Optional[datetime.datetime] = None
+    hours: int = 0
+    days: int = 0
+    rows: int = 0
+    chunks: int = 0
+    skipped: bool = False
+    duration_seconds: float = 0
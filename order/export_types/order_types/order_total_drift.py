@@ -0,0 +1,15 @@
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class OrderTotalDrift(BaseModel):
+    """
+    An order whose maintained `total_amount` disagrees with the sum of its order items.
+    """
+    order_id: UUID
+    order_number: Optional[str] = None
+    total_amount: Decimal
+    actual_total_amount: Decimal
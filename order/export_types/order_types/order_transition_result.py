@@ -0,0 +1,19 @@
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class OrderTransitionResult(BaseModel):
+    """
+    Outcome of a bulk status change, per order: `transitioned` maps id -> previous status,
+    `rejected` maps id -> current status for orders that may not move to `to_status`,
+    `not_found` lists unknown ids.
+    """
+    to_status: str
+    transitioned: Dict[UUID, str] = {}
+    rejected: Dict[UUID, str] = {}
+    not_found: List[UUID] = []
+    restocked_units: int = 0
+    chunks: int = 0
+    duration_seconds: float = 0
@@ -0,0 +1,9 @@
+from .order_history import OrderHistoryRequestType
+from .order_transition import OrderTransitionRequestType
+from .sales_report import SalesReportRequestType
+
+__all__ = [
+    'OrderHistoryRequestType',
+    'OrderTransitionRequestType',
+    'SalesReportRequestType'
+]
@@ -0,0 +1,44 @@
+import base64
+import datetime
+import uuid
+from typing import Optional, Tuple
+
+from pydantic import BaseModel, Field, field_validator
+
+ORDER_HISTORY_MAX_LIMIT = 100
+
+
+def encode_history_cursor(order_date: datetime.datetime, order_id: uuid.UUID) -> str:
+    """Opaque cursor of the last order of a page: its (order_date, id) sort key."""
+    return base64.urlsafe_b64encode(f"{order_date.isoformat()}|{order_id}".encode()).decode()
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime.datetime, uuid.UUID]:
+    try:
+        order_date, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.datetime.fromisoformat(order_date), uuid.UUID(order_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor, pass back the next_cursor of the previous page")
+
+
+class OrderHistoryRequestType(BaseModel):
+    user_id: uuid.UUID = Field(..., description="Customer whose orders are listed")
+    limit: int = Field(20, ge=1, le=ORDER_HISTORY_MAX_LIMIT, description="Orders per page")
+    cursor: Optional[str] = Field(None, description="next_cursor of the previous page")
+    include_items: bool = Field(False, description="Also return the lines of each order")
+
+    @field_validator("cursor", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        return value or None
+
+    @field_validator("cursor")
+    @classmethod
+    def valid_cursor(cls, value):
+        if value is not None:
+            decode_history_cursor(value)
+        return value
+
+    @property
+    def after(self) -> Optional[Tuple[datetime.datetime, uuid.UUID]]:
+        return decode_history_cursor(self.cursor) if self.cursor else None
@@ -0,0 +1,23 @@
+import uuid
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from order.models.order_payment_status import OrderStatus
+
+
+class OrderTransitionRequestType(BaseModel):
+    to_status: OrderStatus = Field(..., description="Status to move the orders to")
+    order_ids: Optional[List[uuid.UUID]] = Field(None, description="Orders to move")
+    all: bool = Field(False, description="Move every eligible order instead of order_ids")
+    from_status: Optional[List[OrderStatus]] = Field(None, description="Only move orders currently in these statuses")
+    chunk_size: int = Field(1000, ge=1, le=10_000, description="Orders updated per statement / transaction")
+
+    @model_validator(mode="after")
+    def ids_or_all(self):
+        # Moving every eligible order must be asked for, never the result of a missing field
+        if self.order_ids is None and not self.all:
+            raise ValueError("Give order_ids, or all=true to move every eligible order")
+        if self.order_ids is not None and self.all:
+            raise ValueError("Give either order_ids or all=true, not both")
+        return self
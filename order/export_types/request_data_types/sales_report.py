@@ -0,0 +1,35 @@
+import datetime
+import uuid
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from order.models.order_payment_status import OrderStatus
+from order.models.order_sales_rollup import RollupDimension, RollupGranularity
+
+# Hourly buckets over a longer range are refused; ask for daily ones instead
+SALES_REPORT_MAX_HOURS = 24 * 31
+
+
+class SalesReportRequestType(BaseModel):
+    start: datetime.datetime = Field(..., description="First bucket, inclusive")
+    end: datetime.datetime = Field(..., description="End of the range, exclusive")
+    granularity: RollupGranularity = Field(RollupGranularity.DAY, description="Bucket size")
+    dimension: RollupDimension = Field(RollupDimension.TOTAL, description="Group by product, category or nothing")
+    status: Optional[List[OrderStatus]] = Field(None, description="Only count orders in these statuses")
+    dimension_ids: Optional[List[uuid.UUID]] = Field(None, description="Only these products / categories")
+    include_live: bool = Field(False, description="Aggregate the part of the range past the watermark from the orders")
+
+    @field_validator("start", "end")
+    @classmethod
+    def utc_when_naive(cls, value):
+        # Buckets are UTC hours / days
+        return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
+
+    @model_validator(mode="after")
+    def valid_range(self):
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        if self.granularity == RollupGranularity.HOUR and self.end - self.start > datetime.timedelta(hours=SALES_REPORT_MAX_HOURS):
+            raise ValueError(f"Hourly reports cover at most {SALES_REPORT_MAX_HOURS} hours")
+        return self
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:52
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_api', '0002_user_auth_api_us_email_c29b6b_idx_and_more'),
+        ('order', '0002_order_total_amount_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('response_status', models.PositiveSmallIntegerField(null=True)),
+                ('response_body', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('customer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to='auth_api.user')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='order_idemp_created_71f335_idx')],
+            },
+        ),
+    ]
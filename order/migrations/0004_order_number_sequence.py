@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:53
+
+from django.db import migrations, models
+
+from order.services.order_number_service import ORDER_NUMBER_SEQUENCE, format_order_number
+
+
+def number_existing_orders(apps, schema_editor):
+    # Orders saved with the old default of 0 get a real number from the sequence
+    Order = apps.get_model('order', 'Order')
+    with schema_editor.connection.cursor() as cursor:
+        for order in Order.objects.filter(order_number__in=['', '0']).only('id'):
+            cursor.execute("SELECT nextval(%s)", [ORDER_NUMBER_SEQUENCE])
+            Order.objects.filter(pk=order.pk).update(order_number=format_order_number(cursor.fetchone()[0]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0003_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='order_number',
+            field=models.CharField(blank=True, max_length=100, unique=True),
+        ),
+        migrations.RunSQL(
+            f"CREATE SEQUENCE IF NOT EXISTS {ORDER_NUMBER_SEQUENCE} START 1000",
+            f"DROP SEQUENCE IF EXISTS {ORDER_NUMBER_SEQUENCE}",
+        ),
+        migrations.RunPython(number_existing_orders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:03
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_api', '0002_user_auth_api_us_email_c29b6b_idx_and_more'),
+        ('cart', '0003_cartitem_reserved_until'),
+        ('order', '0004_order_number_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSalesRollup',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('product', 'Product'), ('category', 'Category')], max_length=10)),
+                ('dimension_id', models.UUIDField(blank=True, null=True)),
+                ('order_status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled'), ('returned', 'Returned')], max_length=20)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['updated_at'], name='order_order_updated_910d82_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['order_date'], name='order_order_order_d_721359_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ordersalesrollup',
+            index=models.Index(fields=['granularity', 'dimension', 'bucket_start'], name='order_order_granula_e4e8c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ordersalesrollup',
+            index=models.Index(fields=['dimension_id', 'granularity', 'bucket_start'], name='order_order_dimensi_b0aabe_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ordersalesrollup',
+            constraint=models.UniqueConstraint(fields=('granularity', 'bucket_start', 'dimension', 'dimension_id', 'order_status'), name='unique_sales_rollup_row', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0005_order_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Discount percentage', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='discount_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='line_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_sku',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_slug',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='tax_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='tax_rate',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Tax percentage', max_digits=5),
+        ),
+        # Existing items were priced without discount or tax: their line total is what their
+        # order's total_amount already counted. SKU / slug are taken from the product once.
+        migrations.RunSQL(
+            "UPDATE order_orderitem AS oi SET line_total = oi.quantity * oi.price, "
+            "product_sku = p.sku, product_slug = p.slug "
+            "FROM product_product AS p WHERE p.id = oi.product_id",
+            migrations.RunSQL.noop,
+        ),
+    ]
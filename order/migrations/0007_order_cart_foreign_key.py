@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0004_release_ordered_cart_lines'),
+        ('order', '0006_order_item_price_snapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_order_cart_id_2e72a0_idx',
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='cart',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='cart.cart'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from auth_api.models.base_models.base_model import GenericBaseModel
+from auth_api.models.user_models.user import User
+
+
+class IdempotencyKey(GenericBaseModel):
+    """
+    A client-supplied Idempotency-Key and the response first sent for it. The row is
+    written in the same transaction as the work it guards, so it exists if and only if
+    that work was committed; a retry finds it with one lookup on the unique key.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys', null=True)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} ({self.response_status})"
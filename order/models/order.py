@@ -1,18 +1,24 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 
 from auth_api.models.base_models.base_model import GenericBaseModel
 from auth_api.models.user_models.user import User
 from cart.models.cart import Cart
+from cart.services.cart_pricing import price_product_line
 from order.models.order_item import OrderItem
 from order.models.order_payment_status import OrderStatus, PaymentStatus
+from order.models.order_transitions import can_transition
+from pure_authentication.metrics import timed
 
 
 class Order(GenericBaseModel):
     customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
-    cart = models.OneToOneField(Cart, on_delete=models.PROTECT, related_name='order', null=True)
-    order_number = models.CharField(max_length=100, unique=True, default=0)
+    # A user keeps one cart across checkouts, so the same cart is linked to each of their orders
+    cart = models.ForeignKey(Cart, on_delete=models.PROTECT, related_name='orders', null=True)
+    order_number = models.CharField(max_length=100, unique=True, blank=True)
 
     order_status = models.CharField(
         max_length=20,
@@ -25,7 +31,7 @@ class Order(GenericBaseModel):
         choices=PaymentStatus.choices,
         default=PaymentStatus.UNPAID
     )
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, validators=[MinValueValidator(0)])
 
     shipping_address = models.TextField(null=True, blank=True)
     billing_address = models.TextField(null=True, blank=True)
@@ -38,7 +44,9 @@ class Order(GenericBaseModel):
             models.Index(fields=['customer', 'order_date']),
             models.Index(fields=['order_status']),
             models.Index(fields=['payment_status']),
-            models.Index(fields=['cart']),
+            # Incremental analytics: changed orders since a watermark, then their time buckets
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['order_date']),
         ]
         ordering = ['-order_date']
 
@@ -51,42 +59,50 @@ class Order(GenericBaseModel):
     def get_total_value(self):
         return sum(item.get_subtotal() for item in self.order_items.all())
 
+    @timed("order.create_from_cart")
     def create_from_cart(self, cart):
+        """
+        Snapshot the cart lines into order items. Prefetch `items__product` on the cart:
+        each line is priced once by the cart pricing (price, discount, tax, line total) and
+        frozen with the product's name / SKU / slug, the total is the sum of the line
+        totals, then the order is written once and every item inserted with a single bulk
+        INSERT. Nothing about an order is recomputed from the catalog afterwards.
+        """
         self.cart = cart
-        self.save()
-        
-        # Create order items from cart items
+        order_items = []
+        total_amount = Decimal("0")
         for cart_item in cart.items.all():
-            OrderItem.objects.create(
-                order=self,
-                product=cart_item.product,
-                product_name=cart_item.product.name,
-                quantity=cart_item.quantity,
-                price=cart_item.product.price
-            )
-        
-        self.total_amount = self.get_total_value()
+            line = price_product_line(cart_item.product, cart_item.quantity)
+            order_items.append(OrderItem.from_priced_line(self, cart_item.product, line))
+            total_amount += line.line_total
+
+        self.total_amount = total_amount
         self.save()
+        OrderItem.objects.bulk_create(order_items)
         return self
 
+    def can_transition_to(self, order_status):
+        return can_transition(self.order_status, order_status)
+
     def can_cancel(self):
-        return self.order_status not in [OrderStatus.DELIVERED, OrderStatus.CANCELLED, OrderStatus.RETURNED]
+        return self.can_transition_to(OrderStatus.CANCELLED)
 
     def can_deliver(self):
-        return self.order_status == OrderStatus.SHIPPED
+        return self.can_transition_to(OrderStatus.DELIVERED)
+
+    def save(self, *args, **kwargs):
+        from order.services.order_export_service import OrderExportService
+
+        if not self.order_number:
+            from order.services.order_number_service import order_number_allocator
+            self.order_number = order_number_allocator.next_number()
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: OrderExportService.invalidate([self.pk]))
 
     def mark_as_delivered(self):
         if self.can_deliver():
             self.order_status = OrderStatus.DELIVERED
             self.delivery_date = timezone.now()
-            self.save()
+            self.save(update_fields=['order_status', 'delivery_date', 'updated_at'])
             return True
         return False
-
-    def save(self, *args, **kwargs):
-        # Auto-calculate total_amount if not set or if order items exist
-        if self.pk and (self.total_amount is None or self.total_amount == 0):
-            total = self.get_total_value()
-            # if total:
-            self.total_amount = total
-        super().save(*args, **kwargs)
\ No newline at end of file
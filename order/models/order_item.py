@@ -1,15 +1,24 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 
 from auth_api.models.base_models.base_model import GenericBaseModel
+from cart.services.cart_pricing import PricedLine, price_line
 from product.models.product import Product
 
 class OrderItem(GenericBaseModel):
     order = models.ForeignKey('order.Order', on_delete=models.CASCADE, related_name='order_items')
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     product_name = models.CharField(max_length=255)
+    product_sku = models.CharField(max_length=32, blank=True, default='')
+    product_slug = models.CharField(max_length=50, blank=True, default='')
     quantity = models.PositiveIntegerField(default=1, validators=[MinValueValidator(1)])
+    # Pricing frozen at placement (see cart_pricing.price_line): later product changes never reach an order
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    discount = models.DecimalField(max_digits=5, decimal_places=2, default=0, help_text="Discount percentage")
+    discount_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    tax_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0, help_text="Tax percentage")
+    tax_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     class Meta:
         indexes = [
@@ -21,7 +30,65 @@ class OrderItem(GenericBaseModel):
     def __str__(self):
         return f"{self.product_name} x {self.quantity}"
 
+    @classmethod
+    def from_priced_line(cls, order, product, line: PricedLine) -> 'OrderItem':
+        return cls(
+            order=order,
+            product=product,
+            product_name=product.name,
+            product_sku=product.sku or '',
+            product_slug=product.slug or '',
+            quantity=line.quantity,
+            price=line.unit_price,
+            discount=line.discount,
+            discount_amount=line.discount_amount,
+            tax_rate=line.tax_rate,
+            tax_amount=line.tax_amount,
+            line_total=line.line_total,
+        )
+
     def get_subtotal(self):
-        if self.quantity is None or self.price is None:
-            return 0
-        return self.quantity * self.price
\ No newline at end of file
+        return self.line_total or 0
+
+    def reprice(self):
+        """Recompute the frozen amounts from this line's own price, discount and tax rate"""
+        line = price_line(self.price, self.quantity, self.discount, self.tax_rate)
+        self.discount_amount, self.tax_amount, self.line_total = line.discount_amount, line.tax_amount, line.line_total
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What this row currently adds to its order's total, to turn edits into a delta
+        if {'order_id', 'line_total'} <= set(field_names):
+            instance._saved_line = (instance.order_id, instance.get_subtotal())
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Keep Order.total_amount in step with one UPDATE per changed order, by the
+        difference this save makes. bulk_create and queryset update() / delete() bypass
+        this; reconcile_order_totals recomputes totals written that way.
+        """
+        from order.services.order_total_service import OrderTotalService
+
+        saved_order_id, saved_subtotal = getattr(self, '_saved_line', (self.order_id, 0))
+        if self.price is not None and self.quantity is not None:
+            self.reprice()
+        subtotal = self.get_subtotal()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if saved_order_id != self.order_id:
+                OrderTotalService.apply_total_delta(saved_order_id, -saved_subtotal)
+                saved_subtotal = 0
+            OrderTotalService.apply_total_delta(self.order_id, subtotal - saved_subtotal)
+        self._saved_line = (self.order_id, subtotal)
+
+    def delete(self, *args, **kwargs):
+        from order.services.order_total_service import OrderTotalService
+
+        order_id, subtotal = getattr(self, '_saved_line', (self.order_id, self.get_subtotal()))
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            OrderTotalService.apply_total_delta(order_id, -subtotal)
+        self._saved_line = (order_id, 0)
+        return result
\ No newline at end of file
@@ -0,0 +1,47 @@
+from django.db import models
+
+from auth_api.models.base_models.base_model import GenericBaseModel
+from order.models.order_payment_status import OrderStatus
+
+
+class RollupGranularity(models.TextChoices):
+    HOUR = "hour", "Hour"
+    DAY = "day", "Day"
+
+
+class RollupDimension(models.TextChoices):
+    TOTAL = "total", "Total"
+    PRODUCT = "product", "Product"
+    CATEGORY = "category", "Category"
+
+
+class OrderSalesRollup(GenericBaseModel):
+    """
+    Pre-aggregated sales of one time bucket, order status and dimension value: every
+    order, a product (`dimension_id` = product id) or a category (category id). Kept up to
+    date by `refresh_sales_rollups`; reports read only this table.
+    """
+    granularity = models.CharField(max_length=10, choices=RollupGranularity.choices)
+    bucket_start = models.DateTimeField()
+    dimension = models.CharField(max_length=10, choices=RollupDimension.choices)
+    dimension_id = models.UUIDField(null=True, blank=True)
+    order_status = models.CharField(max_length=20, choices=OrderStatus.choices)
+    orders = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['granularity', 'dimension', 'bucket_start']),
+            models.Index(fields=['dimension_id', 'granularity', 'bucket_start']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket_start', 'dimension', 'dimension_id', 'order_status'],
+                name='unique_sales_rollup_row',
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start:%Y-%m-%d %H:%M} {self.dimension} {self.order_status}"
@@ -0,0 +1,28 @@
+from typing import Dict, FrozenSet, List
+
+from order.models.order_payment_status import OrderStatus
+
+# Legal order status changes: status -> statuses it may move to. Cancelled and returned are final.
+ORDER_TRANSITIONS: Dict[str, FrozenSet[str]] = {
+    OrderStatus.PENDING: frozenset({OrderStatus.PROCESSING, OrderStatus.CANCELLED}),
+    OrderStatus.PROCESSING: frozenset({OrderStatus.SHIPPED, OrderStatus.CANCELLED}),
+    OrderStatus.SHIPPED: frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED}),
+    OrderStatus.DELIVERED: frozenset({OrderStatus.RETURNED}),
+    OrderStatus.CANCELLED: frozenset(),
+    OrderStatus.RETURNED: frozenset(),
+}
+
+# Statuses whose units are still in the warehouse; only cancelling from them restocks.
+# A shipped order's units are with the carrier and are not back on the shelf when it is cancelled.
+RESTOCKABLE_STATUSES: FrozenSet[str] = frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING})
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in ORDER_TRANSITIONS.get(from_status, ())
+
+
+def allowed_sources(to_status: str) -> List[str]:
+    """Statuses an order may be in to move to `to_status`, for `WHERE order_status IN (...)`."""
+    if to_status not in ORDER_TRANSITIONS:
+        raise ValueError(f"Unknown order status '{to_status}', expected one of {', '.join(OrderStatus.values)}")
+    return sorted(status for status, targets in ORDER_TRANSITIONS.items() if to_status in targets)
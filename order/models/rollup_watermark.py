@@ -0,0 +1,15 @@
+from django.db import models
+
+from auth_api.models.base_models.base_model import GenericBaseModel
+
+
+class RollupWatermark(GenericBaseModel):
+    """
+    How far an incremental refresh has read: every order updated at or before
+    `watermark` is reflected in the rollups named `name`.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
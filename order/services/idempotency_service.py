@@ -0,0 +1,71 @@
+import hashlib
+import json
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from order.models.idempotency_key import IdempotencyKey
+from pure_authentication.purge import purge_in_batches
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a request with a different body."""
+
+
+class IdempotencyService:
+
+    @staticmethod
+    def request_hash(data) -> str:
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def get_completed(key: str, request_hash: str) -> Optional[IdempotencyKey]:
+        """
+        The stored response for `key`, or None if the key is new. One lookup on the unique
+        index; meant to run before any lock is taken.
+        """
+        record = IdempotencyKey.objects.filter(key=key).first()
+        if record is None:
+            return None
+        if record.request_hash != request_hash:
+            raise IdempotencyKeyMismatch(f"Idempotency key '{key}' was already used for a different request")
+        return record
+
+    @staticmethod
+    def claim(key: str, request_hash: str, customer_id=None) -> Tuple[IdempotencyKey, bool]:
+        """
+        Insert the key inside the caller's transaction, before its work. A concurrent
+        request with the same key waits on the unique index until the first one commits
+        (then gets its record back, created=False) or rolls back (then claims it itself).
+        """
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    key=key, request_hash=request_hash, customer_id=customer_id
+                ), True
+        except IntegrityError:
+            record = IdempotencyService.get_completed(key, request_hash)
+            if record is None:
+                raise
+            return record, False
+
+    @staticmethod
+    def complete(record: IdempotencyKey, response_status: int, response_body) -> IdempotencyKey:
+        record.response_status = response_status
+        record.response_body = response_body
+        record.save(update_fields=['response_status', 'response_body', 'updated_at'])
+        return record
+
+    @staticmethod
+    def purge_expired(batch_size: int = 1000) -> int:
+        """
+        Delete keys older than IDEMPOTENCY_KEY_TTL, one batch per statement. Until then a
+        key keeps replaying its response.
+        """
+        cutoff = timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+        return purge_in_batches(IdempotencyKey.objects.filter(created_at__lt=cutoff), batch_size)
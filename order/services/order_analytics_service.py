@@ -0,0 +1,243 @@
+import datetime
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from order.export_types.order_types.export_sales_report import (
+    ExportSalesBucket, ExportSalesReport, SalesRollupRefreshResult
+)
+from order.export_types.request_data_types.sales_report import SalesReportRequestType
+from order.models.order import Order
+from order.models.order_item import OrderItem
+from order.models.order_sales_rollup import OrderSalesRollup, RollupDimension, RollupGranularity
+from order.models.rollup_watermark import RollupWatermark
+from product.models.product import Product
+
+SALES_ROLLUP_WATERMARK = "order_sales_rollup"
+# Key of the session advisory lock that keeps two refreshes from interleaving
+SALES_ROLLUP_LOCK_KEY = 4_901_001
+
+
+def _aggregate_sql(granularity: str, window: str) -> str:
+    """
+    SELECT of (bucket, status, dimension, dimension id, orders, units, revenue) over the
+    orders matched by `window`, an SQL condition on `o`. One pass with GROUPING SETS gives
+    the per-product, per-category and total rows together; GROUPING() tells them apart.
+    """
+    quote = connection.ops.quote_name
+    return (
+        f"SELECT date_trunc('{granularity}', o.order_date) AS bucket, o.order_status, "
+        f"CASE GROUPING(oi.product_id, p.category_id) "
+        f"  WHEN 1 THEN '{RollupDimension.PRODUCT}' WHEN 2 THEN '{RollupDimension.CATEGORY}' "
+        f"  ELSE '{RollupDimension.TOTAL}' END AS dimension, "
+        f"COALESCE(oi.product_id, p.category_id) AS dimension_id, "
+        f"COUNT(DISTINCT o.id), SUM(oi.quantity), SUM(oi.line_total) "
+        f"FROM {quote(Order._meta.db_table)} o "
+        f"JOIN {quote(OrderItem._meta.db_table)} oi ON oi.order_id = o.id "
+        f"JOIN {quote(Product._meta.db_table)} p ON p.id = oi.product_id "
+        f"WHERE {window} "
+        f"GROUP BY GROUPING SETS ("
+        f"  (1, o.order_status, oi.product_id), (1, o.order_status, p.category_id), (1, o.order_status)"
+        f")"
+    )
+
+
+class OrderAnalyticsService:
+
+    @staticmethod
+    def get_watermark() -> Optional[datetime.datetime]:
+        return RollupWatermark.objects.filter(name=SALES_ROLLUP_WATERMARK).values_list('watermark', flat=True).first()
+
+    @staticmethod
+    def refresh_rollups(
+        rebuild: bool = False,
+        lag: Optional[datetime.timedelta] = None,
+        chunk_days: int = 31,
+        on_chunk: Optional[Callable[[SalesRollupRefreshResult], None]] = None,
+    ) -> SalesRollupRefreshResult:
+        """
+        Bring the rollups up to date with the orders changed since the watermark. Only the
+        hours holding such an order are recomputed: per chunk of `chunk_days` days, one
+        transaction deletes and re-inserts those hours from the orders (INSERT ... SELECT)
+        and then those days from the hour rows, so a rerun after a failure repeats work
+        but never double counts. The watermark moves to now - `lag` at the end; the lag
+        leaves in-flight transactions time to commit before their rows fall behind it.
+        `rebuild` empties the rollups and starts from the first order. Returns skipped
+        when another refresh holds the lock.
+        """
+        started = time.monotonic()
+        lag = settings.SALES_ROLLUP_LAG if lag is None else lag
+        result = SalesRollupRefreshResult()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [SALES_ROLLUP_LOCK_KEY])
+            if not cursor.fetchone()[0]:
+                result.skipped = True
+                return result
+        try:
+            watermark, _ = RollupWatermark.objects.get_or_create(name=SALES_ROLLUP_WATERMARK)
+            if rebuild:
+                with transaction.atomic():
+                    OrderSalesRollup.objects.all().delete()
+                    watermark.watermark = None
+                    watermark.save(update_fields=['watermark', 'updated_at'])
+            result.previous_watermark = watermark.watermark
+            upper = timezone.now() - lag
+
+            changed = Order.objects.filter(updated_at__lte=upper)
+            if watermark.watermark is not None:
+                changed = changed.filter(updated_at__gt=watermark.watermark)
+            with connection.cursor() as cursor:
+                sql, params = changed.order_by().values('order_date').query.sql_with_params()
+                cursor.execute(
+                    f"SELECT DISTINCT date_trunc('hour', changed.order_date) FROM ({sql}) AS changed ORDER BY 1", params
+                )
+                hours = [row[0] for row in cursor.fetchall()]
+
+            by_day: Dict[datetime.datetime, List[datetime.datetime]] = defaultdict(list)
+            for hour in hours:
+                by_day[hour.replace(hour=0)].append(hour)
+            days = sorted(by_day)
+            for start in range(0, len(days), chunk_days):
+                chunk = days[start:start + chunk_days]
+                with transaction.atomic():
+                    result.rows += OrderAnalyticsService._refresh_buckets(
+                        [hour for day in chunk for hour in by_day[day]], chunk
+                    )
+                result.hours += sum(len(by_day[day]) for day in chunk)
+                result.days += len(chunk)
+                result.chunks += 1
+                if on_chunk:
+                    on_chunk(result)
+
+            watermark.watermark = upper
+            watermark.save(update_fields=['watermark', 'updated_at'])
+            result.watermark = upper
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [SALES_ROLLUP_LOCK_KEY])
+        result.duration_seconds = round(time.monotonic() - started, 3)
+        return result
+
+    @staticmethod
+    def _refresh_buckets(hours: List[datetime.datetime], days: List[datetime.datetime]) -> int:
+        table = connection.ops.quote_name(OrderSalesRollup._meta.db_table)
+        columns = "id, created_at, updated_at, granularity, bucket_start, order_status, dimension, dimension_id, orders, units, revenue"
+        now = timezone.now()
+        rows = 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE granularity = %s AND bucket_start = ANY(%s)", [RollupGranularity.HOUR, hours]
+            )
+            # The order_date range lets the index narrow the scan, the hour list does the rest
+            window = (
+                "o.order_date >= %s AND o.order_date < %s + interval '1 hour' "
+                "AND date_trunc('hour', o.order_date) = ANY(%s::timestamptz[])"
+            )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT gen_random_uuid(), %s, %s, %s, agg.* FROM ({_aggregate_sql('hour', window)}) AS agg",
+                [now, now, RollupGranularity.HOUR, hours[0], hours[-1], hours]
+            )
+            rows += cursor.rowcount
+            cursor.execute(
+                f"DELETE FROM {table} WHERE granularity = %s AND bucket_start = ANY(%s)", [RollupGranularity.DAY, days]
+            )
+            # An order falls in exactly one hour, so summing the hours' order counts is exact
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT gen_random_uuid(), %s, %s, %s, date_trunc('day', bucket_start), order_status, dimension, "
+                f"dimension_id, SUM(orders), SUM(units), SUM(revenue) FROM {table} "
+                f"WHERE granularity = %s AND bucket_start >= %s AND bucket_start < %s + interval '1 day' "
+                f"AND date_trunc('day', bucket_start) = ANY(%s::timestamptz[]) "
+                f"GROUP BY 5, order_status, dimension, dimension_id",
+                [now, now, RollupGranularity.DAY, RollupGranularity.HOUR, days[0], days[-1], days]
+            )
+            rows += cursor.rowcount
+        return rows
+
+    @staticmethod
+    def sales_report(request_data: SalesReportRequestType) -> ExportSalesReport:
+        """
+        Sales per bucket of the requested range, summed over the requested statuses, with
+        one GROUP BY on the rollup table. With `include_live`, buckets from the one holding
+        the watermark onwards are aggregated from the orders instead; that tail is the only
+        part of a report that reads the base tables.
+        """
+        report = ExportSalesReport(
+            granularity=request_data.granularity,
+            dimension=request_data.dimension,
+            start=request_data.start,
+            end=request_data.end,
+            watermark=OrderAnalyticsService.get_watermark(),
+        )
+        rollup_end = request_data.end
+        if request_data.include_live:
+            live_from = OrderAnalyticsService._bucket_floor(
+                report.watermark or request_data.start, request_data.granularity
+            )
+            live_from = max(live_from, request_data.start)
+            if live_from < request_data.end:
+                report.live_from = live_from
+                rollup_end = live_from
+
+        buckets: Dict[tuple, ExportSalesBucket] = {}
+        rollups = OrderSalesRollup.objects.filter(
+            granularity=request_data.granularity,
+            dimension=request_data.dimension,
+            bucket_start__gte=request_data.start,
+            bucket_start__lt=rollup_end,
+        )
+        if request_data.status:
+            rollups = rollups.filter(order_status__in=request_data.status)
+        if request_data.dimension_ids:
+            rollups = rollups.filter(dimension_id__in=request_data.dimension_ids)
+        for row in (
+            rollups.values('bucket_start', 'dimension_id')
+            .annotate(orders=Sum('orders'), units=Sum('units'), revenue=Sum('revenue'))
+            .order_by('bucket_start', 'dimension_id')
+        ):
+            buckets[(row['bucket_start'], row['dimension_id'])] = ExportSalesBucket(**row)
+
+        if report.live_from:
+            OrderAnalyticsService._add_live_buckets(request_data, report.live_from, buckets)
+
+        report.buckets = sorted(buckets.values(), key=lambda bucket: (bucket.bucket_start, str(bucket.dimension_id)))
+        for bucket in report.buckets:
+            report.orders += bucket.orders
+            report.units += bucket.units
+            report.revenue += bucket.revenue
+        return report
+
+    @staticmethod
+    def _add_live_buckets(request_data: SalesReportRequestType, live_from: datetime.datetime, buckets: Dict):
+        window = "o.order_date >= %s AND o.order_date < %s"
+        params = [live_from, request_data.end]
+        if request_data.status:
+            window += " AND o.order_status = ANY(%s)"
+            params.append(list(request_data.status))
+        with connection.cursor() as cursor:
+            cursor.execute(_aggregate_sql(request_data.granularity, window), params)
+            rows = cursor.fetchall()
+        dimension_ids = set(request_data.dimension_ids or ())
+        for bucket_start, _, dimension, dimension_id, orders, units, revenue in rows:
+            if dimension != request_data.dimension or (dimension_ids and dimension_id not in dimension_ids):
+                continue
+            bucket = buckets.setdefault(
+                (bucket_start, dimension_id), ExportSalesBucket(bucket_start=bucket_start, dimension_id=dimension_id)
+            )
+            bucket.orders += orders
+            bucket.units += units
+            bucket.revenue += revenue or Decimal("0")
+
+    @staticmethod
+    def _bucket_floor(moment: datetime.datetime, granularity: str) -> datetime.datetime:
+        moment = moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularity.DAY:
+            moment = moment.replace(hour=0)
+        return moment
@@ -0,0 +1,76 @@
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import caches
+from django.db.models import CharField, OuterRef
+from django.db.models.functions import Cast, JSONObject
+
+from order.export_types.order_types.export_order import ExportOrder
+from order.models.order import Order
+from order.models.order_item import OrderItem
+from order.models.order_transitions import ORDER_TRANSITIONS
+
+# Only final states (no legal transition out: cancelled, returned) are cached. A delivered order can
+# still be returned, and a per-process cache would keep serving it as delivered until the TTL.
+CACHEABLE_STATUSES = tuple(status for status, targets in ORDER_TRANSITIONS.items() if not targets)
+ORDER_FIELDS = (
+    'id', 'order_number', 'customer_id', 'cart_id', 'order_status', 'payment_status', 'total_amount',
+    'shipping_address', 'billing_address', 'order_date', 'delivery_date',
+)
+
+
+def _cache_key(order_id) -> str:
+    return f"order-export:{order_id}"
+
+
+class OrderExportService:
+
+    @staticmethod
+    def get_order(order_id) -> Optional[dict]:
+        """
+        JSON-ready ExportOrder of one order. Cancelled and returned orders come from the
+        cache, which unpickles a fresh dict on every get; any other order is read with one
+        query that returns the order row with its items aggregated into an array, then
+        validated once into ExportOrder. Items carry their frozen product data, so no
+        product is joined.
+        """
+        cache = caches[settings.ORDER_EXPORT_CACHE]
+        rendered = cache.get(_cache_key(order_id))
+        if rendered is not None:
+            return rendered
+
+        row = OrderExportService._fetch(order_id)
+        if row is None:
+            return None
+        rendered = ExportOrder(**row).model_dump(mode="json")
+        if row['order_status'] in CACHEABLE_STATUSES:
+            cache.set(_cache_key(order_id), rendered, settings.ORDER_EXPORT_CACHE_TTL)
+        return rendered
+
+    @staticmethod
+    def invalidate(order_ids: Iterable) -> None:
+        caches[settings.ORDER_EXPORT_CACHE].delete_many([_cache_key(order_id) for order_id in order_ids])
+
+    @staticmethod
+    def _fetch(order_id) -> Optional[dict]:
+        items = OrderItem.objects.filter(order_id=OuterRef('pk')).order_by('product_name').values(
+            json=JSONObject(
+                id='id',
+                product_id='product_id',
+                product_name='product_name',
+                product_sku='product_sku',
+                product_slug='product_slug',
+                quantity='quantity',
+                # As text: a JSON number would come back as a float
+                price=Cast('price', CharField()),
+                discount=Cast('discount', CharField()),
+                discount_amount=Cast('discount_amount', CharField()),
+                tax_amount=Cast('tax_amount', CharField()),
+                subtotal=Cast('line_total', CharField()),
+            )
+        )
+        row = Order.objects.filter(pk=order_id).values(*ORDER_FIELDS).annotate(items=ArraySubquery(items)).first()
+        if row is not None:
+            row['total_quantity'] = sum(item['quantity'] for item in row['items'])
+        return row
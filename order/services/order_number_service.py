@@ -0,0 +1,48 @@
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import connection
+
+ORDER_NUMBER_SEQUENCE = "order_order_number_seq"
+
+
+def format_order_number(value: int) -> str:
+    return f"{settings.ORDER_NUMBER_PREFIX}{value:0{settings.ORDER_NUMBER_DIGITS}d}"
+
+
+class OrderNumberAllocator:
+    """
+    Hands out order numbers from a Postgres sequence, ORDER_NUMBER_BLOCK_SIZE at a time:
+    one `nextval` round trip reserves a whole block for this process, which is then
+    served from memory under a thread lock. Numbers are unique across processes but
+    not gapless, and only roughly ordered between processes; unused numbers of a block
+    are lost when the process exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._block = deque()
+        self._pid = os.getpid()
+
+    def next_number(self) -> str:
+        with self._lock:
+            # A forked worker must not serve the numbers its parent already holds
+            if self._pid != os.getpid():
+                self._block.clear()
+                self._pid = os.getpid()
+            if not self._block:
+                self._block.extend(self._reserve_block(settings.ORDER_NUMBER_BLOCK_SIZE))
+            return format_order_number(self._block.popleft())
+
+    @staticmethod
+    def _reserve_block(size: int):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s) ORDER BY 1", [ORDER_NUMBER_SEQUENCE, size]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+order_number_allocator = OrderNumberAllocator()
@@ -1,13 +1,27 @@
+from collections import defaultdict
 from typing import Optional
 from django.db import transaction
+from django.db.models import Prefetch, Q
 from psycopg2 import DatabaseError
 
 from product.export_types.product_types.export_product import ExportProductList, ExportProduct
 from product.models.product import Product
 from django.core.exceptions import ValidationError
 
+from order.export_types.order_types.export_order_history import (
+    ExportOrderHistory, ExportOrderHistoryEntry, ExportOrderHistoryItem
+)
+from order.export_types.request_data_types.order_history import OrderHistoryRequestType, encode_history_cursor
 from order.models.order import Order
+from order.models.order_item import OrderItem
+from order.services.order_export_service import OrderExportService
 from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from product.services.stock_service import StockService
+from pure_authentication.outbox import publish
+
+HISTORY_FIELDS = ('id', 'order_number', 'order_status', 'payment_status', 'total_amount', 'order_date', 'delivery_date')
+
 
 class OrderService:
     # @staticmethod
@@ -31,18 +45,38 @@ class OrderService:
     def create_order_from_cart(cart_id: str, shipping_address: str = None, billing_address: str = None) -> Optional[Order]:
         try:
             with transaction.atomic():
-                cart = Cart.objects.select_related('user').prefetch_related('items__product').get(id=cart_id)
-                
-                if not cart.items.exists():
+                # Lines are locked so the reservation sweeper cannot release them while they are sold
+                cart = Cart.objects.prefetch_related(
+                    Prefetch('items', queryset=CartItem.objects.select_for_update(of=('self',)).select_related('product'))
+                ).get(id=cart_id)
+
+                # Read from the prefetch, not .exists(): that would be one more query
+                if not cart.items.all():
                     raise ValidationError("Cannot create order from empty cart")
-                
-                order = Order.objects.create(
-                    customer=cart.user,
+
+                # Not saved here: create_from_cart writes the order once, with its total
+                order = Order(
+                    customer_id=cart.user_id,
                     shipping_address=shipping_address,
                     billing_address=billing_address or shipping_address
                 )
-                
+
                 order.create_from_cart(cart)
+                publish("order.placed", "order", order.id, {
+                    "order_number": order.order_number,
+                    "customer_id": order.customer_id,
+                    "total_amount": order.total_amount,
+                    "items": [
+                        {"product_id": item.product_id, "quantity": item.quantity} for item in cart.items.all()
+                    ],
+                })
+
+                # The cart's hold becomes the sale: its units leave reserved_quantity for good
+                quantities = defaultdict(int)
+                for item in cart.items.all():
+                    quantities[item.product_id] += item.quantity
+                StockService.consume_reservations(quantities)
+                CartItem.objects.filter(id__in=[item.id for item in cart.items.all()]).delete()
                 return order
                 
         except Cart.DoesNotExist:
@@ -51,15 +85,41 @@ class OrderService:
             raise ValidationError(f"Error creating order: {str(e)}")
         
     @staticmethod
-    def get_order_by_id(order_id: str) -> Optional[Order]:
-        try:
-            return Order.objects.select_related('customer', 'cart').prefetch_related('order_items__product').get(id=order_id)
-        except Order.DoesNotExist:
-            return None
+    def get_order_by_id(order_id: str) -> Optional[dict]:
+        """The order as a JSON-ready ExportOrder dict, or None; see OrderExportService.get_order."""
+        return OrderExportService.get_order(order_id)
             
     @staticmethod
-    def get_all_orders(user_id: str = None) -> list[Order]:
-        queryset = Order.objects.select_related('customer', 'cart').prefetch_related('order_items__product')
-        if user_id:
-            queryset = queryset.filter(customer_id=user_id)
-        return queryset.order_by('-order_date')
\ No newline at end of file
+    def get_order_history(request_data: OrderHistoryRequestType) -> ExportOrderHistory:
+        """
+        One page of a customer's orders, newest first, by keyset pagination on
+        (order_date, id): the page is a range scan of the (customer, order_date) index
+        however deep it is, never an OFFSET. Items, when asked for, cost one more query
+        for the whole page and read only the order item rows.
+        """
+        queryset = Order.objects.filter(customer_id=request_data.user_id)
+        if request_data.after:
+            order_date, order_id = request_data.after
+            queryset = queryset.filter(order_date__lte=order_date).filter(
+                Q(order_date__lt=order_date) | Q(id__lt=order_id)
+            )
+        rows = list(
+            queryset.order_by('-order_date', '-id').values(*HISTORY_FIELDS)[:request_data.limit + 1]
+        )
+        has_more = len(rows) > request_data.limit
+        rows = rows[:request_data.limit]
+
+        if request_data.include_items and rows:
+            items = {row['id']: [] for row in rows}
+            for item in OrderItem.objects.filter(order_id__in=items).values(
+                'order_id', 'product_id', 'product_name', 'quantity', 'price', 'line_total'
+            ).order_by('product_name'):
+                items[item.pop('order_id')].append(ExportOrderHistoryItem(**item))
+            for row in rows:
+                row['items'] = items[row['id']]
+
+        return ExportOrderHistory(
+            orders=[ExportOrderHistoryEntry(**row) for row in rows],
+            next_cursor=encode_history_cursor(rows[-1]['order_date'], rows[-1]['id']) if has_more else None,
+            has_more=has_more,
+        )
@@ -0,0 +1,120 @@
+import time
+from typing import Callable, Iterable, List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from order.export_types.order_types.order_transition_result import OrderTransitionResult
+from order.models.order import Order
+from order.models.order_item import OrderItem
+from order.models.order_payment_status import OrderStatus
+from order.models.order_transitions import RESTOCKABLE_STATUSES, allowed_sources
+from order.services.order_export_service import OrderExportService
+from product.services.stock_service import StockService
+from pure_authentication.outbox import publish_many
+
+
+class OrderStatusService:
+
+    @staticmethod
+    def bulk_transition(
+        to_status: str,
+        order_ids: Optional[Iterable] = None,
+        all_eligible: bool = False,
+        from_statuses: Optional[List[str]] = None,
+        chunk_size: int = 1000,
+        on_chunk: Optional[Callable[[OrderTransitionResult], None]] = None,
+    ) -> OrderTransitionResult:
+        """
+        Move many orders to `to_status`, `chunk_size` at a time, each chunk with one
+        UPDATE ... WHERE order_status IN (<legal sources>) in its own transaction. With
+        `order_ids` the chunks walk those ids and every id is reported as transitioned,
+        rejected or not found; with `all_eligible` instead, the chunks are claimed from the
+        order_status index with FOR UPDATE SKIP LOCKED until no eligible order is left.
+        Exactly one of the two must be given. `from_statuses`
+        narrows the legal sources. Orders cancelled before they shipped give their units
+        back to stock with one GROUP BY and one set-based UPDATE per chunk.
+        """
+        if order_ids is None and not all_eligible:
+            raise ValueError("Give order_ids, or all_eligible=True to move every eligible order")
+        if order_ids is not None and all_eligible:
+            raise ValueError("Give either order_ids or all_eligible=True, not both")
+        started = time.monotonic()
+        sources = allowed_sources(to_status)
+        if from_statuses:
+            sources = [status for status in sources if status in set(from_statuses)]
+        result = OrderTransitionResult(to_status=to_status)
+
+        if order_ids is not None:
+            order_ids = list(dict.fromkeys(str(Order._meta.pk.to_python(order_id)) for order_id in order_ids))
+            for start in range(0, len(order_ids), chunk_size):
+                chunk = order_ids[start:start + chunk_size]
+                with transaction.atomic():
+                    moved = OrderStatusService._transition_chunk(to_status, sources, chunk, chunk_size, result)
+                missed = [order_id for order_id in chunk if order_id not in moved]
+                if missed:
+                    current = dict(Order.objects.filter(id__in=missed).values_list('id', 'order_status'))
+                    for order_id in missed:
+                        order_id = Order._meta.pk.to_python(order_id)
+                        if order_id in current:
+                            result.rejected[order_id] = current[order_id]
+                        else:
+                            result.not_found.append(order_id)
+                result.chunks += 1
+                if on_chunk:
+                    on_chunk(result)
+        elif sources:
+            while True:
+                with transaction.atomic():
+                    moved = OrderStatusService._transition_chunk(to_status, sources, None, chunk_size, result)
+                if not moved:
+                    break
+                result.chunks += 1
+                if on_chunk:
+                    on_chunk(result)
+
+        result.duration_seconds = round(time.monotonic() - started, 3)
+        return result
+
+    @staticmethod
+    def _transition_chunk(to_status: str, sources: List[str], order_ids, limit: int, result) -> set:
+        if not sources:
+            return set()
+        table = connection.ops.quote_name(Order._meta.db_table)
+        if order_ids is not None:
+            target = f"SELECT id, order_status FROM {table} WHERE id = ANY(%s::uuid[]) AND order_status = ANY(%s) FOR UPDATE"
+            params = [order_ids, sources]
+        else:
+            target = f"SELECT id, order_status FROM {table} WHERE order_status = ANY(%s) LIMIT %s FOR UPDATE SKIP LOCKED"
+            params = [sources, limit]
+        now = timezone.now()
+        assignments = "order_status = %s, updated_at = %s"
+        params += [to_status, now]
+        if to_status == OrderStatus.DELIVERED:
+            assignments += ", delivery_date = %s"
+            params.append(now)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH target AS ({target}) UPDATE {table} AS o SET {assignments} "
+                f"FROM target WHERE o.id = target.id RETURNING o.id, target.order_status",
+                params
+            )
+            moved = {Order._meta.pk.to_python(order_id): previous for order_id, previous in cursor.fetchall()}
+        if not moved:
+            return set()
+
+        restock = [order_id for order_id, previous in moved.items() if previous in RESTOCKABLE_STATUSES]
+        if to_status == OrderStatus.CANCELLED and restock:
+            quantities = dict(
+                OrderItem.objects.filter(order_id__in=restock).values('product_id')
+                .annotate(total=Sum('quantity')).values_list('product_id', 'total')
+            )
+            StockService.return_stock(quantities)
+            result.restocked_units += sum(quantities.values())
+        publish_many("order.status_changed", "order", {
+            order_id: {"from": previous, "to": to_status} for order_id, previous in moved.items()
+        })
+        transaction.on_commit(lambda: OrderExportService.invalidate(moved))
+        result.transitioned.update(moved)
+        return {str(order_id) for order_id in moved}
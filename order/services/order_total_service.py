@@ -0,0 +1,102 @@
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from order.export_types.order_types.order_total_drift import OrderTotalDrift
+from order.models.order import Order
+from order.models.order_item import OrderItem
+from order.services.order_export_service import OrderExportService
+
+
+class OrderTotalService:
+
+    @staticmethod
+    def apply_total_delta(order_id: UUID, delta: Decimal) -> int:
+        """
+        Move an order's total by `delta` with one UPDATE, without reading its items.
+        updated_at moves too, so the sales rollups pick the change up.
+        """
+        if not delta:
+            return 0
+        transaction.on_commit(lambda: OrderExportService.invalidate([order_id]))
+        return Order.objects.filter(pk=order_id).update(
+            total_amount=F('total_amount') + delta, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def count_orders() -> int:
+        return Order.objects.count()
+
+    @staticmethod
+    def scan_total_drift(chunk_size: int = 5000) -> Iterator[Tuple[int, List[OrderTotalDrift]]]:
+        """
+        Walk the orders in primary-key order, `chunk_size` at a time. For each chunk one
+        statement sums the frozen line totals of those orders' items with GROUP BY and joins the
+        sums back to the orders; drifting orders are kept.
+        Yields (orders scanned in this chunk, drifts found in this chunk).
+        """
+        quote = connection.ops.quote_name
+        sql = (
+            f"WITH chunk AS ("
+            f"  SELECT id, order_number, total_amount FROM {quote(Order._meta.db_table)}"
+            f"  WHERE %s::uuid IS NULL OR id > %s::uuid ORDER BY id LIMIT %s"
+            f"), totals AS ("
+            f"  SELECT oi.order_id, SUM(oi.line_total) AS total FROM {quote(OrderItem._meta.db_table)} oi"
+            f"  JOIN chunk ON chunk.id = oi.order_id GROUP BY oi.order_id"
+            f") "
+            f"SELECT chunk.id, chunk.order_number, chunk.total_amount, COALESCE(totals.total, 0) "
+            f"FROM chunk LEFT JOIN totals ON totals.order_id = chunk.id ORDER BY chunk.id"
+        )
+        last_id: Optional[str] = None
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [last_id, last_id, chunk_size])
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            last_id = str(rows[-1][0])
+            drifts = [
+                OrderTotalDrift(
+                    order_id=UUID(str(order_id)),
+                    order_number=order_number,
+                    total_amount=total_amount,
+                    actual_total_amount=actual_total,
+                )
+                for order_id, order_number, total_amount, actual_total in rows
+                if total_amount != actual_total
+            ]
+            yield len(rows), drifts
+            if len(rows) < chunk_size:
+                return
+
+    @staticmethod
+    def apply_fixes(drifts: List[OrderTotalDrift], batch_size: int = 1000) -> int:
+        """
+        Write the recomputed totals with one UPDATE ... FROM (VALUES ...) per batch, each
+        batch in its own short transaction. A row is only written if it still holds the
+        total seen by the scan, so orders whose items changed meanwhile are left for the
+        next run. Returns the number of orders fixed.
+        """
+        table = connection.ops.quote_name(Order._meta.db_table)
+        fixed = 0
+        for start in range(0, len(drifts), batch_size):
+            batch = drifts[start:start + batch_size]
+            values_sql = ", ".join(["(%s::uuid, %s::numeric, %s::numeric)"] * len(batch))
+            params = []
+            for drift in batch:
+                params.extend([str(drift.order_id), drift.total_amount, drift.actual_total_amount])
+            sql = (
+                f"UPDATE {table} AS o SET total_amount = v.new_total "
+                f"FROM (VALUES {values_sql}) AS v(id, old_total, new_total) "
+                f"WHERE o.id = v.id AND o.total_amount = v.old_total"
+            )
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    fixed += cursor.rowcount
+            OrderExportService.invalidate([drift.order_id for drift in batch])
+        return fixed
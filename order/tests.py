@@ -1,3 +1,353 @@
-from django.test import TestCase
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from pydantic import ValidationError
+
+from cart.export_types.request_data_types.add_to_cart import AddToCartRequestType
+from cart.export_types.request_data_types.cart_product import CartProductRequestType
+from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from cart.services.cart_services import CartServices
+from order.models.idempotency_key import IdempotencyKey
+from order.models.order import Order
+from order.export_types.request_data_types.order_transition import OrderTransitionRequestType
+from order.models.order_payment_status import OrderStatus
+from order.services.idempotency_service import IdempotencyService
+from order.services.order_export_service import OrderExportService
+from order.services.order_number_service import OrderNumberAllocator, order_number_allocator
+from order.services.order_service import OrderService
+from order.services.order_status_service import OrderStatusService
+from product.models.product import Product
+from pure_authentication.benchmarks.data import SyntheticData
+from pure_authentication.query_budget import assert_query_budget, query_budget
+from pure_authentication.testing import QueryBudgetTestCase
+
+
+class OrderCancellationTests(TestCase):
+
+    def setUp(self):
+        self.data = SyntheticData(seed=1)
+        self.products = self.data.create_catalog(1, 3, stock=100)
+
+    def place_order(self) -> Order:
+        cart = self.data.create_carts(self.data.create_users(1), self.products, 3)[0]
+        return OrderService.create_order_from_cart(cart.id, "1 Test Street")
+
+    def stock(self) -> dict:
+        return dict(Product.objects.filter(id__in=[product.id for product in self.products]).values_list('id', 'stock'))
+
+    def test_cancelling_before_shipping_restocks(self):
+        order = self.place_order()
+        before = self.stock()
+        OrderStatusService.bulk_transition(OrderStatus.PROCESSING, order_ids=[order.id])
+
+        result = OrderStatusService.bulk_transition(OrderStatus.CANCELLED, order_ids=[order.id])
+
+        sold = {item.product_id: item.quantity for item in order.order_items.all()}
+        self.assertEqual(result.restocked_units, sum(sold.values()))
+        self.assertEqual(self.stock(), {product_id: stock + sold[product_id] for product_id, stock in before.items()})
+
+    def test_cancelling_a_shipped_order_does_not_restock(self):
+        order = self.place_order()
+        OrderStatusService.bulk_transition(OrderStatus.PROCESSING, order_ids=[order.id])
+        OrderStatusService.bulk_transition(OrderStatus.SHIPPED, order_ids=[order.id])
+        before = self.stock()
+
+        result = OrderStatusService.bulk_transition(OrderStatus.CANCELLED, order_ids=[order.id])
+
+        self.assertIn(order.id, result.transitioned)
+        self.assertEqual(result.restocked_units, 0)
+        self.assertEqual(self.stock(), before)
+
+
+class BulkTransitionTargetTests(TestCase):
+    """Every eligible order is only moved when asked for explicitly"""
+
+    def setUp(self):
+        data = SyntheticData(seed=13)
+        products = data.create_catalog(1, 2, stock=100)
+        self.orders = [
+            OrderService.create_order_from_cart(cart.id, "1 Test Street")
+            for cart in data.create_carts(data.create_users(3), products, 1)
+        ]
+
+    def pending(self) -> int:
+        return Order.objects.filter(order_status=OrderStatus.PENDING).count()
+
+    def ids_file(self, *lines) -> str:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as ids_file:
+            ids_file.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, ids_file.name)
+        return ids_file.name
+
+    def test_service_refuses_without_ids_or_all_eligible(self):
+        with self.assertRaises(ValueError):
+            OrderStatusService.bulk_transition(OrderStatus.PROCESSING)
+        self.assertEqual(self.pending(), 3)
+
+        result = OrderStatusService.bulk_transition(OrderStatus.PROCESSING, all_eligible=True)
+        self.assertEqual(len(result.transitioned), 3)
+
+    def test_request_needs_order_ids_or_all(self):
+        with self.assertRaises(ValidationError):
+            OrderTransitionRequestType(to_status=OrderStatus.PROCESSING)
+        with self.assertRaises(ValidationError):
+            OrderTransitionRequestType(to_status=OrderStatus.PROCESSING, order_ids=[self.orders[0].id], all=True)
+        self.assertTrue(OrderTransitionRequestType(to_status=OrderStatus.PROCESSING, all=True).all)
+
+    def test_command_needs_ids_file_or_all(self):
+        with self.assertRaises(CommandError):
+            call_command('transition_orders', OrderStatus.PROCESSING, stdout=io.StringIO())
+        self.assertEqual(self.pending(), 3)
+
+    def test_command_reports_invalid_ids_before_moving_any(self):
+        path = self.ids_file(str(self.orders[0].id), "not-an-id", "", str(self.orders[1].id)[:-1])
+
+        with self.assertRaises(CommandError) as raised:
+            call_command('transition_orders', OrderStatus.PROCESSING, ids_file=path, stdout=io.StringIO())
+
+        self.assertIn("line 2: 'not-an-id'", str(raised.exception))
+        self.assertIn("line 4:", str(raised.exception))
+        self.assertEqual(self.pending(), 3)
+
+    def test_command_moves_the_listed_ids(self):
+        path = self.ids_file(*(str(order.id) for order in self.orders[:2]))
+        call_command('transition_orders', OrderStatus.PROCESSING, ids_file=path, stdout=io.StringIO())
+        self.assertEqual(self.pending(), 1)
+
+
+class OrderExportCacheTests(TestCase):
+
+    def setUp(self):
+        data = SyntheticData(seed=12)
+        cart = data.create_carts(data.create_users(1), data.create_catalog(1, 2, stock=100), 2)[0]
+        self.order = OrderService.create_order_from_cart(cart.id, "1 Test Street")
+        caches[settings.ORDER_EXPORT_CACHE].clear()
+
+    def move_to(self, *statuses):
+        for order_status in statuses:
+            OrderStatusService.bulk_transition(order_status, order_ids=[self.order.id])
+        self.captureOnCommitCallbacks(execute=True)
+
+    def test_delivered_order_is_not_cached(self):
+        self.move_to(OrderStatus.PROCESSING, OrderStatus.SHIPPED, OrderStatus.DELIVERED)
+        OrderExportService.get_order(self.order.id)
+        # Bypasses invalidation: only an uncached read sees it
+        Order.objects.filter(id=self.order.id).update(order_status=OrderStatus.RETURNED)
+
+        self.assertEqual(OrderExportService.get_order(self.order.id)['order_status'], OrderStatus.RETURNED)
+
+    def test_cancelled_order_is_served_from_the_cache(self):
+        self.move_to(OrderStatus.CANCELLED)
+        rendered = OrderExportService.get_order(self.order.id)
+        rendered['items'].clear()
+
+        cached = assert_query_budget(0, OrderExportService.get_order, self.order.id)
+        self.assertEqual(cached['order_status'], OrderStatus.CANCELLED)
+        self.assertEqual(len(cached['items']), 2)
+
+
+class IdempotencyKeyPurgeTests(TestCase):
+
+    def test_purge_expired_deletes_only_old_keys_in_batches(self):
+        IdempotencyKey.objects.bulk_create([IdempotencyKey(key=f"key-{index}", request_hash="h") for index in range(7)])
+        IdempotencyKey.objects.filter(key__in=["key-0", "key-1"]).update(created_at=timezone.now())
+        IdempotencyKey.objects.exclude(key__in=["key-0", "key-1"]).update(
+            created_at=timezone.now() - settings.IDEMPOTENCY_KEY_TTL * 2
+        )
+
+        # 5 expired keys in batches of 2: three DELETEs, each after its id lookup, and a final empty lookup
+        purged = assert_query_budget(7, IdempotencyService.purge_expired, batch_size=2)
+
+        self.assertEqual(purged, 5)
+        self.assertEqual(sorted(IdempotencyKey.objects.values_list('key', flat=True)), ["key-0", "key-1"])
+
+
+class PlaceOrderTests(TestCase):
+
+    def setUp(self):
+        data = SyntheticData(seed=2)
+        self.products = data.create_catalog(1, 2, stock=100)
+        self.user = data.create_users(1)[0]
+        self.client = Client()
+
+    def checkout(self, product: Product):
+        CartServices.add_items_to_cart(AddToCartRequestType(
+            user_id=self.user.id, products=[CartProductRequestType(product_id=product.id, quantity=2)]
+        ))
+        return self.client.post(
+            '/order/place_order/', json.dumps({"user_id": str(self.user.id), "shipping_address": "1 Test Street"}),
+            content_type='application/json'
+        )
+
+    def test_same_user_places_two_orders(self):
+        first = self.checkout(self.products[0])
+        second = self.checkout(self.products[1])
+
+        self.assertEqual(first.status_code, 201, first.content)
+        self.assertEqual(second.status_code, 201, second.content)
+        orders = Order.objects.filter(customer_id=self.user.id)
+        self.assertEqual(orders.count(), 2)
+        # Both orders come from the user's one cart, each with only the lines it sold
+        self.assertEqual(len({order.cart_id for order in orders}), 1)
+        self.assertEqual(
+            sorted(order.order_items.get().product_id for order in orders),
+            sorted(product.id for product in self.products)
+        )
+        self.assertFalse(CartItem.objects.filter(cart_id=orders[0].cart_id).exists())
+
+
+class PlaceOrderQueryCountTests(TestCase):
+    """Placing an order costs the same number of statements whatever the size of the cart"""
+
+    def setUp(self):
+        self.data = SyntheticData(seed=3)
+        self.products = self.data.create_catalog(2, 200, stock=100)
+        # Start from a full block of order numbers, so the nextval refilling it is not counted
+        order_number_allocator._block.clear()
+        order_number_allocator.next_number()
+
+    def cart(self, lines: int) -> Cart:
+        return self.data.create_carts(self.data.create_users(1), self.products, lines)[0]
+
+    def assert_create_from_cart_queries(self, lines: int):
+        cart = Cart.objects.prefetch_related(
+            Prefetch('items', queryset=CartItem.objects.select_related('product'))
+        ).get(id=self.cart(lines).id)
+        order = Order(customer_id=cart.user_id)
+        # The order INSERT and one bulk INSERT of its items
+        assert_query_budget(2, order.create_from_cart, cart)
+        self.assertEqual(order.order_items.count(), lines)
+
+    def assert_create_order_from_cart_queries(self, lines: int):
+        cart = self.cart(lines)
+        # Cart, locked lines, order, items, order.placed event, reservation consumed, lines
+        # deleted, and the SAVEPOINT / RELEASE its atomic() issues inside the test's transaction
+        with query_budget(9, label=f"create_order_from_cart ({lines} lines)"):
+            order = OrderService.create_order_from_cart(cart.id, "1 Test Street")
+        self.assertEqual(order.order_items.count(), lines)
+
+    def test_create_from_cart_one_line(self):
+        self.assert_create_from_cart_queries(1)
+
+    def test_create_from_cart_200_lines(self):
+        self.assert_create_from_cart_queries(200)
+
+    def test_create_order_from_cart_one_line(self):
+        self.assert_create_order_from_cart_queries(1)
+
+    def test_create_order_from_cart_200_lines(self):
+        self.assert_create_order_from_cart_queries(200)
+
+
+# Connections a forked child inherited from the test process: kept referenced, never closed
+_inherited_connections = []
+
+
+def allocate_in_forked_child(allocator: OrderNumberAllocator, count: int, results):
+    # Closing the parent's socket would end the parent's session, so it is only set aside
+    _inherited_connections.append(connection.connection)
+    connection.connection = None
+    results.send([allocator.next_number() for _ in range(count)])
+
+
+@override_settings(ORDER_NUMBER_BLOCK_SIZE=5)
+class OrderNumberAllocationTests(TransactionTestCase):
+    """Concurrent allocators never hand out the same order number; small blocks force many refills"""
+
+    def test_threads_saving_orders_get_unique_numbers(self):
+        customer = SyntheticData(seed=4).create_users(1)[0]
+        # 4000 orders, so every thread refills its blocks while the others do
+        threads, orders_per_thread = 16, 250
+        barrier = threading.Barrier(threads)
+        numbers, errors = [], []
+
+        def place_orders():
+            try:
+                barrier.wait()
+                for _ in range(orders_per_thread):
+                    numbers.append(Order.objects.create(customer=customer).order_number)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=place_orders) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(numbers), threads * orders_per_thread)
+        self.assertEqual(len(set(numbers)), len(numbers))
+        self.assertEqual(Order.objects.values('order_number').distinct().count(), len(numbers))
+
+    @skipUnless(hasattr(os, 'fork'), "needs os.fork")
+    def test_forked_child_does_not_reuse_the_parents_block(self):
+        allocator = OrderNumberAllocator()
+        # The parent holds the rest of a block when it forks
+        parent_numbers = [allocator.next_number()]
+        context = multiprocessing.get_context('fork')
+        reader, writer = context.Pipe(duplex=False)
+        child = context.Process(target=allocate_in_forked_child, args=(allocator, 10, writer))
+        child.start()
+        writer.close()
+        try:
+            parent_numbers += [allocator.next_number() for _ in range(10)]
+            self.assertTrue(reader.poll(30), "the forked child sent no order numbers")
+            child_numbers = reader.recv()
+        finally:
+            child.join(30)
+            if child.is_alive():
+                child.kill()
+                child.join()
+        self.assertEqual(child.exitcode, 0)
+
+        self.assertEqual(len(child_numbers), 10)
+        self.assertEqual(set(parent_numbers) & set(child_numbers), set())
+        self.assertEqual(len(set(parent_numbers)), len(parent_numbers))
+
+
+class OrderViewQueryBudgetTests(QueryBudgetTestCase):
+    seed = 10
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.data.create_users(1)[0]
+        self.data.create_carts([self.user], self.data.create_catalog(1, 5, stock=100), 5)
+
+    def place_order(self):
+        response = self.client.post(
+            '/order/place_order/', json.dumps({"user_id": str(self.user.id), "shipping_address": "1 Test Street"}),
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY="order-view-budget"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def test_place_order(self):
+        order = self.place_order()
+        self.assertEqual(len(order["items"]), 5)
+
+    def test_get_order(self):
+        order = self.place_order()
+        response = self.client.get('/order/get_order/', {"id": order["id"]})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_order_history(self):
+        self.place_order()
+        response = self.client.get('/order/order_history/', {"user_id": str(self.user.id), "include_items": "true"})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["data"]["orders"]), 1)
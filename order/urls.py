@@ -1,8 +1,14 @@
 from django.urls import path
 from order.view.get_order_by_id import GetOrderByIdView
+from order.view.order_history import OrderHistoryView
 from order.view.place_order import PlaceOrderView
+from order.view.sales_report import SalesReportView
+from order.view.transition_orders import TransitionOrdersView
 
 urlpatterns = [
     path('get_order/', GetOrderByIdView.as_view(), name='Get single order by id'),
+    path('order_history/', OrderHistoryView.as_view(), name='Order history'),
     path('place_order/', PlaceOrderView.as_view(), name='Place Order'),
+    path('sales_report/', SalesReportView.as_view(), name='Sales report'),
+    path('transition_orders/', TransitionOrdersView.as_view(), name='Transition orders'),
 ]
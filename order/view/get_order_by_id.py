@@ -1,20 +1,29 @@
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from auth_api.services.helpers import is_valid_uuid
 from order.services.order_service import OrderService
 
 
 class GetOrderByIdView(APIView):
+    renderer_classes = [JSONRenderer]
+
     def get(self, request):
         order_id = request.query_params.get('id')
         try:
             if order_id:
-                order = OrderService().get_order_by_id(order_id)
+                if not is_valid_uuid(order_id):
+                    return Response({"error": "Invalid order id"}, status=status.HTTP_400_BAD_REQUEST)
+                order = OrderService.get_order_by_id(order_id)
                 if not order:
                     return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
                 return Response(order)
 
-            orders = OrderService().get_all_orders()
-            return Response(orders)
+            # Listing every order of every customer does not scale; history is paginated per customer
+            return Response(
+                {"error": "id is required, use /order/order_history/?user_id=... to list orders"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
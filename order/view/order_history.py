@@ -0,0 +1,35 @@
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_api.services.handlers.exception_handlers import ExceptionHandler
+from auth_api.services.definitions import TRUTH_LIST
+from order.export_types.request_data_types.order_history import OrderHistoryRequestType
+from order.services.order_service import OrderService
+
+
+class OrderHistoryView(APIView):
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request: Request):
+        try:
+            params = request.query_params
+            request_data = OrderHistoryRequestType(
+                user_id=params.get("user_id"),
+                limit=params.get("limit") or 20,
+                cursor=params.get("cursor"),
+                include_items=params.get("include_items") in TRUTH_LIST,
+            )
+            result = OrderService.get_order_history(request_data)
+            return Response(
+                data={
+                    "message": "Order history fetched successfully.",
+                    "data": result.model_dump(),
+                },
+                status=status.HTTP_200_OK,
+                content_type="application/json",
+            )
+        except Exception as e:
+            return ExceptionHandler().handle_exception(e)
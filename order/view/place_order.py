@@ -1,31 +1,47 @@
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from order.services.idempotency_service import IdempotencyKeyMismatch, IdempotencyService
 from order.services.order_service import OrderService
 
 
 class PlaceOrderView(APIView):
     def post(self, request):
+        idempotency_key = request.headers.get('Idempotency-Key')
         try:
+            if idempotency_key:
+                # A retry is answered from the stored response before any cart or stock work
+                request_hash = IdempotencyService.request_hash(request.data)
+                record = IdempotencyService.get_completed(idempotency_key, request_hash)
+                if record is not None:
+                    return self.replay(record)
+
             from cart.models.cart import Cart
-            cart = Cart.objects.get(user=request.user)
-            shipping_address = request.data.get('shipping_address')
-            billing_address = request.data.get('billing_address')
-            order = OrderService.create_order_from_cart(
-                cart_id=cart.id,
-                shipping_address=shipping_address,
-                billing_address=billing_address
-            )
-            # Optionally, serialize the order for response
-            from order.models.order import Order
-            order_data = {
-                'id': str(order.id),
-                'order_number': order.order_number,
-                'total_amount': str(order.total_amount),
-                'order_status': order.order_status,
-                'payment_status': order.payment_status,
-                'order_date': order.order_date,
-            }
+            with transaction.atomic():
+                cart = Cart.objects.get(user_id=request.data.get('user_id'))
+                if idempotency_key:
+                    record, created = IdempotencyService.claim(idempotency_key, request_hash, cart.user_id)
+                    if not created:
+                        return self.replay(record)
+                shipping_address = request.data.get('shipping_address')
+                billing_address = request.data.get('billing_address')
+                order = OrderService.create_order_from_cart(
+                    cart_id=cart.id,
+                    shipping_address=shipping_address,
+                    billing_address=billing_address
+                )
+                order_data = OrderService.get_order_by_id(order.id)
+                if idempotency_key:
+                    IdempotencyService.complete(record, status.HTTP_201_CREATED, order_data)
             return Response(order_data, status=status.HTTP_201_CREATED)
+        except IdempotencyKeyMismatch as e:
+            return Response({"error": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @staticmethod
+    def replay(record):
+        response = Response(record.response_body, status=record.response_status)
+        response['Idempotent-Replayed'] = 'true'
+        return response
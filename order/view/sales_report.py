@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_api.auth_exceptions.user_exceptions import UserNotAuthenticatedError
+from auth_api.services.definitions import TRUTH_LIST
+from auth_api.services.handlers.exception_handlers import ExceptionHandler
+from order.export_types.request_data_types.sales_report import SalesReportRequestType
+from order.services.order_analytics_service import OrderAnalyticsService
+
+
+class SalesReportView(APIView):
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request: Request):
+        try:
+            # Sales figures are reserved to staff signed in to the admin
+            if not request.user.is_authenticated or not request.user.is_staff:
+                raise UserNotAuthenticatedError()
+            params = request.query_params
+            request_data = SalesReportRequestType(
+                start=params.get("start"),
+                end=params.get("end"),
+                granularity=params.get("granularity") or "day",
+                dimension=params.get("dimension") or "total",
+                status=params.getlist("status") or None,
+                dimension_ids=params.getlist("dimension_id") or None,
+                include_live=params.get("include_live") in TRUTH_LIST,
+            )
+            result = OrderAnalyticsService.sales_report(request_data)
+            return Response(
+                data={
+                    "message": "Sales report fetched successfully.",
+                    "data": result.model_dump(mode="json"),
+                },
+                status=status.HTTP_200_OK,
+                content_type="application/json",
+            )
+        except Exception as e:
+            return ExceptionHandler().handle_exception(e)
@@ -0,0 +1,37 @@
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_api.auth_exceptions.user_exceptions import UserNotAuthenticatedError
+from auth_api.services.handlers.exception_handlers import ExceptionHandler
+from order.export_types.request_data_types.order_transition import OrderTransitionRequestType
+from order.services.order_status_service import OrderStatusService
+
+
+class TransitionOrdersView(APIView):
+    renderer_classes = [JSONRenderer]
+
+    def post(self, request):
+        try:
+            # Warehouse operations are reserved to staff signed in to the admin
+            if not request.user.is_authenticated or not request.user.is_staff:
+                raise UserNotAuthenticatedError()
+            request_data = OrderTransitionRequestType(**request.data)
+            result = OrderStatusService.bulk_transition(
+                request_data.to_status,
+                order_ids=request_data.order_ids,
+                all_eligible=request_data.all,
+                from_statuses=request_data.from_status,
+                chunk_size=request_data.chunk_size,
+            )
+            return Response(
+                data={
+                    "message": f"{len(result.transitioned)} orders moved to {result.to_status}.",
+                    "data": result.model_dump(mode="json"),
+                },
+                status=status.HTTP_200_OK,
+                content_type="application/json",
+            )
+        except Exception as e:
+            return ExceptionHandler().handle_exception(e)
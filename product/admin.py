@@ -1,12 +1,23 @@
 from django.contrib import admin
 from product.models.product import Product
 from product.models.category import Category
+from product.models.product_stock_shard import ProductStockShard
+
+
+class ProductStockShardInline(admin.TabularInline):
+    model = ProductStockShard
+    extra = 0
+    readonly_fields = ("shard_index", "stock")
+    can_delete = False
+
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "price", "stock", "is_active")
+    list_display = ("id", "name", "price", "stock", "reserved_quantity", "stock_shard_count", "is_active")
     list_filter = ("is_active", "brand")
     search_fields = ("name", "brand")
+    readonly_fields = ("reserved_quantity", "stock_shard_count")
+    inlines = [ProductStockShardInline]
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
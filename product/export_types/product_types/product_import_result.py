@@ -0,0 +1,22 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ProductImportRowError(BaseModel):
+    row: int
+    sku: str | None = None
+    errors: List[str]
+
+
+class ProductImportResult(BaseModel):
+    """
+    Outcome of a product import. Only the first `max_errors` row errors are kept,
+    `failed` counts all of them.
+    """
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: List[ProductImportRowError] = []
+    duration_seconds: float | None = None
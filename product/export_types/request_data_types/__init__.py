@@ -0,0 +1,5 @@
+from .product_import_row import ProductImportRowType
+
+__all__ = [
+    'ProductImportRowType'
+]
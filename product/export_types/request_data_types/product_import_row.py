@@ -0,0 +1,50 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class ProductImportRowType(BaseModel):
+    """
+    One product of an import file. Rows are upserted by `sku`; a row without SKU always
+    creates a new product. `category` is a category name or slug. Unlike Product.save,
+    a stock of 0 is accepted (an out-of-stock catalog entry).
+    """
+    name: str = Field(..., min_length=1, max_length=255)
+    sku: Optional[str] = Field(None, max_length=32)
+    slug: Optional[str] = Field(None, max_length=50)
+    category: str = Field(..., min_length=1)
+    price: Decimal = Field(..., ge=0, max_digits=10, decimal_places=2)
+    stock: int = Field(0, ge=0)
+    description: str = ""
+    brand: Optional[str] = Field(None, max_length=100)
+    image: Optional[str] = Field(None, max_length=1024)
+    discount: Decimal = Field(Decimal(0), ge=0, le=100, max_digits=5, decimal_places=2)
+    is_active: bool = True
+
+    @field_validator("sku", "slug", "brand", "image", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        # CSV has no null: empty cells mean "not given"
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value.strip() if isinstance(value, str) else value
+
+    @field_validator("description", mode="before")
+    @classmethod
+    def none_to_blank(cls, value):
+        return value or ""
+
+    @field_validator("stock", "discount", mode="before")
+    @classmethod
+    def blank_to_zero(cls, value):
+        if isinstance(value, str) and not value.strip():
+            return 0
+        return value
+
+    @field_validator("is_active", mode="before")
+    @classmethod
+    def blank_to_active(cls, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return True
+        return value
@@ -0,0 +1,26 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class StockDrift(BaseModel):
+    """
+    A product whose maintained stock figures disagree with their source rows.
+    `reserved_quantity` is compared with the sum of its cart lines; for sharded products
+    `stock` is also compared with the sum of its stock shards.
+    """
+    product_id: UUID
+    product_name: Optional[str] = None
+    reserved_quantity: int
+    actual_reserved_quantity: int
+    stock: int
+    actual_stock: int
+
+    @property
+    def has_reserved_drift(self) -> bool:
+        return self.reserved_quantity != self.actual_reserved_quantity
+
+    @property
+    def has_stock_drift(self) -> bool:
+        return self.stock != self.actual_stock
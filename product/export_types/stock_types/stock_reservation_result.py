@@ -0,0 +1,18 @@
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class StockReservationResult(BaseModel):
+    """
+    Outcome of a bulk conditional stock adjustment.
+    `applied` maps product id -> stock left after the write, `failed` holds the
+    product ids whose line could not be applied (missing, inactive or short on stock).
+    """
+    applied: Dict[UUID, int] = {}
+    failed: List[UUID] = []
+
+    @property
+    def is_success(self) -> bool:
+        return not self.failed
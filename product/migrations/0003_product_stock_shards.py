@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:27
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0002_product_discount_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock_shard_count',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Number of stock counter shards (0 = single-row stock)'),
+        ),
+        migrations.CreateModel(
+            name='ProductStockShard',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('shard_index', models.PositiveSmallIntegerField()),
+                ('stock', models.PositiveIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_shards', to='product.product')),
+            ],
+            options={
+                'unique_together': {('product', 'shard_index')},
+            },
+        ),
+    ]
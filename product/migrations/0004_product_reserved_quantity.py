@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:31
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_reserved_quantity(apps, schema_editor):
+    # One set-based UPDATE from the cart lines currently holding stock
+    Product = apps.get_model('product', 'Product')
+    CartItem = apps.get_model('cart', 'CartItem')
+    reserved = (
+        CartItem.objects.filter(product_id=OuterRef('pk'))
+        .values('product_id')
+        .annotate(total=Sum('quantity'))
+        .values('total')
+    )
+    Product.objects.update(reserved_quantity=Coalesce(Subquery(reserved), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0003_product_stock_shards'),
+        # After the lines already sold by an order are gone
+        ('cart', '0004_release_ordered_cart_lines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='reserved_quantity',
+            field=models.PositiveIntegerField(default=0, help_text='Units currently held in carts'),
+        ),
+        migrations.RunPython(backfill_reserved_quantity, migrations.RunPython.noop),
+    ]
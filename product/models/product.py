@@ -1,11 +1,12 @@
 from django.db import models
-from django.utils.text import slugify
-import uuid
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 from auth_api.models.base_models.base_model import GenericBaseModel
 from product.models.category import Category
 
+IDENTIFIER_ATTEMPTS = 5
+
 
 class Product(GenericBaseModel):
     """
@@ -22,34 +23,43 @@ class Product(GenericBaseModel):
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0, help_text="Number of items in stock")
+    reserved_quantity = models.PositiveIntegerField(default=0, help_text="Units currently held in carts")
     image = models.URLField(max_length=1024, blank=True, null=True)
     category = models.ForeignKey(Category, related_name='products', on_delete=models.CASCADE)
     brand = models.CharField(max_length=100, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     discount = models.DecimalField(max_digits=5, decimal_places=2, default=0, help_text="Discount percentage (e.g., 10 for 10%)", blank=True, null=True)
+    stock_shard_count = models.PositiveSmallIntegerField(default=0, help_text="Number of stock counter shards (0 = single-row stock)")
 
     @property
     def is_out_of_stock(self):
         return self.stock == 0
 
+    @property
+    def is_stock_sharded(self):
+        return self.stock_shard_count > 0
+
     def save(self, *args, **kwargs):
         if self.stock <= 0:
             raise ValidationError("Product stock must be greater than 0 to add the product.")
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Product.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        if not self.sku:
-            # Generate a unique SKU
-            sku = uuid.uuid4().hex[:12].upper()
-            while Product.objects.filter(sku=sku).exclude(pk=self.pk).exists():
-                sku = uuid.uuid4().hex[:12].upper()
-            self.sku = sku
-        super().save(*args, **kwargs)
+        from product.services.product_identifier_service import ProductIdentifierService
+
+        generate_slug = not self.slug
+        generate_sku = not self.sku
+        for attempt in range(IDENTIFIER_ATTEMPTS):
+            if generate_slug:
+                self.slug = ProductIdentifierService.next_free_slug(self.name, exclude_pk=self.pk)
+            if generate_sku:
+                self.sku = ProductIdentifierService.generate_sku()
+            try:
+                # Savepoint, so a lost race on slug / SKU does not break the caller's transaction
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                # Another writer took the generated slug or SKU in the meantime: pick new ones
+                if not (generate_slug or generate_sku) or attempt == IDENTIFIER_ATTEMPTS - 1:
+                    raise
 
     def __str__(self):
         return self.name
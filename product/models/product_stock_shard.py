@@ -0,0 +1,21 @@
+from django.db import models
+
+from auth_api.models.base_models.base_model import GenericBaseModel
+from product.models.product import Product
+
+
+class ProductStockShard(GenericBaseModel):
+    """
+    One of the N stock counter rows of a product running in sharded-inventory mode.
+    Reservations decrement a random shard instead of the single `Product.stock` row;
+    `Product.stock` is refreshed with the sum of the shards by the rebalancer.
+    """
+    product = models.ForeignKey(Product, related_name='stock_shards', on_delete=models.CASCADE)
+    shard_index = models.PositiveSmallIntegerField()
+    stock = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('product', 'shard_index')
+
+    def __str__(self):
+        return f"{self.product_id} shard {self.shard_index}: {self.stock}"
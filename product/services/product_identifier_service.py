@@ -0,0 +1,104 @@
+import re
+import secrets
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+from product.models.product import Product
+
+SKU_BYTES = 8
+SLUG_SUFFIX_ROOM = 8
+SLUG_PREFIX_QUERY_CHUNK = 500
+
+
+class ProductIdentifierService:
+
+    @staticmethod
+    def generate_sku() -> str:
+        """
+        Random 64-bit SKU (16 hex chars). Collisions are rare enough that nothing is looked
+        up beforehand: the unique constraint catches them and the caller retries.
+        """
+        return secrets.token_hex(SKU_BYTES).upper()
+
+    @staticmethod
+    def base_slug(name: str) -> str:
+        """
+        slugify(name), shortened so a `-<n>` suffix still fits in the slug column.
+        """
+        max_length = Product._meta.get_field('slug').max_length
+        base = slugify(name) or "product"
+        if len(base) > max_length - SLUG_SUFFIX_ROOM:
+            base = base[:max_length - SLUG_SUFFIX_ROOM].rstrip('-')
+        return base
+
+    @staticmethod
+    def next_free_slug(name: str, exclude_pk=None) -> str:
+        """
+        First free slug among `base`, `base-1`, `base-2`, ... with one prefix query that
+        fetches every existing slug the candidates could collide with. The prefix match
+        uses the slug index, the regex keeps `base-other-words` rows out of the result.
+        """
+        base = ProductIdentifierService.base_slug(name)
+        queryset = Product.objects.filter(slug__startswith=base, slug__regex=_collision_pattern([base]))
+        if exclude_pk is not None:
+            queryset = queryset.exclude(pk=exclude_pk)
+        taken = set(queryset.values_list('slug', flat=True))
+        return ProductIdentifierService._pick_slug(base, taken)
+
+    @staticmethod
+    def unique_slugs(names: Iterable[str], existing: Optional[Set[str]] = None) -> List[str]:
+        """
+        Bulk variant for imports: one free slug per name, distinct from each other and from
+        the table, with one prefix query per SLUG_PREFIX_QUERY_CHUNK distinct bases.
+        `existing` may carry slugs already known to be taken, e.g. from a previous batch.
+        """
+        bases = [ProductIdentifierService.base_slug(name) for name in names]
+        taken = set(existing or ())
+        distinct = sorted(set(bases))
+        for start in range(0, len(distinct), SLUG_PREFIX_QUERY_CHUNK):
+            chunk = distinct[start:start + SLUG_PREFIX_QUERY_CHUNK]
+            condition = reduce(or_, (Q(slug__startswith=base) for base in chunk))
+            taken.update(Product.objects.filter(condition).values_list('slug', flat=True))
+
+        next_suffix: Dict[str, int] = {}
+        slugs = []
+        for base in bases:
+            slug = ProductIdentifierService._pick_slug(base, taken, next_suffix.get(base, 0))
+            suffix = re.fullmatch(rf"{re.escape(base)}-(\d+)", slug)
+            next_suffix[base] = int(suffix.group(1)) + 1 if suffix else 1
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    @staticmethod
+    def assign_identifiers(products: List[Product]) -> List[Product]:
+        """
+        Fill in missing slugs and SKUs of unsaved products in bulk, before bulk_create.
+        """
+        missing_slug = [product for product in products if not product.slug]
+        provided = {product.slug for product in products if product.slug}
+        for product, slug in zip(
+            missing_slug, ProductIdentifierService.unique_slugs([product.name for product in missing_slug], provided)
+        ):
+            product.slug = slug
+        for product in products:
+            if not product.sku:
+                product.sku = ProductIdentifierService.generate_sku()
+        return products
+
+    @staticmethod
+    def _pick_slug(base: str, taken: Set[str], start: int = 0) -> str:
+        if start == 0 and base not in taken:
+            return base
+        counter = max(start, 1)
+        while f"{base}-{counter}" in taken:
+            counter += 1
+        return f"{base}-{counter}"
+
+
+def _collision_pattern(bases: List[str]) -> str:
+    return rf"^({'|'.join(re.escape(base) for base in bases)})(-[0-9]+)?$"
@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+from pydantic import ValidationError
+
+from product.export_types.product_types.product_import_result import ProductImportResult, ProductImportRowError
+from product.export_types.request_data_types.product_import_row import ProductImportRowType
+from product.models.category import Category
+from product.models.product import Product
+from product.services.product_identifier_service import ProductIdentifierService
+
+IMPORT_FORMATS = ("csv", "ndjson")
+# Columns overwritten when the SKU already exists; slug, reserved_quantity and sharding are kept.
+# Stock is set afterwards from the imported on-hand count, less the units held in carts.
+UPSERT_FIELDS = [
+    "name", "description", "price", "category", "brand", "image", "discount", "is_active", "updated_at"
+]
+
+
+class ProductImportService:
+
+    @staticmethod
+    def detect_format(filename: str) -> str:
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        if extension in ("ndjson", "jsonl"):
+            return "ndjson"
+        if extension == "csv":
+            return "csv"
+        raise ValueError(f"Cannot tell the format of '{filename}', expected .csv, .ndjson or .jsonl")
+
+    @staticmethod
+    def iter_rows(binary_stream, file_format: str) -> Iterator[Tuple[int, object]]:
+        """
+        Stream (row number, raw row) pairs from a binary file without reading it whole.
+        A line that cannot be parsed is yielded as a ValueError, to be reported for that row.
+        """
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unknown import format '{file_format}', expected one of {', '.join(IMPORT_FORMATS)}")
+        stream = io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, ValueError(f"Invalid JSON: {e.msg}")
+
+    @staticmethod
+    def import_rows(
+        rows: Iterable[Tuple[int, object]],
+        batch_size: int = 1000,
+        create_categories: bool = False,
+        max_errors: int = 100,
+        on_batch: Optional[Callable[[ProductImportResult], None]] = None,
+    ) -> ProductImportResult:
+        """
+        Validate and upsert products by SKU, `batch_size` rows at a time: one category
+        lookup, one existing-SKU lookup and one INSERT ... ON CONFLICT (sku) DO UPDATE per
+        batch, each batch in its own transaction. Only one batch is held in memory.
+        The imported stock is the on-hand count: an existing product keeps its cart
+        reservations and is left with that count less its reserved quantity on sale.
+        """
+        started = time.monotonic()
+        result = ProductImportResult()
+        category_ids: Dict[str, object] = {}
+        rows = iter(rows)
+
+        def fail(row: int, errors: List[str], sku: str = None):
+            result.failed += 1
+            if len(result.errors) < max_errors:
+                result.errors.append(ProductImportRowError(row=row, sku=sku, errors=errors))
+
+        while batch := list(islice(rows, batch_size)):
+            result.batches += 1
+            result.rows += len(batch)
+            valid = []
+            for number, data in batch:
+                if isinstance(data, Exception):
+                    fail(number, [str(data)])
+                    continue
+                if not isinstance(data, dict):
+                    fail(number, ["Expected an object with the product fields"])
+                    continue
+                try:
+                    valid.append((number, ProductImportRowType(**data)))
+                except ValidationError as e:
+                    fail(number, [
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                    ], sku=data.get("sku") or None)
+            result.imported += ProductImportService._import_batch(valid, category_ids, create_categories, fail)
+            if on_batch:
+                on_batch(result)
+
+        result.duration_seconds = round(time.monotonic() - started, 3)
+        return result
+
+    @staticmethod
+    def _import_batch(
+        valid: List[Tuple[int, ProductImportRowType]], category_ids: Dict, create_categories: bool, fail
+    ) -> int:
+        if not valid:
+            return 0
+
+        # Categories, by name or slug: one lookup for the keys this batch adds to the cache
+        missing = {row.category for _, row in valid} - category_ids.keys()
+        if missing:
+            ProductImportService._resolve_categories(missing, category_ids, create_categories)
+
+        # The last row of a SKU wins, earlier ones are reported
+        last_row_of_sku = {row.sku: number for number, row in valid if row.sku}
+        rows = []
+        for number, row in valid:
+            if row.category not in category_ids:
+                fail(number, [f"category: '{row.category}' does not exist"], row.sku)
+            elif row.sku and last_row_of_sku[row.sku] != number:
+                fail(number, [f"sku: duplicate of row {last_row_of_sku[row.sku]}, which was imported instead"], row.sku)
+            else:
+                rows.append((number, row))
+
+        # Existing SKUs keep their slug; given slugs must not belong to another product
+        skus = [row.sku for _, row in rows if row.sku]
+        existing = {
+            sku: (slug, shard_count, reserved)
+            for sku, slug, shard_count, reserved in
+            Product.objects.filter(sku__in=skus).values_list('sku', 'slug', 'stock_shard_count', 'reserved_quantity')
+        }
+        given_slugs = [row.slug for _, row in rows if row.slug and row.sku not in existing]
+        slug_owners = dict(Product.objects.filter(slug__in=given_slugs).values_list('slug', 'sku'))
+
+        accepted = []
+        for number, row in rows:
+            if row.sku in existing and existing[row.sku][1]:
+                fail(number, ["stock: product uses sharded stock, disable sharding before importing it"], row.sku)
+            elif row.sku in existing and row.stock < existing[row.sku][2]:
+                reserved = existing[row.sku][2]
+                fail(number, [f"stock: {reserved} units are held in carts, more than the {row.stock} imported"], row.sku)
+            elif row.sku not in existing and row.slug and row.slug in slug_owners:
+                fail(number, [f"slug: '{row.slug}' is used by product {slug_owners[row.slug]}"], row.sku)
+            else:
+                accepted.append((number, row))
+                if row.sku not in existing and row.slug:
+                    slug_owners[row.slug] = row.sku or f"of row {number}"
+        if not accepted:
+            return 0
+
+        products = [
+            Product(
+                name=row.name,
+                sku=row.sku,
+                slug=existing[row.sku][0] if row.sku in existing else row.slug,
+                category_id=category_ids[row.category],
+                price=row.price,
+                stock=row.stock,
+                description=row.description,
+                brand=row.brand,
+                image=row.image,
+                discount=row.discount,
+                is_active=row.is_active,
+            )
+            for _, row in accepted
+        ]
+        ProductIdentifierService.assign_identifiers(products)
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(
+                    products, update_conflicts=True, unique_fields=["sku"], update_fields=UPSERT_FIELDS
+                )
+                ProductImportService._set_on_hand_stock(
+                    {row.sku: row.stock for _, row in accepted if row.sku in existing}
+                )
+        except IntegrityError as e:
+            # A concurrent writer took a slug this batch picked; the whole batch is reported, not half-applied
+            for number, row in accepted:
+                fail(number, [f"database: {e}".strip()], row.sku)
+            return 0
+        return len(products)
+
+    @staticmethod
+    def _set_on_hand_stock(on_hand: Dict[str, int]):
+        """
+        Set the stock of existing products to their imported on-hand count less the units
+        held in carts, in one UPDATE. The reserved quantity is read under the row lock of
+        that UPDATE, so a reservation made since the batch was validated is not lost.
+        """
+        if not on_hand:
+            return
+        table = connection.ops.quote_name(Product._meta.db_table)
+        values_sql = ", ".join(["(%s, %s::integer)"] * len(on_hand))
+        params = []
+        for sku, stock in on_hand.items():
+            params.extend([sku, stock])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS p SET stock = GREATEST(v.stock - p.reserved_quantity, 0) "
+                f"FROM (VALUES {values_sql}) AS v(sku, stock) "
+                f"WHERE p.sku = v.sku AND p.stock_shard_count = 0",
+                params
+            )
+
+    @staticmethod
+    def _resolve_categories(keys: set, category_ids: Dict, create_categories: bool):
+        def lookup(pending):
+            rows = Category.objects.filter(Q(name__in=pending) | Q(slug__in=pending)).values_list('id', 'name', 'slug')
+            for category_id, name, slug in rows:
+                for key in (name, slug):
+                    if key in pending:
+                        category_ids[key] = category_id
+
+        lookup(keys)
+        unknown = keys - category_ids.keys()
+        if unknown and create_categories:
+            Category.objects.bulk_create(
+                [Category(name=key, slug=slugify(key)) for key in unknown], ignore_conflicts=True
+            )
+            lookup(unknown)
@@ -27,7 +27,8 @@ class ProductService:
     @staticmethod
     def get_all_product_service() -> Optional[ExportProductList]:
         try:
-            subjects = Product.objects.all()
+            # model_to_dict reads the category too: join it rather than one query per product
+            subjects = Product.objects.select_related('category')
         except Exception:
             raise DatabaseError()
         if subjects:
@@ -44,7 +45,7 @@ class ProductService:
     @staticmethod
     def get_subject_service(product_id: str) -> Optional[ExportProduct]:
         try:
-            subject = Product.objects.get(id=product_id)
+            subject = Product.objects.select_related('category').get(id=product_id)
         except Exception:
             raise ValueError("This product is not listed.")
         if subject:
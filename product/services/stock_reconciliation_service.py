@@ -0,0 +1,96 @@
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from django.db import connection, transaction
+
+from product.export_types.stock_types.stock_drift import StockDrift
+from product.models.product import Product
+from product.models.product_stock_shard import ProductStockShard
+
+
+class StockReconciliationService:
+
+    @staticmethod
+    def count_products() -> int:
+        return Product.objects.count()
+
+    @staticmethod
+    def scan_stock_drift(chunk_size: int = 5000) -> Iterator[Tuple[int, List[StockDrift]]]:
+        """
+        Walk the catalog in primary-key order, `chunk_size` products at a time. For each chunk
+        one statement sums the cart lines (and stock shards) of those products with GROUP BY,
+        joins the sums back to the products and returns them; drifting products are kept.
+        Yields (products scanned in this chunk, drifts found in this chunk).
+        """
+        from cart.models.cart_item import CartItem
+
+        quote = connection.ops.quote_name
+        sql = (
+            f"WITH chunk AS ("
+            f"  SELECT id, name, stock, reserved_quantity, stock_shard_count FROM {quote(Product._meta.db_table)}"
+            f"  WHERE %s::uuid IS NULL OR id > %s::uuid ORDER BY id LIMIT %s"
+            f"), reserved AS ("
+            f"  SELECT ci.product_id, SUM(ci.quantity) AS total FROM {quote(CartItem._meta.db_table)} ci"
+            f"  JOIN chunk ON chunk.id = ci.product_id GROUP BY ci.product_id"
+            f"), shards AS ("
+            f"  SELECT s.product_id, SUM(s.stock) AS total FROM {quote(ProductStockShard._meta.db_table)} s"
+            f"  JOIN chunk ON chunk.id = s.product_id GROUP BY s.product_id"
+            f") "
+            f"SELECT chunk.id, chunk.name, chunk.reserved_quantity, COALESCE(reserved.total, 0), chunk.stock, "
+            f"CASE WHEN chunk.stock_shard_count > 0 THEN COALESCE(shards.total, 0) ELSE chunk.stock END "
+            f"FROM chunk LEFT JOIN reserved ON reserved.product_id = chunk.id "
+            f"LEFT JOIN shards ON shards.product_id = chunk.id ORDER BY chunk.id"
+        )
+        last_id: Optional[str] = None
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [last_id, last_id, chunk_size])
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            last_id = str(rows[-1][0])
+            drifts = [
+                StockDrift(
+                    product_id=UUID(str(product_id)),
+                    product_name=name,
+                    reserved_quantity=reserved_quantity,
+                    actual_reserved_quantity=actual_reserved,
+                    stock=stock,
+                    actual_stock=actual_stock,
+                )
+                for product_id, name, reserved_quantity, actual_reserved, stock, actual_stock in rows
+                if reserved_quantity != actual_reserved or stock != actual_stock
+            ]
+            yield len(rows), drifts
+            if len(rows) < chunk_size:
+                return
+
+    @staticmethod
+    def apply_fixes(drifts: List[StockDrift], batch_size: int = 1000) -> int:
+        """
+        Write the actual figures for drifting products with one UPDATE ... FROM (VALUES ...)
+        per batch, each batch in its own short transaction. A row is only written if it still
+        holds the values seen by the scan, so products changed by a cart meanwhile are left
+        for the next run instead of being overwritten. Returns the number of products fixed.
+        """
+        table = connection.ops.quote_name(Product._meta.db_table)
+        fixed = 0
+        for start in range(0, len(drifts), batch_size):
+            batch = drifts[start:start + batch_size]
+            values_sql = ", ".join(["(%s::uuid, %s::integer, %s::integer, %s::integer, %s::integer)"] * len(batch))
+            params = []
+            for drift in batch:
+                params.extend([
+                    str(drift.product_id), drift.reserved_quantity, drift.actual_reserved_quantity,
+                    drift.stock, drift.actual_stock,
+                ])
+            sql = (
+                f"UPDATE {table} AS p SET reserved_quantity = v.new_reserved, stock = v.new_stock "
+                f"FROM (VALUES {values_sql}) AS v(id, old_reserved, new_reserved, old_stock, new_stock) "
+                f"WHERE p.id = v.id AND p.reserved_quantity = v.old_reserved AND p.stock = v.old_stock"
+            )
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    fixed += cursor.rowcount
+        return fixed
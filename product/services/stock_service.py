@@ -0,0 +1,354 @@
+import random
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from product.export_types.stock_types.stock_reservation_result import StockReservationResult
+from product.models.product import Product
+from product.models.product_stock_shard import ProductStockShard
+from pure_authentication.outbox import publish_many
+
+
+class StockService:
+
+    @staticmethod
+    def apply_stock_deltas(deltas: Dict[UUID, int]) -> StockReservationResult:
+        """
+        Apply signed stock deltas for many products in a single conditional UPDATE.
+        A positive delta reserves stock and only succeeds when the product is active and
+        `stock >= delta`; a negative delta gives stock back and always succeeds. The same
+        statement moves the units into / out of `Product.reserved_quantity`.
+
+            UPDATE product SET stock = stock - v.qty, reserved_quantity = reserved_quantity + v.qty
+            FROM (VALUES (id, qty), ...) AS v(id, qty)
+            WHERE product.id = v.id AND (v.qty <= 0 OR (is_active AND stock >= v.qty))
+
+        No row is read or locked beforehand, so concurrent buyers of the same product only
+        contend for the duration of that one short write. Lines that could not be applied
+        are reported in `failed`; callers wanting all-or-nothing semantics should run this
+        inside `transaction.atomic()` and raise when the result is not successful.
+
+        Products in sharded-inventory mode are skipped by that statement and routed to
+        their stock shards instead; the lookup for them only happens when a line failed.
+        Their `reserved_quantity` is left alone (it would make the product row hot again)
+        and is recomputed by the rebalancer.
+
+        Every applied line is recorded as a `stock.changed` outbox event in the same
+        transaction.
+        """
+        deltas = {UUID(str(product_id)): int(quantity) for product_id, quantity in deltas.items() if quantity}
+        if not deltas:
+            return StockReservationResult()
+
+        # No savepoint inside the caller's transaction; a transaction of its own otherwise
+        with transaction.atomic(savepoint=False):
+            result = StockService._apply_stock_deltas(deltas)
+            if result.applied:
+                publish_many("stock.changed", "product", {
+                    product_id: {"delta": deltas[product_id]} for product_id in result.applied
+                })
+        return result
+
+    @staticmethod
+    def _apply_stock_deltas(deltas: Dict[UUID, int]) -> StockReservationResult:
+        table = connection.ops.quote_name(Product._meta.db_table)
+        values_sql = ", ".join(["(%s::uuid, %s::integer)"] * len(deltas))
+        params = []
+        for product_id, quantity in deltas.items():
+            params.extend([str(product_id), quantity])
+
+        sql = (
+            f"UPDATE {table} AS p SET stock = p.stock - v.qty, "
+            f"reserved_quantity = GREATEST(p.reserved_quantity + v.qty, 0) "
+            f"FROM (VALUES {values_sql}) AS v(id, qty) "
+            f"WHERE p.id = v.id AND p.stock_shard_count = 0 "
+            f"AND (v.qty <= 0 OR (p.is_active AND p.stock >= v.qty)) "
+            f"RETURNING p.id, p.stock"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            applied = {UUID(str(row[0])): row[1] for row in cursor.fetchall()}
+
+        failed = [product_id for product_id in deltas if product_id not in applied]
+        if failed:
+            # Stock can always be given back, even to a product that was deactivated meanwhile
+            sharded = {
+                product_id: shard_count
+                for product_id, shard_count, is_active in Product.objects.filter(
+                    id__in=failed, stock_shard_count__gt=0
+                ).values_list('id', 'stock_shard_count', 'is_active')
+                if is_active or deltas[product_id] < 0
+            }
+            if sharded:
+                applied.update(StockService._apply_sharded_stock_deltas(
+                    {product_id: deltas[product_id] for product_id in sharded}, sharded
+                ))
+                failed = [product_id for product_id in failed if product_id not in applied]
+        return StockReservationResult(applied=applied, failed=failed)
+
+    @staticmethod
+    def reserve_stock(quantities: Dict[UUID, int]) -> StockReservationResult:
+        """
+        Take `quantity` units out of stock for every product, without SELECT FOR UPDATE.
+        """
+        return StockService.apply_stock_deltas(
+            {product_id: quantity for product_id, quantity in quantities.items() if quantity > 0}
+        )
+
+    @staticmethod
+    def restore_stock(quantities: Dict[UUID, int]) -> StockReservationResult:
+        """
+        Give `quantity` units back to stock for every product in one statement.
+        """
+        return StockService.apply_stock_deltas(
+            {product_id: -quantity for product_id, quantity in quantities.items() if quantity > 0}
+        )
+
+    @staticmethod
+    def consume_reservations(quantities: Dict[UUID, int]) -> int:
+        """
+        Turn units held in carts into sold ones when the cart becomes an order: they leave
+        `reserved_quantity` and do not come back to stock. One statement for all products;
+        sharded products are skipped, the rebalancer recomputes their reserved quantity.
+        """
+        quantities = {UUID(str(product_id)): int(quantity) for product_id, quantity in quantities.items() if quantity > 0}
+        if not quantities:
+            return 0
+        table = connection.ops.quote_name(Product._meta.db_table)
+        values_sql = ", ".join(["(%s::uuid, %s::integer)"] * len(quantities))
+        params = []
+        for product_id, quantity in quantities.items():
+            params.extend([str(product_id), quantity])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS p SET reserved_quantity = GREATEST(p.reserved_quantity - v.qty, 0) "
+                f"FROM (VALUES {values_sql}) AS v(id, qty) "
+                f"WHERE p.id = v.id AND p.stock_shard_count = 0",
+                params
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def return_stock(quantities: Dict[UUID, int]) -> StockReservationResult:
+        """
+        Put sold units back on sale, e.g. for cancelled orders: `stock` grows and
+        `reserved_quantity` is left alone, unlike restore_stock which releases a cart hold.
+        One UPDATE for single-row products, the shard path for sharded ones.
+        """
+        quantities = {UUID(str(product_id)): int(quantity) for product_id, quantity in quantities.items() if quantity > 0}
+        if not quantities:
+            return StockReservationResult()
+        table = connection.ops.quote_name(Product._meta.db_table)
+        values_sql = ", ".join(["(%s::uuid, %s::integer)"] * len(quantities))
+        params = []
+        for product_id, quantity in quantities.items():
+            params.extend([str(product_id), quantity])
+
+        with transaction.atomic(savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} AS p SET stock = p.stock + v.qty "
+                    f"FROM (VALUES {values_sql}) AS v(id, qty) "
+                    f"WHERE p.id = v.id AND p.stock_shard_count = 0 "
+                    f"RETURNING p.id, p.stock",
+                    params
+                )
+                applied = {UUID(str(row[0])): row[1] for row in cursor.fetchall()}
+            remaining = {product_id: quantity for product_id, quantity in quantities.items() if product_id not in applied}
+            if remaining:
+                sharded = dict(
+                    Product.objects.filter(id__in=remaining, stock_shard_count__gt=0).values_list('id', 'stock_shard_count')
+                )
+                if sharded:
+                    applied.update(StockService._apply_sharded_stock_deltas(
+                        {product_id: -remaining[product_id] for product_id in sharded}, sharded
+                    ))
+            if applied:
+                publish_many("stock.changed", "product", {
+                    product_id: {"delta": -quantities[product_id]} for product_id in applied
+                })
+        return StockReservationResult(
+            applied=applied, failed=[product_id for product_id in quantities if product_id not in applied]
+        )
+
+    @staticmethod
+    def _apply_sharded_stock_deltas(deltas: Dict[UUID, int], shard_counts: Dict[UUID, int]) -> Dict[UUID, int]:
+        """
+        Apply deltas to sharded products. Every line starts on a random shard and falls
+        over to the next one when that shard is short; each round is one UPDATE for all
+        pending lines. Lines no single shard can serve are drained across shards under a
+        lock as a last resort. Returns product id -> remaining units on the touched shard.
+        """
+        table = connection.ops.quote_name(ProductStockShard._meta.db_table)
+        start = {product_id: random.randrange(shard_counts[product_id]) for product_id in deltas}
+        pending = dict(deltas)
+        applied = {}
+
+        for attempt in range(max(shard_counts.values())):
+            lines = [
+                (product_id, (start[product_id] + attempt) % shard_counts[product_id], quantity)
+                for product_id, quantity in pending.items()
+                if attempt < shard_counts[product_id]
+            ]
+            if not lines:
+                break
+            values_sql = ", ".join(["(%s::uuid, %s::integer, %s::integer)"] * len(lines))
+            params = []
+            for line in lines:
+                params.extend([str(line[0]), line[1], line[2]])
+            sql = (
+                f"UPDATE {table} AS s SET stock = s.stock - v.qty "
+                f"FROM (VALUES {values_sql}) AS v(product_id, shard_index, qty) "
+                f"WHERE s.product_id = v.product_id AND s.shard_index = v.shard_index "
+                f"AND (v.qty <= 0 OR s.stock >= v.qty) "
+                f"RETURNING s.product_id, s.stock"
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                for product_id, stock in cursor.fetchall():
+                    product_id = UUID(str(product_id))
+                    applied[product_id] = stock
+                    pending.pop(product_id, None)
+            if not pending:
+                break
+
+        for product_id, quantity in pending.items():
+            if StockService._drain_stock_shards(product_id, quantity):
+                applied[product_id] = 0
+        return applied
+
+    @staticmethod
+    def _drain_stock_shards(product_id: UUID, quantity: int) -> bool:
+        """
+        Take `quantity` units spread over several shards of one product, locking its shards.
+        """
+        with transaction.atomic():
+            shards = list(
+                ProductStockShard.objects.select_for_update().filter(product_id=product_id).order_by('shard_index')
+            )
+            if sum(shard.stock for shard in shards) < quantity:
+                return False
+            for shard in shards:
+                taken = min(shard.stock, quantity)
+                shard.stock -= taken
+                quantity -= taken
+            ProductStockShard.objects.bulk_update(shards, ['stock'])
+        return True
+
+    @staticmethod
+    def get_sharded_stock(product_ids: List[UUID]) -> Dict[UUID, int]:
+        """
+        Exact stock of sharded products, summed from their shards in one query.
+        """
+        rows = (
+            ProductStockShard.objects.filter(product_id__in=product_ids)
+            .values('product_id')
+            .annotate(total=Sum('stock'))
+        )
+        return {row['product_id']: row['total'] for row in rows}
+
+    @staticmethod
+    def get_reserved_quantities(product_ids: List[UUID]) -> Dict[UUID, int]:
+        """
+        Units held in carts per product, summed from the cart lines in one GROUP BY query.
+        """
+        from cart.models.cart_item import CartItem
+
+        rows = (
+            CartItem.objects.filter(product_id__in=product_ids)
+            .values('product_id')
+            .annotate(total=Sum('quantity'))
+        )
+        return {row['product_id']: row['total'] for row in rows}
+
+    @staticmethod
+    def get_current_stock(products: List[Product]) -> Dict[UUID, int]:
+        """
+        Current stock of already-loaded products. `Product.stock` is used as is, except for
+        sharded products whose row is only refreshed by the rebalancer: those are summed
+        from their shards, in one extra query issued only when such a product is present.
+        """
+        stock = {product.id: product.stock for product in products}
+        sharded_ids = [product.id for product in products if product.is_stock_sharded]
+        if sharded_ids:
+            stock.update(StockService.get_sharded_stock(sharded_ids))
+        return stock
+
+    @staticmethod
+    @transaction.atomic
+    def enable_stock_sharding(product_id: UUID, shard_count: int) -> Product:
+        """
+        Switch a product to sharded-inventory mode, spreading its current stock (or the
+        sum of its existing shards) evenly over `shard_count` counter rows.
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        product = Product.objects.select_for_update().get(id=product_id)
+        shards = list(ProductStockShard.objects.select_for_update().filter(product=product))
+        total = sum(shard.stock for shard in shards) if product.is_stock_sharded else product.stock
+        ProductStockShard.objects.filter(product=product).delete()
+        ProductStockShard.objects.bulk_create([
+            ProductStockShard(product=product, shard_index=index, stock=stock)
+            for index, stock in enumerate(StockService._split_evenly(total, shard_count))
+        ])
+        Product.objects.filter(id=product.id).update(stock=total, stock_shard_count=shard_count)
+        product.stock, product.stock_shard_count = total, shard_count
+        return product
+
+    @staticmethod
+    @transaction.atomic
+    def disable_stock_sharding(product_id: UUID) -> Product:
+        """
+        Fold the shards of a product back into the single `Product.stock` row.
+        """
+        product = Product.objects.select_for_update().get(id=product_id)
+        if product.is_stock_sharded:
+            total = sum(
+                ProductStockShard.objects.select_for_update().filter(product=product).values_list('stock', flat=True)
+            )
+            ProductStockShard.objects.filter(product=product).delete()
+            Product.objects.filter(id=product.id).update(stock=total, stock_shard_count=0)
+            product.stock, product.stock_shard_count = total, 0
+        return product
+
+    @staticmethod
+    def rebalance_stock_shards(product_ids: Optional[List[UUID]] = None) -> Dict[UUID, int]:
+        """
+        Consolidate sharded stock: redistribute each product's units evenly over its shards
+        and write the sum back to `Product.stock`, together with its reserved quantity. Each product is handled in its own short
+        transaction so reservations on other products are never blocked.
+        Returns product id -> total stock.
+        """
+        queryset = Product.objects.filter(stock_shard_count__gt=0)
+        if product_ids is not None:
+            queryset = queryset.filter(id__in=product_ids)
+
+        totals = {}
+        for product_id, shard_count in queryset.values_list('id', 'stock_shard_count').iterator():
+            with transaction.atomic():
+                shards = list(
+                    ProductStockShard.objects.select_for_update().filter(product_id=product_id).order_by('shard_index')
+                )
+                total = sum(shard.stock for shard in shards)
+                if len(shards) != shard_count:
+                    ProductStockShard.objects.filter(product_id=product_id).delete()
+                    ProductStockShard.objects.bulk_create([
+                        ProductStockShard(product_id=product_id, shard_index=index, stock=stock)
+                        for index, stock in enumerate(StockService._split_evenly(total, shard_count))
+                    ])
+                else:
+                    for shard, stock in zip(shards, StockService._split_evenly(total, shard_count)):
+                        shard.stock = stock
+                    ProductStockShard.objects.bulk_update(shards, ['stock'])
+                Product.objects.filter(id=product_id).update(
+                    stock=total, reserved_quantity=StockService.get_reserved_quantities([product_id]).get(product_id, 0)
+                )
+            totals[product_id] = total
+        return totals
+
+    @staticmethod
+    def _split_evenly(total: int, parts: int) -> List[int]:
+        base, remainder = divmod(total, parts)
+        return [base + 1 if index < remainder else base for index in range(parts)]
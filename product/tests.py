@@ -1,3 +1,62 @@
+import json
+
 from django.test import TestCase
 
-# Create your tests here.
+from product.models.product import Product
+from product.services.product_import_service import ProductImportService
+from pure_authentication.benchmarks.data import SyntheticData
+from pure_authentication.testing import QueryBudgetTestCase
+
+
+class ProductReimportStockTests(TestCase):
+    """Re-importing a product sets its on-hand stock; units held in carts stay held"""
+
+    def setUp(self):
+        data = SyntheticData(seed=14)
+        self.product = data.create_catalog(1, 1, stock=100)[0]
+        data.create_carts(data.create_users(1), [self.product], 1)
+        self.product.refresh_from_db()
+
+    def reimport(self, stock: int):
+        return ProductImportService.import_rows([(2, {
+            "sku": self.product.sku, "name": "Renamed", "category": self.product.category.name,
+            "price": "10.00", "stock": stock,
+        })])
+
+    def test_reimport_keeps_cart_reservations(self):
+        reserved = self.product.reserved_quantity
+        self.assertGreater(reserved, 0)
+
+        result = self.reimport(50)
+
+        self.assertEqual(result.imported, 1, result.errors)
+        product = Product.objects.get(id=self.product.id)
+        self.assertEqual(product.name, "Renamed")
+        self.assertEqual(product.reserved_quantity, reserved)
+        self.assertEqual(product.stock, 50 - reserved)
+
+    def test_reimport_below_the_reserved_units_is_refused(self):
+        result = self.reimport(self.product.reserved_quantity - 1)
+
+        self.assertEqual(result.imported, 0)
+        self.assertEqual(result.errors[0].sku, self.product.sku)
+        self.assertEqual(Product.objects.get(id=self.product.id).stock, self.product.stock)
+
+
+class ProductViewQueryBudgetTests(QueryBudgetTestCase):
+    seed = 7
+
+    def setUp(self):
+        super().setUp()
+        self.products = self.data.create_catalog(3, 30)
+
+    def test_all_products(self):
+        response = self.client.get("/product/all_product")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["data"]["product_list"]), 30)
+
+    def test_get_product(self):
+        response = self.client.post(
+            "/product/get_product", json.dumps({"product_id": str(self.products[0].id)}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
@@ -0,0 +1,40 @@
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_api.auth_exceptions.user_exceptions import UserNotAuthenticatedError
+from auth_api.services.definitions import TRUTH_LIST
+from auth_api.services.handlers.exception_handlers import ExceptionHandler
+from product.services.product_import_service import ProductImportService
+
+
+class ImportProductsView(APIView):
+    renderer_classes = [JSONRenderer]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        try:
+            # Catalog writes are reserved to staff signed in to the admin
+            if not request.user.is_authenticated or not request.user.is_staff:
+                raise UserNotAuthenticatedError()
+            upload = request.FILES.get("file")
+            if not upload:
+                raise ValueError("file is required.")
+            file_format = request.data.get("format") or ProductImportService.detect_format(upload.name)
+            result = ProductImportService.import_rows(
+                ProductImportService.iter_rows(upload.file, file_format),
+                batch_size=int(request.data.get("batch_size") or 1000),
+                create_categories=request.data.get("create_categories") in TRUTH_LIST,
+            )
+            return Response(
+                data={
+                    "message": f"{result.imported} of {result.rows} products imported.",
+                    "data": result.model_dump(),
+                },
+                status=status.HTTP_200_OK,
+                content_type="application/json",
+            )
+        except Exception as e:
+            return ExceptionHandler().handle_exception(e)
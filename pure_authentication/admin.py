@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from pure_authentication.models.outbox_event import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'aggregate_type', 'aggregate_id', 'attempts', 'created_at', 'processed_at')
+    list_filter = ('event_type', 'aggregate_type')
+    search_fields = ('aggregate_id',)
+    readonly_fields = (
+        'event_type', 'aggregate_type', 'aggregate_id', 'payload', 'available_at', 'attempts', 'last_error',
+        'created_at', 'processed_at',
+    )
@@ -0,0 +1,175 @@
+import csv
+import hashlib
+import io
+import random
+import uuid
+from decimal import Decimal
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from django.db import connections, router, transaction
+
+from auth_api.models.user_models.user import User
+from auth_api.services.encryption_services.encryption_service import EncryptionServices
+from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from product.models.category import Category
+from product.models.product import Product
+from product.services.stock_service import StockService
+
+BENCHMARK_PASSWORD = "Benchmark@123"
+
+
+class SyntheticData:
+    """
+    Seeded generators for benchmark and fixture data. Every row gets a precomputed id,
+    slug and SKU derived from (seed, prefix, index), so nothing has to be looked up and
+    no per-row save() hook runs; the password is encrypted once and shared by every
+    generated user. Two runs with the same seed and prefix produce the same rows.
+    """
+
+    def __init__(self, seed: int = 0, prefix: str = None):
+        self.seed = seed
+        self.random = random.Random(seed)
+        # Unique per run so generated rows never collide with existing ones
+        self.prefix = prefix or f"bm{uuid.uuid4().hex[:6]}"
+        self._created = {}
+        self._password = None
+
+    def _next_range(self, kind: str, count: int) -> range:
+        """Indexes continue across calls, so repeated calls never reuse a unique value"""
+        start = self._created.get(kind, 0)
+        self._created[kind] = start + count
+        return range(start, start + count)
+
+    def row_id(self, kind: str, index: int) -> uuid.UUID:
+        """Deterministic id of the `index`-th generated row of a kind, computable without loading it"""
+        digest = hashlib.md5(f"{self.seed}:{self.prefix}:{kind}:{index}".encode()).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+    @property
+    def password(self):
+        if self._password is None:
+            self._password = EncryptionServices().encrypt(BENCHMARK_PASSWORD)
+        return self._password
+
+    def users(self, count: int) -> Iterator[User]:
+        for index in self._next_range("user", count):
+            yield User(
+                id=self.row_id("user", index),
+                username=f"{self.prefix}_{index}"[:25],
+                email=f"{self.prefix}_{index}@example.com",
+                name=f"Benchmark User {index}",
+                password=self.password,
+            )
+
+    def categories(self, count: int) -> Iterator[Category]:
+        for index in self._next_range("category", count):
+            yield Category(
+                id=self.row_id("category", index),
+                name=f"{self.prefix} category {index}",
+                slug=f"{self.prefix}-category-{index}",
+            )
+
+    def products(self, count: int, category_ids: List[uuid.UUID], stock: int = 1_000_000) -> Iterator[Product]:
+        for index in self._next_range("product", count):
+            yield Product(
+                id=self.row_id("product", index),
+                name=f"{self.prefix} product {index}",
+                slug=f"{self.prefix}-product-{index}",
+                sku=f"{self.prefix}{index:010d}".upper()[:32],
+                description="Synthetic benchmark product",
+                price=Decimal(self.random.randrange(100, 100_000)) / 100,
+                discount=Decimal(self.random.choice((0, 0, 0, 5, 10, 25))),
+                stock=stock,
+                category_id=category_ids[index % len(category_ids)],
+            )
+
+    def cart_items(self, cart_ids: Iterable[uuid.UUID], product_ids, lines: int, reserved: Dict) -> Iterator[CartItem]:
+        """
+        `lines` distinct random products per cart. `product_ids` only needs len() and
+        indexing (a range-backed sequence works), and the quantities are added to `reserved`.
+        """
+        reserved_until = CartItem.reservation_deadline()
+        for cart_id in cart_ids:
+            for position in self.random.sample(range(len(product_ids)), min(lines, len(product_ids))):
+                product_id = product_ids[position]
+                quantity = self.random.randint(1, 3)
+                reserved[product_id] = reserved.get(product_id, 0) + quantity
+                yield CartItem(cart_id=cart_id, product_id=product_id, quantity=quantity, reserved_until=reserved_until)
+
+    def create_users(self, count: int) -> List[User]:
+        return User.objects.bulk_create(list(self.users(count)))
+
+    def create_catalog(self, categories: int, products: int, stock: int = 1_000_000) -> List[Product]:
+        category_ids = [category.id for category in Category.objects.bulk_create(list(self.categories(categories)))]
+        return Product.objects.bulk_create(list(self.products(products, category_ids, stock)))
+
+    def create_carts(self, users: List[User], products: List[Product], lines: int) -> List[Cart]:
+        """
+        One cart per user holding `lines` random products; their stock is reserved in one statement.
+        """
+        carts = Cart.objects.bulk_create([Cart(user=user) for user in users])
+        reserved = {}
+        CartItem.objects.bulk_create(
+            list(self.cart_items([cart.id for cart in carts], [product.id for product in products], lines, reserved)),
+            batch_size=5000,
+        )
+        StockService.reserve_stock(reserved)
+        return carts
+
+
+class BulkLoader:
+    """
+    Write generated model instances in chunks, each chunk in its own transaction, with
+    either COPY ... FROM STDIN ("copy") or multi-row INSERTs ("bulk"). Values go through
+    the fields' own pre_save / get_db_prep_save, like Model.save() would, but without
+    the model's save() override.
+    """
+
+    def __init__(self, method: str = "copy", chunk_size: int = 50_000, on_chunk: Callable[[str, int], None] = None):
+        self.method = method
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+
+    def load(self, model, instances: Iterable) -> int:
+        instances = iter(instances)
+        loaded = 0
+        while chunk := list(islice(instances, self.chunk_size)):
+            with transaction.atomic():
+                if self.method == "copy":
+                    self._copy(model, chunk)
+                else:
+                    model.objects.bulk_create(chunk, batch_size=5000)
+            loaded += len(chunk)
+            if self.on_chunk:
+                self.on_chunk(model._meta.verbose_name_plural, loaded)
+        return loaded
+
+    @staticmethod
+    def _copy(model, instances: List):
+        fields = model._meta.concrete_fields
+        # The wrapper itself, not the thread-local `connection` proxy: it is read for every value
+        connection = connections[router.db_for_write(model)]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for instance in instances:
+            writer.writerow([
+                _csv_value(field.get_db_prep_save(field.pre_save(instance, True), connection)) for field in fields
+            ])
+        buffer.seek(0)
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _csv_value(value):
+    # Unquoted empty fields are NULL in COPY's csv format; generated rows never hold empty strings
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
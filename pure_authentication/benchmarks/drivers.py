@@ -0,0 +1,101 @@
+import http.client
+import json
+import threading
+import time
+from socketserver import ThreadingMixIn
+from urllib.parse import urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+
+
+class DriverResponse:
+    def __init__(self, status: int, elapsed: float, query_count: int = None):
+        self.status = status
+        self.elapsed = elapsed
+        self.query_count = query_count
+
+
+class TestClientDriver:
+    """
+    In-process driver on Django's test client: no sockets, measures the framework and
+    the database only. Not thread-safe, so it always runs with concurrency 1.
+    """
+    name = "client"
+    thread_safe = False
+
+    def __init__(self):
+        self.client = Client(HTTP_HOST="localhost")
+
+    def request(self, method: str, path: str, data: dict = None, query: dict = None) -> DriverResponse:
+        started = time.perf_counter()
+        if method == "GET":
+            response = self.client.get(path, query or {})
+        else:
+            response = self.client.generic(method, path, json.dumps(data or {}), content_type="application/json")
+        elapsed = time.perf_counter() - started
+        return DriverResponse(response.status_code, elapsed, _query_count(response.get("X-Query-Count")))
+
+    def close(self):
+        pass
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class WSGIDriver:
+    """
+    Serves the project's WSGI application on a local port from a background thread
+    and drives it over real HTTP connections, one keep-alive connection per thread.
+    """
+    name = "wsgi"
+    thread_safe = True
+
+    def __init__(self):
+        self.server = make_server(
+            "127.0.0.1", 0, get_wsgi_application(), server_class=_ThreadingWSGIServer, handler_class=_QuietHandler
+        )
+        self.port = self.server.server_port
+        self._thread = threading.Thread(target=self.server.serve_forever, name="benchmark-wsgi", daemon=True)
+        self._thread.start()
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        return connection
+
+    def request(self, method: str, path: str, data: dict = None, query: dict = None) -> DriverResponse:
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        body = json.dumps(data) if data is not None else None
+        headers = {"Content-Type": "application/json", "Host": "localhost"}
+        connection = self._connection()
+        started = time.perf_counter()
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - started
+        if response.getheader("Connection", "").lower() == "close" or response.will_close:
+            connection.close()
+            self._local.connection = None
+        return DriverResponse(response.status, elapsed, _query_count(response.getheader("X-Query-Count")))
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _query_count(value):
+    return int(value) if value is not None else None
+
+
+DRIVERS = {driver.name: driver for driver in (TestClientDriver, WSGIDriver)}
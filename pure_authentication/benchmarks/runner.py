@@ -0,0 +1,90 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ScenarioResult(BaseModel):
+    scenario: str
+    driver: str
+    requests: int
+    concurrency: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: Optional[float] = None
+    max_queries: Optional[int] = None
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def run_scenario(scenario, driver, iterations: int, warmup: int = 5, concurrency: int = 1) -> ScenarioResult:
+    """
+    Run `warmup` untimed requests, then `iterations` timed ones spread over `concurrency`
+    threads. Query counts come from the X-Query-Count header of the query-budget middleware.
+    """
+    for iteration in range(warmup):
+        scenario.run(driver, iteration)
+
+    indexes = range(warmup, warmup + iterations)
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(lambda iteration: scenario.run(driver, iteration), indexes))
+    else:
+        responses = [scenario.run(driver, iteration) for iteration in indexes]
+    duration = time.perf_counter() - started
+
+    latencies = sorted(response.elapsed * 1000 for response in responses)
+    query_counts = [response.query_count for response in responses if response.query_count is not None]
+    return ScenarioResult(
+        scenario=scenario.name,
+        driver=driver.name,
+        requests=iterations,
+        concurrency=concurrency,
+        errors=sum(1 for response in responses if response.status >= 400),
+        duration_s=round(duration, 3),
+        throughput_rps=round(iterations / duration, 1) if duration else 0.0,
+        mean_ms=round(sum(latencies) / len(latencies), 2),
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        queries_per_request=round(sum(query_counts) / len(query_counts), 1) if query_counts else None,
+        max_queries=max(query_counts) if query_counts else None,
+    )
+
+
+def compare_with_baseline(results: List[ScenarioResult], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Regressions against a saved baseline: p95 latency or throughput worse than `tolerance`
+    (a fraction), any increase in queries per request, or new errors.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(f"{result.scenario}/{result.driver}")
+        if not previous:
+            continue
+        label = f"{result.scenario} ({result.driver})"
+        if result.p95_ms > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {previous['p95_ms']} ms -> {result.p95_ms} ms")
+        if result.throughput_rps < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {previous['throughput_rps']} -> {result.throughput_rps} req/s")
+        if (result.queries_per_request or 0) > (previous.get("queries_per_request") or 0):
+            regressions.append(
+                f"{label}: queries per request {previous.get('queries_per_request')} -> {result.queries_per_request}"
+            )
+        if result.errors > previous.get("errors", 0):
+            regressions.append(f"{label}: errors {previous.get('errors', 0)} -> {result.errors}")
+    return regressions
@@ -0,0 +1,92 @@
+from pure_authentication.benchmarks.data import BENCHMARK_PASSWORD, SyntheticData
+
+
+class Scenario:
+    """
+    One benchmarked endpoint. `prepare` creates the rows the requests need (through
+    `SyntheticData`), `run` issues request number `iteration` through the driver.
+    """
+    name = None
+    description = None
+
+    def prepare(self, data: SyntheticData, catalog: list, iterations: int, lines: int):
+        pass
+
+    def run(self, driver, iteration: int):
+        raise NotImplementedError
+
+
+class LoginScenario(Scenario):
+    name = "login"
+    description = "POST /auth/api/login"
+
+    def prepare(self, data, catalog, iterations, lines):
+        self.users = data.create_users(min(iterations, 100))
+
+    def run(self, driver, iteration):
+        user = self.users[iteration % len(self.users)]
+        return driver.request("POST", "/auth/api/login", {"email": user.email, "password": BENCHMARK_PASSWORD})
+
+
+class BrowseScenario(Scenario):
+    name = "browse"
+    description = "POST /product/get_product for random catalog products"
+
+    def prepare(self, data, catalog, iterations, lines):
+        self.product_ids = [str(product.id) for product in data.random.choices(catalog, k=min(iterations, 500))]
+
+    def run(self, driver, iteration):
+        return driver.request(
+            "POST", "/product/get_product", {"product_id": self.product_ids[iteration % len(self.product_ids)]}
+        )
+
+
+class AddToCartScenario(Scenario):
+    name = "add_to_cart"
+    description = "POST /cart/add_to_cart replacing a cart with `lines` products"
+
+    def prepare(self, data, catalog, iterations, lines):
+        self.users = data.create_users(min(iterations, 50))
+        self.payloads = [
+            [{"product_id": str(product.id), "quantity": 1} for product in data.random.sample(catalog, lines)]
+            for _ in range(min(iterations, 50))
+        ]
+
+    def run(self, driver, iteration):
+        user = self.users[iteration % len(self.users)]
+        products = self.payloads[iteration % len(self.payloads)]
+        return driver.request("POST", "/cart/add_to_cart", {"user_id": str(user.id), "products": products})
+
+
+class GetCartScenario(Scenario):
+    name = "get_cart"
+    description = "GET /cart/get_cart for carts holding `lines` products"
+
+    def prepare(self, data, catalog, iterations, lines):
+        self.users = data.create_users(min(iterations, 50))
+        data.create_carts(self.users, catalog, lines)
+
+    def run(self, driver, iteration):
+        return driver.request("GET", "/cart/get_cart", query={"user_id": str(self.users[iteration % len(self.users)].id)})
+
+
+class PlaceOrderScenario(Scenario):
+    name = "place_order"
+    description = "POST /order/place_order/ from a cart holding `lines` products"
+
+    def prepare(self, data, catalog, iterations, lines):
+        # Placing an order empties the cart, so every request gets its own user and full cart
+        self.users = data.create_users(iterations)
+        data.create_carts(self.users, catalog, lines)
+
+    def run(self, driver, iteration):
+        return driver.request(
+            "POST", "/order/place_order/",
+            {"user_id": str(self.users[iteration].id), "shipping_address": "1 Benchmark Street"},
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (LoginScenario, BrowseScenario, AddToCartScenario, GetCartScenario, PlaceOrderScenario)
+}
@@ -0,0 +1,86 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from auth_api.models.user_models.user import User
+from cart.export_types.request_data_types.add_to_cart import AddToCartRequestType
+from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from cart.serializers.cart_serializer import CartCreateUpdateSerializer
+from cart.services.cart_services import CartServices
+from product.models.category import Category
+from product.models.product import Product
+
+
+class Command(BaseCommand):
+    help = 'Benchmark stock restore when clearing or shrinking large carts (runs in a rolled back transaction)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lines',
+            type=int,
+            default=200,
+            help='Cart lines (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        lines = options['lines']
+        with transaction.atomic():
+            suffix = uuid.uuid4().hex[:8]
+            category = Category.objects.create(name=f"benchmark-{suffix}")
+            products = Product.objects.bulk_create([
+                Product(
+                    name=f"benchmark {suffix} {index}",
+                    slug=f"benchmark-{suffix}-{index}",
+                    sku=f"BM{suffix}{index}".upper()[:32],
+                    category=category,
+                    price=Decimal('10.00'),
+                    stock=1000,
+                )
+                for index in range(lines)
+            ])
+            user = User.objects.create(username=f"bm_{suffix}", email=f"bm_{suffix}@example.com", password="-")
+            cart = Cart.objects.create(user=user)
+
+            results = [
+                ("per-row product.save() (previous clear_cart)", self.measure(cart, products, self.clear_cart_per_row)),
+                ("CartServices.clear_cart", self.measure(cart, products, lambda c: CartServices.clear_cart(str(user.id)))),
+                ("create_or_update_cart_item, keep 1 line", self.measure(cart, products, lambda c: self.shrink_cart(user, products))),
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\n=== Cart Stock Restore Benchmark ({lines} lines) ===")
+        for label, (statements, elapsed) in results:
+            self.stdout.write(f"{label:>46}: {statements:5d} statements {elapsed * 1000:9.1f} ms")
+
+    def measure(self, cart, products, operation):
+        CartItem.objects.filter(cart=cart).delete()
+        CartItem.objects.bulk_create([
+            CartItem(cart=cart, product=product, quantity=2, reserved_until=CartItem.reservation_deadline())
+            for product in products
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            operation(cart)
+            elapsed = time.perf_counter() - started
+        return len(queries), elapsed
+
+    @staticmethod
+    def clear_cart_per_row(cart):
+        with transaction.atomic():
+            cart_items = CartItem.objects.select_for_update().filter(cart=cart).select_related('product')
+            for cart_item in cart_items:
+                product = cart_item.product
+                product.stock += cart_item.quantity
+                product.save()
+            cart_items.delete()
+
+    @staticmethod
+    def shrink_cart(user, products):
+        CartCreateUpdateSerializer().create_or_update_cart_item(
+            AddToCartRequestType(user_id=user.id, products=[{"product_id": products[0].id, "quantity": 2}])
+        )
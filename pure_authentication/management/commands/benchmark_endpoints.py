@@ -0,0 +1,143 @@
+import json
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from pure_authentication.benchmarks.data import SyntheticData
+from pure_authentication.benchmarks.drivers import DRIVERS
+from pure_authentication.benchmarks.runner import compare_with_baseline, run_scenario
+from pure_authentication.benchmarks.scenarios import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the auth, product, cart and order endpoints on synthetic data in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=sorted(SCENARIOS),
+            help=f'Scenario to run, repeatable (default: all of {", ".join(SCENARIOS)})'
+        )
+        parser.add_argument(
+            '--driver',
+            choices=sorted(DRIVERS),
+            default='client',
+            help='"client": in-process test client, "wsgi": local HTTP server (default: client)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Timed requests per scenario (default: 200)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=10,
+            help='Untimed requests per scenario (default: 10)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Concurrent clients, wsgi driver only (default: 1)'
+        )
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=2000,
+            help='Synthetic catalog size (default: 2000)'
+        )
+        parser.add_argument(
+            '--lines',
+            type=int,
+            default=5,
+            help='Products per cart (default: 5)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed of the synthetic data (default: 0)'
+        )
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            default=str(Path(settings.BASE_DIR) / 'benchmark_baseline.json'),
+            help='Baseline JSON to compare with (default: benchmark_baseline.json)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Write the results to the baseline file instead of comparing'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed p95 / throughput degradation before failing, as a fraction (default: 0.2)'
+        )
+
+    def handle(self, *args, **options):
+        driver_class = DRIVERS[options['driver']]
+        if options['concurrency'] > 1 and not driver_class.thread_safe:
+            raise CommandError(f"The {driver_class.name} driver only runs with --concurrency 1")
+        scenarios = [SCENARIOS[name]() for name in options['scenario'] or SCENARIOS]
+
+        # Query counts are read back from the query-budget middleware headers; its per-request log is muted
+        logging.getLogger('query_budget').setLevel(logging.ERROR)
+        with override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_HEADERS=True, QUERY_BUDGET_STRICT=False):
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                results = self.run_benchmarks(driver_class, scenarios, options)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+
+        self.write_results(results)
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline = {f"{result.scenario}/{result.driver}": result.model_dump() for result in results}
+            if baseline_path.exists():
+                baseline = {**json.loads(baseline_path.read_text()), **baseline}
+            baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"✅ Baseline written to {baseline_path}"))
+        elif baseline_path.exists():
+            regressions = compare_with_baseline(results, json.loads(baseline_path.read_text()), options['tolerance'])
+            if regressions:
+                for regression in regressions:
+                    self.stdout.write(self.style.ERROR(f"❌ {regression}"))
+                raise CommandError(f"{len(regressions)} regressions against {baseline_path}")
+            self.stdout.write(self.style.SUCCESS(f"✅ No regression against {baseline_path}"))
+
+    def run_benchmarks(self, driver_class, scenarios, options):
+        data = SyntheticData(seed=options['seed'], prefix='bench')
+        catalog = data.create_catalog(categories=max(options['products'] // 100, 1), products=options['products'])
+        driver = driver_class()
+        results = []
+        try:
+            for scenario in scenarios:
+                self.stdout.write(f"Running {scenario.name}: {scenario.description}")
+                scenario.prepare(data, catalog, options['warmup'] + options['iterations'], options['lines'])
+                results.append(run_scenario(
+                    scenario, driver, options['iterations'], options['warmup'], options['concurrency']
+                ))
+        finally:
+            driver.close()
+        return results
+
+    def write_results(self, results):
+        self.stdout.write("\n=== Endpoint Benchmark ===")
+        self.stdout.write(
+            f"{'scenario':<14}{'driver':<8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'errors':>8}"
+        )
+        for result in results:
+            queries = '-' if result.queries_per_request is None else f"{result.queries_per_request:g}"
+            self.stdout.write(
+                f"{result.scenario:<14}{result.driver:<8}{result.throughput_rps:>9.1f}{result.p50_ms:>9.2f}"
+                f"{result.p95_ms:>9.2f}{result.p99_ms:>9.2f}{queries:>9}{result.errors:>8}"
+            )
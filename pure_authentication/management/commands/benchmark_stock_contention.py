@@ -0,0 +1,96 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from product.models.category import Category
+from product.models.product import Product
+from product.services.stock_service import StockService
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent stock reservations on one product: single-row vs sharded stock'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Concurrent buyers (default: 16)'
+        )
+        parser.add_argument(
+            '--reservations',
+            type=int,
+            default=200,
+            help='Reservations per buyer (default: 200)'
+        )
+        parser.add_argument(
+            '--shards',
+            type=int,
+            default=16,
+            help='Shard count for the sharded run (default: 16)'
+        )
+        parser.add_argument(
+            '--hold-ms',
+            type=float,
+            default=2.0,
+            help='Time each reservation transaction stays open after the write, '
+                 'standing in for the rest of the cart update (default: 2ms)'
+        )
+
+    def handle(self, *args, **options):
+        threads, reservations = options['threads'], options['reservations']
+        category = Category.objects.create(name=f"benchmark-{uuid.uuid4().hex[:8]}")
+        try:
+            product = Product.objects.create(
+                name=f"benchmark-{uuid.uuid4().hex[:8]}",
+                category=category,
+                price=Decimal('1.00'),
+                stock=threads * reservations,
+            )
+            single = self.run(product.id, threads, reservations, options['hold_ms'])
+
+            Product.objects.filter(id=product.id).update(stock=threads * reservations)
+            StockService.enable_stock_sharding(product.id, options['shards'])
+            sharded = self.run(product.id, threads, reservations, options['hold_ms'])
+            StockService.rebalance_stock_shards([product.id])
+            product.refresh_from_db()
+        finally:
+            category.delete()
+
+        self.stdout.write(f"\n=== Stock Contention Benchmark ({threads} buyers x {reservations}) ===")
+        for label, (elapsed, failures) in (("single-row", single), (f"sharded x{options['shards']}", sharded)):
+            self.stdout.write(
+                f"{label:>12}: {threads * reservations / elapsed:10.1f} reservations/s "
+                f"({elapsed:.2f}s, {failures} failed)"
+            )
+        self.stdout.write(f"Stock left after rebalance: {product.stock}")
+
+    def run(self, product_id, threads, reservations, hold_ms):
+        failures = []
+        barrier = threading.Barrier(threads + 1)
+
+        def buyer():
+            failed = 0
+            try:
+                barrier.wait()
+                for _ in range(reservations):
+                    with transaction.atomic():
+                        if not StockService.reserve_stock({product_id: 1}).is_success:
+                            failed += 1
+                        time.sleep(hold_ms / 1000)
+            finally:
+                failures.append(failed)
+                connection.close()
+
+        workers = [threading.Thread(target=buyer) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        started = time.monotonic()
+        for worker in workers:
+            worker.join()
+        return time.monotonic() - started, sum(failures)
@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from product.models.product import Product
@@ -54,8 +55,10 @@ class Command(BaseCommand):
         """Check stock for a specific product"""
         try:
             product = Product.objects.get(id=product_id)
-            cart_items = CartItem.objects.filter(product=product)
-            total_reserved = sum(item.quantity for item in cart_items)
+            cart_items = list(
+                CartItem.objects.filter(product=product).values_list('cart__user__username', 'quantity')
+            )
+            total_reserved = product.reserved_quantity
             
             self.stdout.write(f"\n=== Product Stock Analysis ===")
             self.stdout.write(f"Product: {product.name} (ID: {product.id})")
@@ -67,8 +70,8 @@ class Command(BaseCommand):
             
             if cart_items:
                 self.stdout.write(f"\nCart Reservations:")
-                for item in cart_items:
-                    self.stdout.write(f"  User {item.cart.user.username}: {item.quantity} units")
+                for username, quantity in cart_items:
+                    self.stdout.write(f"  User {username}: {quantity} units")
             
             # Check for negative stock
             if product.stock < 0:
@@ -94,12 +97,12 @@ class Command(BaseCommand):
         try:
             user = User.objects.get(id=user_id)
             cart = Cart.objects.get(user=user)
-            cart_items = CartItem.objects.filter(cart=cart).select_related('product')
+            cart_items = list(CartItem.objects.filter(cart=cart).select_related('product'))
             
             self.stdout.write(f"\n=== User Cart Analysis ===")
             self.stdout.write(f"User: {user.username} (ID: {user.id})")
             self.stdout.write(f"Cart ID: {cart.id}")
-            self.stdout.write(f"Total Items: {cart_items.count()}")
+            self.stdout.write(f"Total Items: {len(cart_items)}")
             
             if cart_items:
                 self.stdout.write(f"\nCart Items:")
@@ -118,44 +121,8 @@ class Command(BaseCommand):
             )
 
     def show_all_stock_issues(self, fix_stock=False):
-        """Show all products with potential stock issues"""
-        products = Product.objects.all()
-        issues_found = False
-        
-        self.stdout.write(f"\n=== Stock Issues Analysis ===")
-        
-        for product in products:
-            cart_items = CartItem.objects.filter(product=product)
-            total_reserved = sum(item.quantity for item in cart_items)
-            
-            # Check for issues
-            has_issue = False
-            issue_type = []
-            
-            if product.stock < 0:
-                has_issue = True
-                issue_type.append("negative_stock")
-            
-            if total_reserved > product.stock + total_reserved:
-                has_issue = True
-                issue_type.append("excessive_reservations")
-            
-            if has_issue:
-                issues_found = True
-                self.stdout.write(
-                    f"\n⚠️  {product.name} (ID: {product.id}):"
-                )
-                self.stdout.write(f"    Current Stock: {product.stock}")
-                self.stdout.write(f"    Reserved: {total_reserved}")
-                self.stdout.write(f"    Issues: {', '.join(issue_type)}")
-                
-                if fix_stock:
-                    self.fix_product_stock(product, total_reserved)
-        
-        if not issues_found:
-            self.stdout.write(
-                self.style.SUCCESS("✅ No stock issues found!")
-            )
+        """Show all products with stock drift, using the set-based reconciliation"""
+        call_command('reconcile_stock', dry_run=not fix_stock)
 
     def show_recent_actions(self, limit):
         """Show recent admin actions"""
@@ -197,30 +164,3 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f"❌ Failed to fix stock: {e}")
             )
-
-    def fix_product_stock(self, product, total_reserved):
-        """Fix stock issues for a product"""
-        try:
-            with transaction.atomic():
-                old_stock = product.stock
-                
-                # If stock is negative, set to 0
-                if product.stock < 0:
-                    product.stock = 0
-                
-                # If excessive reservations, adjust stock
-                if total_reserved > product.stock + total_reserved:
-                    product.stock = max(0, total_reserved)
-                
-                product.save()
-                
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✅ Fixed stock for {product.name}: "
-                        f"{old_stock} → {product.stock}"
-                    )
-                )
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"❌ Failed to fix stock: {e}")
-            ) 
\ No newline at end of file
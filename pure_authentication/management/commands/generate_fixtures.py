@@ -0,0 +1,107 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from auth_api.models.user_models.user import User
+from cart.models.cart import Cart
+from cart.models.cart_item import CartItem
+from product.models.category import Category
+from product.models.product import Product
+from product.services.stock_service import StockService
+from pure_authentication.benchmarks.data import BENCHMARK_PASSWORD, BulkLoader, SyntheticData
+from pure_authentication.management.progress import write_progress
+
+
+class _RowIds:
+    """Read-only sequence of the deterministic ids of `count` generated rows, without materialising them"""
+
+    def __init__(self, data: SyntheticData, kind: str, count: int):
+        self.data, self.kind, self.count = data, kind, count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.data.row_id(self.kind, index)
+
+
+class Command(BaseCommand):
+    help = 'Load deterministic synthetic users, catalog and carts at production scale with COPY / bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000, help='Users (default: 10000)')
+        parser.add_argument('--categories', type=int, default=100, help='Categories (default: 100)')
+        parser.add_argument('--products', type=int, default=100_000, help='Products (default: 100000)')
+        parser.add_argument(
+            '--carts',
+            type=int,
+            default=1_000,
+            help='Carts, given to the first N users (default: 1000)'
+        )
+        parser.add_argument('--lines', type=int, default=5, help='Products per cart (default: 5)')
+        parser.add_argument('--stock', type=int, default=1_000, help='Initial stock per product (default: 1000)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default='fx',
+            help='Prefix of generated names, slugs, SKUs and emails; change it to load a second data set (default: fx)'
+        )
+        parser.add_argument(
+            '--method',
+            choices=['copy', 'bulk'],
+            default='copy',
+            help='"copy": COPY FROM STDIN, "bulk": bulk_create INSERTs (default: copy)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=50_000,
+            help='Rows per chunk / transaction (default: 50000)'
+        )
+
+    def handle(self, *args, **options):
+        carts = min(options['carts'], options['users'])
+        data = SyntheticData(seed=options['seed'], prefix=options['prefix'])
+        loader = BulkLoader(options['method'], options['chunk_size'], on_chunk=self.write_progress)
+        self.totals = {
+            Category._meta.verbose_name_plural: options['categories'],
+            Product._meta.verbose_name_plural: options['products'],
+            User._meta.verbose_name_plural: options['users'],
+            Cart._meta.verbose_name_plural: carts,
+            CartItem._meta.verbose_name_plural: carts * min(options['lines'], options['products']),
+        }
+        started = time.monotonic()
+        self.stdout.write(f"\n=== Generating fixtures ({options['method']}, seed {options['seed']}) ===")
+
+        category_ids = _RowIds(data, "category", options['categories'])
+        self.load_step(loader, Category, data.categories(options['categories']))
+        self.load_step(loader, Product, data.products(options['products'], category_ids, options['stock']))
+        self.load_step(loader, User, data.users(options['users']))
+
+        user_ids = _RowIds(data, "user", carts)
+        cart_ids = [data.row_id("cart", index) for index in range(carts)]
+        self.load_step(loader, Cart, (Cart(id=cart_ids[index], user_id=user_ids[index]) for index in range(carts)))
+        reserved = {}
+        product_ids = _RowIds(data, "product", options['products'])
+        self.load_step(loader, CartItem, data.cart_items(cart_ids, product_ids, options['lines'], reserved))
+
+        # Cart lines hold stock: move it into reserved_quantity, one UPDATE per chunk of products
+        reserved = list(reserved.items())
+        for start in range(0, len(reserved), options['chunk_size']):
+            result = StockService.reserve_stock(dict(reserved[start:start + options['chunk_size']]))
+            if result.failed:
+                self.stdout.write(self.style.WARNING(f"⚠️  {len(result.failed)} products lacked stock for their cart lines"))
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Fixtures loaded in {time.monotonic() - started:.1f}s"))
+        self.stdout.write(f"Users log in with {options['prefix']}_<n>@example.com / {BENCHMARK_PASSWORD}")
+
+    def load_step(self, loader, model, instances):
+        started = time.monotonic()
+        loaded = loader.load(model, instances)
+        if not loaded:
+            self.write_progress(model._meta.verbose_name_plural, 0)
+        self.stdout.write(f" {time.monotonic() - started:.1f}s")
+
+    def write_progress(self, label, loaded):
+        write_progress(self.stdout, loaded, self.totals.get(label) or loaded, label=label)
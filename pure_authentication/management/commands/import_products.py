@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from product.services.product_import_service import IMPORT_FORMATS, ProductImportService
+
+
+class Command(BaseCommand):
+    help = 'Stream products from a CSV or NDJSON file and upsert them by SKU in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='File to import (.csv, .ndjson or .jsonl)')
+        parser.add_argument(
+            '--format',
+            choices=IMPORT_FORMATS,
+            default=None,
+            help='File format (default: from the file extension)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows validated and written per batch / transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--create-categories',
+            action='store_true',
+            help='Create unknown categories instead of rejecting their rows'
+        )
+        parser.add_argument(
+            '--max-errors',
+            type=int,
+            default=100,
+            help='Row errors to print (default: 100)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            file_format = options['format'] or ProductImportService.detect_format(options['path'])
+            binary_stream = open(options['path'], 'rb')
+        except (ValueError, OSError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"\n=== Importing {options['path']} ({file_format}) ===")
+        with binary_stream:
+            result = ProductImportService.import_rows(
+                ProductImportService.iter_rows(binary_stream, file_format),
+                batch_size=options['batch_size'],
+                create_categories=options['create_categories'],
+                max_errors=options['max_errors'],
+                on_batch=self.write_progress,
+            )
+        self.stdout.write("")
+
+        for error in result.errors:
+            self.stdout.write(self.style.ERROR(
+                f"Row {error.row}{f' (SKU {error.sku})' if error.sku else ''}: {'; '.join(error.errors)}"
+            ))
+        if result.failed > len(result.errors):
+            self.stdout.write(self.style.WARNING(f"... and {result.failed - len(result.errors)} more row errors"))
+        summary = f"{result.imported} of {result.rows} rows imported in {result.duration_seconds:.1f}s"
+        if result.failed:
+            self.stdout.write(self.style.WARNING(f"⚠️  {summary}, {result.failed} rejected"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
+
+    def write_progress(self, result):
+        self.stdout.write(
+            f"\rBatch {result.batches}: {result.rows} rows read, {result.imported} imported, {result.failed} rejected",
+            ending=""
+        )
+        self.stdout.flush()
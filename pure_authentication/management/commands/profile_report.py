@@ -0,0 +1,106 @@
+import pstats
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pure_authentication.profiling import list_profiles, make_profile_token
+
+
+class Command(BaseCommand):
+    help = 'Aggregate stored request profiles and list the functions with the most self time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            type=str,
+            default=None,
+            help='Profile directory (default: PROFILING_DIR)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=25,
+            help='Number of functions to show (default: 25)'
+        )
+        parser.add_argument(
+            '--match',
+            type=str,
+            default=None,
+            help='Only aggregate profiles whose file name contains this text, e.g. "cart_add_to_cart"'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List the stored profiles instead of aggregating them'
+        )
+        parser.add_argument(
+            '--token',
+            action='store_true',
+            help='Print a signed value for the profiling header and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['token']:
+            self.stdout.write(f"{settings.PROFILING_HEADER}: {make_profile_token()}")
+            return
+
+        directory = Path(options['dir'] or settings.PROFILING_DIR)
+        profiles = sorted(list_profiles(directory), key=lambda path: path.name)
+        if options['match']:
+            profiles = [path for path in profiles if options['match'] in path.name]
+        if not profiles:
+            self.stdout.write(self.style.WARNING(f"No profiles in {directory}"))
+            return
+
+        if options['list']:
+            self.stdout.write(f"\n=== {len(profiles)} profiles in {directory} ===")
+            for path in profiles:
+                self.stdout.write(f"  {path.name} ({path.stat().st_size} bytes)")
+            return
+
+        folded = [path for path in profiles if path.suffix == '.folded']
+        prof = [path for path in profiles if path.suffix == '.prof']
+        if folded:
+            self.report_folded(folded, options['top'])
+        if prof:
+            self.report_prof(prof, options['top'])
+
+    def report_folded(self, paths, top):
+        """Self samples are counted on the leaf frame, total samples on every distinct frame of the stack"""
+        self_samples = Counter()
+        total_samples = Counter()
+        samples = 0
+        for path in paths:
+            with open(path, encoding='utf-8') as profile:
+                for line in profile:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if not stack:
+                        continue
+                    count = int(count)
+                    frames = stack.split(';')
+                    samples += count
+                    self_samples[frames[-1]] += count
+                    for frame in set(frames):
+                        total_samples[frame] += count
+
+        self.stdout.write(f"\n=== Sampled profiles: {len(paths)} requests, {samples} samples ===")
+        self.stdout.write(f"{'self %':>8} {'total %':>8} {'self':>8}  function")
+        for function, count in self_samples.most_common(top):
+            self.stdout.write(
+                f"{100 * count / samples:>7.1f}% {100 * total_samples[function] / samples:>7.1f}% {count:>8}  {function}"
+            )
+
+    def report_prof(self, paths, top):
+        stats = pstats.Stats(*[str(path) for path in paths])
+        total_time = stats.total_tt or 1
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+
+        self.stdout.write(f"\n=== cProfile profiles: {len(paths)} requests, {stats.total_tt:.3f}s ===")
+        self.stdout.write(f"{'self %':>8} {'self s':>9} {'cum s':>9} {'calls':>8}  function")
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in rows[:top]:
+            self.stdout.write(
+                f"{100 * self_time / total_time:>7.1f}% {self_time:>9.4f} {cumulative:>9.4f} {calls:>8}  "
+                f"{function} ({Path(filename).name}:{line})"
+            )
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from order.services.idempotency_service import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = 'Delete place-order idempotency keys older than IDEMPOTENCY_KEY_TTL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Keys deleted per statement (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        purged = IdempotencyService.purge_expired(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Purged {purged} idempotency keys older than {settings.IDEMPOTENCY_KEY_TTL}")
+        )
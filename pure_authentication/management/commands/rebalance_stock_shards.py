@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from product.models.product import Product
+from product.services.stock_service import StockService
+
+
+class Command(BaseCommand):
+    help = 'Manage sharded stock counters and consolidate them back into Product.stock'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enable',
+            type=str,
+            metavar='PRODUCT_ID',
+            help='Switch a product to sharded-inventory mode'
+        )
+        parser.add_argument(
+            '--disable',
+            type=str,
+            metavar='PRODUCT_ID',
+            help='Fold the shards of a product back into a single stock row'
+        )
+        parser.add_argument(
+            '--shards',
+            type=int,
+            default=8,
+            help='Number of shards used with --enable (default: 8)'
+        )
+        parser.add_argument(
+            '--product-id',
+            type=str,
+            help='Only rebalance this product'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep rebalancing every N seconds (default: run once)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['enable']:
+                product = StockService.enable_stock_sharding(options['enable'], options['shards'])
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✅ {product.name}: {product.stock} units split over {product.stock_shard_count} shards"
+                    )
+                )
+                return
+            if options['disable']:
+                product = StockService.disable_stock_sharding(options['disable'])
+                self.stdout.write(
+                    self.style.SUCCESS(f"✅ {product.name}: sharding disabled, stock {product.stock}")
+                )
+                return
+        except (Product.DoesNotExist, ValueError) as e:
+            self.stdout.write(self.style.ERROR(f"❌ {e}"))
+            return
+
+        product_ids = [options['product_id']] if options['product_id'] else None
+        while True:
+            started = time.monotonic()
+            totals = StockService.rebalance_stock_shards(product_ids)
+            self.stdout.write(
+                f"Rebalanced {len(totals)} sharded products "
+                f"({sum(totals.values())} units) in {time.monotonic() - started:.2f}s"
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+from order.services.order_total_service import OrderTotalService
+from pure_authentication.management.reconcile import ReconcileCommand
+
+
+class Command(ReconcileCommand):
+    help = 'Backfill / verify Order.total_amount against the sum of the order items with set-based SQL'
+    title = 'Order Total Reconciliation'
+    subject = 'orders'
+    drift = 'total'
+
+    def count(self):
+        return OrderTotalService.count_orders()
+
+    def scan(self, chunk_size):
+        return OrderTotalService.scan_total_drift(chunk_size)
+
+    def apply_fixes(self, drifts, batch_size):
+        return OrderTotalService.apply_fixes(drifts, batch_size)
+
+    def write_diff(self, drift):
+        self.stdout.write(f"Order #{drift.order_number} (ID: {drift.order_id})")
+        self.stdout.write(self.style.ERROR(f"-   total_amount: {drift.total_amount}"))
+        self.stdout.write(self.style.SUCCESS(f"+   total_amount: {drift.actual_total_amount}"))
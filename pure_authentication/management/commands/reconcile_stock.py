@@ -0,0 +1,27 @@
+from product.services.stock_reconciliation_service import StockReconciliationService
+from pure_authentication.management.reconcile import ReconcileCommand
+
+
+class Command(ReconcileCommand):
+    help = 'Reconcile reserved quantities (and sharded stock) of the whole catalog with set-based SQL'
+    title = 'Stock Reconciliation'
+    subject = 'products'
+    drift = 'stock'
+
+    def count(self):
+        return StockReconciliationService.count_products()
+
+    def scan(self, chunk_size):
+        return StockReconciliationService.scan_stock_drift(chunk_size)
+
+    def apply_fixes(self, drifts, batch_size):
+        return StockReconciliationService.apply_fixes(drifts, batch_size)
+
+    def write_diff(self, drift):
+        self.stdout.write(f"{drift.product_name} (ID: {drift.product_id})")
+        if drift.has_reserved_drift:
+            self.stdout.write(self.style.ERROR(f"-   reserved_quantity: {drift.reserved_quantity}"))
+            self.stdout.write(self.style.SUCCESS(f"+   reserved_quantity: {drift.actual_reserved_quantity}"))
+        if drift.has_stock_drift:
+            self.stdout.write(self.style.ERROR(f"-   stock: {drift.stock}"))
+            self.stdout.write(self.style.SUCCESS(f"+   stock: {drift.actual_stock}"))
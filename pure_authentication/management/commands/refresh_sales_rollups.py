@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from order.services.order_analytics_service import OrderAnalyticsService
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hourly / daily sales rollups of the orders changed since the last refresh'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Empty the rollups and recompute them from every order (needed after orders are deleted)'
+        )
+        parser.add_argument(
+            '--lag',
+            type=int,
+            default=None,
+            help='Seconds an order must have been left alone before it is read (default: SALES_ROLLUP_LAG)'
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=31,
+            help='Days recomputed per transaction (default: 31)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("\n=== Sales Rollup Refresh ===")
+        result = OrderAnalyticsService.refresh_rollups(
+            rebuild=options['rebuild'],
+            lag=None if options['lag'] is None else timedelta(seconds=options['lag']),
+            chunk_days=options['chunk_days'],
+            on_chunk=self.write_progress,
+        )
+        if result.skipped:
+            self.stdout.write(self.style.WARNING("⚠️  Another refresh is running, nothing done"))
+            return
+        if result.chunks:
+            self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Recomputed {result.hours} hours over {result.days} days ({result.rows} rollup rows) "
+            f"in {result.duration_seconds}s"
+        ))
+        self.stdout.write(f"Watermark: {result.previous_watermark or 'none'} -> {result.watermark}")
+
+    def write_progress(self, result):
+        self.stdout.write(f"\rChunk {result.chunks}: {result.days} days, {result.hours} hours", ending="")
+        self.stdout.flush()
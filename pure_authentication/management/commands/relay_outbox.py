@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pure_authentication.outbox import OutboxRelay, purge_processed
+
+
+class Command(BaseCommand):
+    help = 'Deliver outbox events to their handlers in batches (SELECT ... FOR UPDATE SKIP LOCKED)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Events claimed per batch / transaction (default: OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches (default: until no event is due)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep polling every N seconds once drained (default: run once)'
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Also delete events delivered longer than OUTBOX_RETENTION ago'
+        )
+
+    def handle(self, *args, **options):
+        relay = OutboxRelay(batch_size=options['batch_size'])
+        while True:
+            result = relay.drain(max_batches=options['max_batches'])
+            if result['batches'] or not options['interval']:
+                style = self.style.WARNING if result['failed'] else self.style.SUCCESS
+                icon = "⚠️ " if result['failed'] else "✅"
+                self.stdout.write(style(
+                    f"{icon} Delivered {result['delivered']} events in {result['batches']} batches, "
+                    f"{result['failed']} failed ({result['duration_seconds']}s)"
+                ))
+            if options['purge']:
+                purged = purge_processed()
+                if purged:
+                    self.stdout.write(self.style.SUCCESS(f"✅ Purged {purged} delivered events"))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cart.services.reservation_sweeper import release_expired_reservations
+
+
+class Command(BaseCommand):
+    help = 'Give back stock held by expired cart reservations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Cart lines released per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this many batches (default: until no expired lines are left)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep sweeping every N seconds (default: run once)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = release_expired_reservations(
+                batch_size=options['batch_size'],
+                max_batches=options['max_batches'],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Released {result.released_items} cart lines in {result.batches} batches: "
+                    f"{result.reclaimed_units} units reclaimed for {result.products_restocked} products "
+                    f"({result.duration_seconds}s)"
+                )
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
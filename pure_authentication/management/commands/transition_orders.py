@@ -0,0 +1,94 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from order.models.order_payment_status import OrderStatus
+from order.services.order_status_service import OrderStatusService
+
+
+class Command(BaseCommand):
+    help = 'Move many orders to a new status in chunks, following the legal order status transitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('to_status', choices=OrderStatus.values, help='Status to move the orders to')
+        targets = parser.add_mutually_exclusive_group(required=True)
+        targets.add_argument(
+            '--ids-file',
+            type=str,
+            default=None,
+            help='File with one order id per line'
+        )
+        targets.add_argument(
+            '--all',
+            action='store_true',
+            help='Move every order in a legal source status instead of --ids-file'
+        )
+        parser.add_argument(
+            '--from-status',
+            action='append',
+            choices=OrderStatus.values,
+            help='Only move orders currently in this status, repeatable (default: every legal source)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Orders updated per statement / transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--show-rejected',
+            action='store_true',
+            help='Print every rejected / unknown order id'
+        )
+
+    def handle(self, *args, **options):
+        order_ids = self.read_ids(options['ids_file']) if options['ids_file'] else None
+
+        self.stdout.write(f"\n=== Order Transition to {options['to_status']} ===")
+        result = OrderStatusService.bulk_transition(
+            options['to_status'],
+            order_ids=order_ids,
+            all_eligible=options['all'],
+            from_statuses=options['from_status'],
+            chunk_size=options['chunk_size'],
+            on_chunk=self.write_progress,
+        )
+        self.stdout.write("")
+
+        if options['show_rejected']:
+            for order_id, current in result.rejected.items():
+                self.stdout.write(self.style.ERROR(f"-   {order_id}: cannot move from {current}"))
+            for order_id in result.not_found:
+                self.stdout.write(self.style.ERROR(f"-   {order_id}: not found"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Moved {len(result.transitioned)} orders to {result.to_status} in {result.chunks} chunks "
+            f"({result.duration_seconds}s)"
+        ))
+        if result.restocked_units:
+            self.stdout.write(self.style.SUCCESS(f"✅ Returned {result.restocked_units} units to stock"))
+        if result.rejected or result.not_found:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️  {len(result.rejected)} orders rejected by the transition rules, {len(result.not_found)} not found"
+            ))
+
+    def read_ids(self, path: str) -> list:
+        # Every line is checked before the first chunk moves, so a typo cannot stop a run halfway
+        order_ids, invalid = [], []
+        try:
+            with open(path, encoding='utf-8') as ids_file:
+                for line_number, line in enumerate(ids_file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        order_ids.append(uuid.UUID(line.strip()))
+                    except ValueError:
+                        invalid.append(f"line {line_number}: {line.strip()!r}")
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+        if invalid:
+            raise CommandError(f"{len(invalid)} invalid order ids in {path}:\n" + "\n".join(invalid))
+        return order_ids
+
+    def write_progress(self, result):
+        self.stdout.write(f"\rChunk {result.chunks}: {len(result.transitioned)} moved", ending="")
+        self.stdout.flush()
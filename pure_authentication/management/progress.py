@@ -0,0 +1,10 @@
+def write_progress(stdout, done: int, total: int, label: str = None, width: int = 30):
+    """
+    Redraw a `[####......]  40.0% (done/total)` bar in place on a command's stdout,
+    optionally after a left-aligned label. The caller ends the line when it is done.
+    """
+    filled = int(width * done / total) if total else width
+    percent = 100 * done / total if total else 100
+    prefix = f"{label:<12} " if label is not None else ""
+    stdout.write(f"\r{prefix}[{'#' * filled}{'.' * (width - filled)}] {percent:5.1f}% ({done}/{total})", ending="")
+    stdout.flush()
@@ -0,0 +1,88 @@
+import time
+from abc import ABC, abstractmethod
+
+from django.core.management.base import BaseCommand
+
+from pure_authentication.management.progress import write_progress
+
+
+class ReconcileCommand(BaseCommand, ABC):
+    """
+    Base of the drift reconciliation commands. Rows are scanned in keyset chunks, every
+    drifting row is printed as a diff and, unless --dry-run, fixed in batches of short
+    transactions; rows that changed since the scan are left for the next run.
+
+    Subclasses name what they reconcile (`title`, the plural `subject` and the `drift`
+    kind) and implement count / scan / apply_fixes / write_diff; a subclass missing one
+    of them cannot be instantiated.
+    """
+    title = None
+    subject = None
+    drift = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only print the diff, do not write anything'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help=f'{self.subject.capitalize()} scanned per query (default: 5000)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help=f'{self.subject.capitalize()} fixed per UPDATE / transaction (default: 1000)'
+        )
+
+    @abstractmethod
+    def count(self) -> int:
+        """Rows the scan will go through, for the progress bar"""
+
+    @abstractmethod
+    def scan(self, chunk_size: int):
+        """Yield (rows scanned in this chunk, drifts found in this chunk)"""
+
+    @abstractmethod
+    def apply_fixes(self, drifts, batch_size: int) -> int:
+        """Fix `drifts` in batches and return how many were fixed"""
+
+    @abstractmethod
+    def write_diff(self, drift):
+        """Print one drifting row"""
+
+    def handle(self, *args, **options):
+        total = self.count()
+        started = time.monotonic()
+        scanned = drifted = fixed = 0
+
+        self.stdout.write(f"\n=== {self.title} ({'dry run' if options['dry_run'] else 'apply'}) ===")
+        for chunk_scanned, drifts in self.scan(options['chunk_size']):
+            scanned += chunk_scanned
+            drifted += len(drifts)
+            if drifts:
+                self.stdout.write("")
+                for drift in drifts:
+                    self.write_diff(drift)
+                if not options['dry_run']:
+                    fixed += self.apply_fixes(drifts, options['batch_size'])
+            write_progress(self.stdout, scanned, total)
+
+        self.stdout.write("")
+        elapsed = time.monotonic() - started
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS(f"✅ No {self.drift} drift in {scanned} {self.subject} ({elapsed:.1f}s)"))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"⚠️  {drifted} of {scanned} {self.subject} drift ({elapsed:.1f}s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Fixed {fixed} of {drifted} drifting {self.subject} in {scanned} ({elapsed:.1f}s)"
+            ))
+            if fixed < drifted:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️  {drifted - fixed} {self.subject} changed during the run, run again to fix them"
+                ))
@@ -0,0 +1,144 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator
+
+from django.db.backends.signals import connection_created
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_FOR_UPDATE = re.compile(r"\bFOR (?:NO KEY )?UPDATE\b", re.IGNORECASE)
+_FROM_TABLE = re.compile(r'\bFROM\s+"?(\w+)"?', re.IGNORECASE)
+
+
+class Histogram:
+    """
+    Prometheus-style histogram aggregated per process without locks: every thread
+    observes into its own shard (only that thread ever writes to it), and a scrape
+    merges the shards. Shards outlive their thread so counts stay cumulative.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # list.append is atomic, the scrape only ever reads a snapshot of the list
+            self._shards.append(shard)
+        return shard
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        shard = self._shard()
+        series = shard.get(key)
+        if series is None:
+            # One counter per bucket, one for +Inf, then the running sum
+            series = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> dict:
+        """Merge all thread shards: label values -> (per-bucket counts, sum)"""
+        merged = {}
+        for shard in list(self._shards):
+            for key, series in shard.copy().items():
+                series = list(series)
+                total = merged.setdefault(key, [0] * len(series[:-1]) + [0.0])
+                for index, value in enumerate(series):
+                    total[index] += value
+        return merged
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.collect().items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                bucket_labels = ",".join(labels + ['le="%s"' % bound])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = f"{{{','.join(labels)}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-1]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent serving a request, by view", ("view", "method", "status")
+)
+HOT_PATH_LATENCY = Histogram(
+    "hot_path_duration_seconds", "Time spent in instrumented hot paths", ("operation",)
+)
+LOCK_WAIT = Histogram(
+    "db_lock_wait_seconds", "Time spent in SELECT ... FOR UPDATE statements, by table", ("table",)
+)
+REGISTRY = (REQUEST_LATENCY, HOT_PATH_LATENCY, LOCK_WAIT)
+
+
+class timed(ContextDecorator):
+    """
+    Time a block or a function into `hot_path_duration_seconds{operation=...}`:
+
+        @timed("cart_to_export")
+        def cart_to_export(cart): ...
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._start = threading.local()
+
+    def __enter__(self):
+        # Per-thread start time so one decorated function can run in several threads
+        self._start.stack = getattr(self._start, 'stack', [])
+        self._start.stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        HOT_PATH_LATENCY.observe(time.perf_counter() - self._start.stack.pop(), operation=self.operation)
+        return False
+
+
+def render_metrics() -> str:
+    """All registered metrics of this process in Prometheus text format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _time_row_locks(execute, sql, params, many, context):
+    if not _FOR_UPDATE.search(sql):
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        table = _FROM_TABLE.search(sql)
+        LOCK_WAIT.observe(time.perf_counter() - start, table=table.group(1) if table else "")
+
+
+def _install_lock_timer(sender, connection, **kwargs):
+    # First in the chain: scoped execute_wrapper() blocks pop the last wrapper on exit
+    if _time_row_locks not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _time_row_locks)
+
+
+def install_lock_wait_timer():
+    """Time every row-locking statement on all current and future connections"""
+    from django.db import connections
+
+    connection_created.connect(_install_lock_timer, dispatch_uid="metrics_lock_wait_timer")
+    for connection in connections.all(initialized_only=True):
+        _install_lock_timer(sender=None, connection=connection)
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from pure_authentication.metrics import REQUEST_LATENCY, install_lock_wait_timer
+
+
+class MetricsMiddleware:
+    """
+    Middleware to record a latency histogram per view (method and status included),
+    and to time row-locking statements. Served by /metrics/ in Prometheus format.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        install_lock_wait_timer()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        # Unresolved paths are folded together so 404 scans cannot blow up the label set
+        view = getattr(request, '_metrics_view', 'unresolved')
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start, view=view, method=request.method, status=response.status_code
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        request._metrics_view = f"{view.__module__}.{view.__qualname__}"
+        return None
@@ -0,0 +1,33 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from auth_api.models.base_models.base_model import GenericBaseModel
+
+
+class OutboxEvent(GenericBaseModel):
+    """
+    A domain event written in the same transaction as the change it describes, and
+    delivered afterwards by the `relay_outbox` command: it exists if and only if that
+    change was committed, and no consumer runs inside the request.
+    """
+    event_type = models.CharField(max_length=100)
+    aggregate_type = models.CharField(max_length=50)
+    aggregate_id = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The relay only ever scans undelivered events: keep that index small
+            models.Index(fields=['available_at'], name='outbox_pending_idx', condition=Q(processed_at__isnull=True)),
+            models.Index(fields=['processed_at']),
+            models.Index(fields=['aggregate_type', 'aggregate_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_type}:{self.aggregate_id}"
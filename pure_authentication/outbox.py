@@ -0,0 +1,132 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pure_authentication.models.outbox_event import OutboxEvent
+from pure_authentication.purge import purge_in_batches
+
+logger = logging.getLogger("outbox")
+
+
+def publish(event_type: str, aggregate_type: str, aggregate_id, payload: dict) -> OutboxEvent:
+    """
+    Record an event for the relay. Call it inside the transaction that makes the change,
+    so the event is committed or rolled back with it; it costs one INSERT.
+    """
+    return OutboxEvent.objects.create(
+        event_type=event_type, aggregate_type=aggregate_type, aggregate_id=str(aggregate_id), payload=payload
+    )
+
+
+def publish_many(event_type: str, aggregate_type: str, payloads: Dict[object, dict]) -> List[OutboxEvent]:
+    """One event per aggregate id, written with a single INSERT."""
+    return OutboxEvent.objects.bulk_create([
+        OutboxEvent(event_type=event_type, aggregate_type=aggregate_type, aggregate_id=str(aggregate_id), payload=payload)
+        for aggregate_id, payload in payloads.items()
+    ])
+
+
+def log_events(events: List[OutboxEvent]):
+    """Default handler: one JSON line per event on the `outbox` logger."""
+    for event in events:
+        logger.info(json.dumps({
+            "id": str(event.id),
+            "event_type": event.event_type,
+            "aggregate": f"{event.aggregate_type}:{event.aggregate_id}",
+            "payload": event.payload,
+        }, default=str))
+
+
+class OutboxRelay:
+    """
+    Drains the outbox in batches. Each batch is claimed with SELECT ... FOR UPDATE SKIP
+    LOCKED, so several relays can run side by side without waiting on each other, handed
+    to the handlers of OUTBOX_HANDLERS by event type, and marked delivered with one
+    UPDATE in the same transaction. Delivery is at least once: a relay that dies
+    mid-batch leaves its events to the next one. A failing handler only delays the
+    events it was given, with exponential backoff, up to OUTBOX_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, batch_size: int = None, handlers: Dict[str, List[Callable]] = None):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        if handlers is None:
+            handlers = {
+                event_type: [import_string(path) for path in paths]
+                for event_type, paths in settings.OUTBOX_HANDLERS.items()
+            }
+        self.handlers = handlers
+
+    def handlers_for(self, event_type: str) -> List[Callable]:
+        return self.handlers.get(event_type, []) + self.handlers.get("*", [])
+
+    def relay_batch(self) -> Dict[str, int]:
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(processed_at__isnull=True, available_at__lte=timezone.now(),
+                        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+                .order_by('available_at')[:self.batch_size]
+            )
+            if not events:
+                return {"delivered": 0, "failed": 0}
+
+            by_type = defaultdict(list)
+            for event in events:
+                by_type[event.event_type].append(event)
+            failed = {}
+            for event_type, typed_events in by_type.items():
+                for handler in self.handlers_for(event_type):
+                    try:
+                        handler(typed_events)
+                    except Exception as e:
+                        logger.exception("Outbox handler %s failed for %s events", handler, event_type)
+                        failed.update({event.id: f"{type(e).__name__}: {e}" for event in typed_events})
+                        break
+
+            now = timezone.now()
+            delivered = [event.id for event in events if event.id not in failed]
+            if delivered:
+                OutboxEvent.objects.filter(id__in=delivered).update(processed_at=now)
+            for event in events:
+                if event.id in failed:
+                    event.attempts += 1
+                    event.last_error = failed[event.id]
+                    event.available_at = now + timedelta(seconds=min(2 ** event.attempts, 300))
+            if failed:
+                OutboxEvent.objects.bulk_update(
+                    [event for event in events if event.id in failed], ['attempts', 'last_error', 'available_at']
+                )
+        return {"delivered": len(delivered), "failed": len(failed)}
+
+    def drain(self, max_batches: int = None, on_batch: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """
+        Relay batches until no event is due (or `max_batches` ran). Failed events are
+        pushed past now by their backoff, so they are not retried within the same drain.
+        """
+        started = time.monotonic()
+        totals = {"batches": 0, "delivered": 0, "failed": 0}
+        while max_batches is None or totals["batches"] < max_batches:
+            result = self.relay_batch()
+            if not result["delivered"] and not result["failed"]:
+                break
+            totals["batches"] += 1
+            totals["delivered"] += result["delivered"]
+            totals["failed"] += result["failed"]
+            if on_batch:
+                on_batch(totals)
+        totals["duration_seconds"] = round(time.monotonic() - started, 3)
+        return totals
+
+
+def purge_processed(batch_size: int = 1000) -> int:
+    """Delete events delivered longer than OUTBOX_RETENTION ago, one batch per statement."""
+    cutoff = timezone.now() - settings.OUTBOX_RETENTION
+    return purge_in_batches(OutboxEvent.objects.filter(processed_at__lt=cutoff), batch_size)
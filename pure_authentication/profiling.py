@@ -0,0 +1,133 @@
+import cProfile
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+PROFILE_TOKEN_SALT = "pure_authentication.profiling"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler for one thread: a helper thread reads the target
+    thread's current frame every `interval` seconds and counts the collapsed stacks
+    (`outer;inner;leaf`), the input format of flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def dump(self, path: Path):
+        with open(path, "w", encoding="utf-8") as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+
+
+def collapse_stack(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+
+class RequestProfiler:
+    """
+    Profile one request with the configured mode and store the result under
+    PROFILING_DIR: `.folded` collapsed stacks for "sampling", a pstats `.prof`
+    dump for "cprofile".
+    """
+
+    def __init__(self, mode: str = None, interval: float = None):
+        self.mode = mode or settings.PROFILING_MODE
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+        else:
+            self._profiler = StackSampler(interval or settings.PROFILING_INTERVAL)
+
+    def __enter__(self):
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.mode == "cprofile":
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        return False
+
+    def save(self, label: str) -> Path:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}-"
+            f"{_UNSAFE_FILENAME.sub('_', label).strip('_')[:80]}"
+        )
+        if self.mode == "cprofile":
+            path = directory / f"{name}.prof"
+            self._profiler.dump_stats(path)
+        else:
+            path = directory / f"{name}.folded"
+            self._profiler.dump(path)
+        prune_profiles(directory, settings.PROFILING_MAX_FILES)
+        return path
+
+
+def prune_profiles(directory: Path, max_files: int):
+    """Keep only the newest `max_files` profiles so the directory stays bounded"""
+    profiles = sorted(list_profiles(directory), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in profiles[max_files:]:
+        path.unlink(missing_ok=True)
+
+
+def list_profiles(directory: Path) -> list:
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return [path for path in directory.iterdir() if path.suffix in (".folded", ".prof")]
+
+
+def make_profile_token() -> str:
+    """Signed value for the PROFILING_HEADER request header"""
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign("profile")
+
+
+def is_valid_profile_token(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
@@ -0,0 +1,47 @@
+import logging
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from pure_authentication.profiling import RequestProfiler, is_valid_profile_token
+
+logger = logging.getLogger('profiling')
+
+
+class ProfilingMiddleware:
+    """
+    Middleware to profile a fraction of requests in production. A request is profiled
+    when it carries a valid signed PROFILING_HEADER (see `profile_report --token`) or,
+    for paths under PROFILING_PATHS, with probability PROFILING_SAMPLE_RATE. Profiles
+    are written to PROFILING_DIR and summarised with `manage.py profile_report`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.header = "HTTP_" + settings.PROFILING_HEADER.upper().replace("-", "_")
+        self.paths = tuple(settings.PROFILING_PATHS)
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        profiler = RequestProfiler()
+        with profiler:
+            response = self.get_response(request)
+        try:
+            path = profiler.save(f"{request.method}-{request.path}")
+            logger.info("Profiled %s %s into %s", request.method, request.path, path)
+        except OSError as e:
+            # A full or read-only disk must never fail the request itself
+            logger.warning("Could not store profile for %s: %s", request.path, e)
+        return response
+
+    def _should_profile(self, request) -> bool:
+        token = request.META.get(self.header)
+        if token:
+            return is_valid_profile_token(token)
+        return bool(self.sample_rate) and request.path.startswith(self.paths) and random.random() < self.sample_rate
@@ -0,0 +1,12 @@
+def purge_in_batches(queryset, batch_size: int = 1000) -> int:
+    """
+    Delete the rows of `queryset`, `batch_size` ids per DELETE, so each statement holds its
+    row locks only briefly and no single transaction grows with the table. Returns the
+    number of rows deleted.
+    """
+    purged = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return purged
+        purged += queryset.model.objects.filter(pk__in=ids).delete()[0]
@@ -0,0 +1,142 @@
+import re
+import time
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_VALUE_TUPLE = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)*\s*\)")
+_VALUE_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+
+def fingerprint_sql(sql: str) -> str:
+    """
+    Normalise a statement so queries differing only by their values compare equal:
+    literals and placeholders become `?`, `IN (...)` / `VALUES (...)` lists collapse.
+    """
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _VALUE_TUPLE.sub("(?)", sql)
+    return _VALUE_LIST.sub("(?)", sql)
+
+
+class QueryRecorder:
+    """
+    Record every statement run on the given connections, with its duration, through
+    `connection.execute_wrapper` - so it works with DEBUG off, unlike `connection.queries`.
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.total_time, recorder.duplicates(), recorder.repeated_patterns()
+    """
+
+    def __init__(self, using=None):
+        self.aliases = [using] if using else list(connections)
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in self.aliases:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+        return False
+
+    def _record(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "sql": sql,
+                "params": params,
+                "time": time.monotonic() - start,
+                "fingerprint": fingerprint_sql(sql),
+                "alias": context["connection"].alias,
+            })
+
+    def __len__(self):
+        return len(self.queries)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query["time"] for query in self.queries)
+
+    def duplicates(self) -> dict:
+        """
+        Statements run more than once with exactly the same parameters -> times run.
+        """
+        counts = Counter((query["sql"], repr(query["params"])) for query in self.queries)
+        return {sql: count for (sql, _), count in counts.items() if count > 1}
+
+    def repeated_patterns(self, threshold: int = 3) -> dict:
+        """
+        Fingerprints run at least `threshold` times -> times run. A query shape repeated
+        once per row of a previous result is the usual N+1 signature.
+        """
+        counts = Counter(query["fingerprint"] for query in self.queries)
+        return {fingerprint: count for fingerprint, count in counts.most_common() if count >= threshold}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a code path issues more SQL queries than it declared
+    """
+
+    def __init__(self, label, budget, queries):
+        self.label = label
+        self.budget = budget
+        self.queries = queries
+        statements = "\n".join(f"  {index}. {query['sql']}" for index, query in enumerate(queries, start=1))
+        super().__init__(f"{label} issued {len(queries)} queries, budget is {budget}:\n{statements}")
+
+
+class query_budget(ContextDecorator):
+    """
+    Fail when the wrapped block issues more than `max_queries` queries on `using`.
+    Works as a context manager or a decorator, in tests and in ad-hoc checks:
+
+        with query_budget(2, label="debug_stock_levels"):
+            CartServices.debug_stock_levels(product_id)
+
+        @query_budget(3)
+        def test_get_cart(self): ...
+    """
+
+    def __init__(self, max_queries: int, using: str = DEFAULT_DB_ALIAS, label: str = None):
+        self.max_queries = max_queries
+        self.using = using
+        self.label = label
+        self._recorder = None
+
+    def __enter__(self):
+        self._recorder = QueryRecorder(using=self.using)
+        return self._recorder.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._recorder.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and self._recorder.count > self.max_queries:
+            raise QueryBudgetExceeded(self.label or "Code path", self.max_queries, self._recorder.queries)
+        return False
+
+
+def assert_query_budget(max_queries: int, func, *args, **kwargs):
+    """
+    Call `func(*args, **kwargs)` and fail if it issues more than `max_queries` queries.
+    Returns whatever `func` returns.
+    """
+    with query_budget(max_queries, label=getattr(func, "__qualname__", None)):
+        return func(*args, **kwargs)
@@ -0,0 +1,81 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from pure_authentication.query_budget import QueryBudgetExceeded, QueryRecorder
+
+logger = logging.getLogger('query_budget')
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware to record the SQL issued by every API request: query count, total SQL
+    time, duplicate statements and repeated (N+1) query shapes. Each request under
+    QUERY_BUDGET_PATHS is logged as one JSON line; with QUERY_BUDGET_HEADERS on, the
+    numbers are also returned as X-Query-* response headers.
+
+    Views listed in QUERY_BUDGETS (dotted view class path -> max queries) are checked
+    against their budget: overruns are logged as warnings, or raise
+    QueryBudgetExceeded when QUERY_BUDGET_STRICT is set (tests).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, 'QUERY_BUDGET_PATHS', ()))
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.headers = getattr(settings, 'QUERY_BUDGET_HEADERS', False)
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+        self.repeat_threshold = getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', 3)
+
+    def __call__(self, request):
+        if self.paths and not request.path.startswith(self.paths):
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        view = getattr(request, '_query_budget_view', None)
+        budget = self.budgets.get(view)
+        duplicates = recorder.duplicates()
+        repeated = recorder.repeated_patterns(self.repeat_threshold)
+        over_budget = budget is not None and recorder.count > budget
+
+        if self.headers:
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time-Ms'] = f"{recorder.total_time * 1000:.1f}"
+            response['X-Query-Duplicates'] = str(sum(count - 1 for count in duplicates.values()))
+            response['X-Query-Repeated-Patterns'] = str(len(repeated))
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+
+        self._log(request, response, view, budget, recorder, duplicates, repeated, over_budget)
+
+        if over_budget and self.strict:
+            raise QueryBudgetExceeded(view, budget, recorder.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # APIView.as_view() keeps the class around; plain function views are keyed by themselves
+        view = getattr(view_func, 'view_class', view_func)
+        request._query_budget_view = f"{view.__module__}.{view.__qualname__}"
+        return None
+
+    def _log(self, request, response, view, budget, recorder, duplicates, repeated, over_budget):
+        """Log one structured line per request, as a warning when something looks wrong"""
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "sql_time_ms": round(recorder.total_time * 1000, 1),
+            "budget": budget,
+            "duplicates": [{"sql": sql, "count": count} for sql, count in duplicates.items()],
+            "repeated_patterns": [{"fingerprint": sql, "count": count} for sql, count in repeated.items()],
+        }
+        level = logging.WARNING if over_budget or repeated else logging.INFO
+        logger.log(level, json.dumps(record, default=str))
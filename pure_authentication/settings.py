@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -42,9 +43,11 @@ INSTALLED_APPS = [
     "product",
     "cart",
     "order",
+    "pure_authentication",
 ]
 
 MIDDLEWARE = [
+    "pure_authentication.metrics_middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -54,6 +57,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "pure_authentication.admin_logging.AdminLoggingMiddleware",
+    "pure_authentication.query_budget_middleware.QueryBudgetMiddleware",
+    "pure_authentication.profiling_middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "pure_authentication.urls"
@@ -137,6 +142,112 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cart reservations
+# Stock held by a cart line is given back once the line has not been touched for this long
+CART_RESERVATION_TTL = timedelta(minutes=int(os.environ.get("CART_RESERVATION_TTL_MINUTES", 30)))
+# Run the expiry sweeper in-process every N seconds (0 = only via `release_expired_reservations`)
+CART_RESERVATION_SWEEP_INTERVAL = int(os.environ.get("CART_RESERVATION_SWEEP_INTERVAL", 0))
+
+# Order numbers
+# Numbers come from a Postgres sequence; each process reserves a block of them per round trip
+ORDER_NUMBER_PREFIX = os.environ.get("ORDER_NUMBER_PREFIX", "ORD-")
+ORDER_NUMBER_DIGITS = 8
+ORDER_NUMBER_BLOCK_SIZE = int(os.environ.get("ORDER_NUMBER_BLOCK_SIZE", 50))
+
+# Order pricing
+# Tax charged on each line after its discount, in percent; frozen into the order items
+ORDER_TAX_RATE = Decimal(os.environ.get("ORDER_TAX_RATE", "0"))
+
+# Caches
+# Per-process by default; with several worker processes point this at a shared backend
+# (Memcached / Redis), otherwise another worker's write only shows after the TTL below
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "pure-authentication"),
+    }
+}
+# Rendered cancelled / returned orders, invalidated whenever the order or its items change
+ORDER_EXPORT_CACHE = "default"
+ORDER_EXPORT_CACHE_TTL = int(os.environ.get("ORDER_EXPORT_CACHE_TTL", 300))
+
+# Idempotency keys
+# A place-order retry carrying the same Idempotency-Key replays the stored response
+# until the key is older than this and `purge_idempotency_keys` has removed it
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.environ.get("IDEMPOTENCY_KEY_TTL_HOURS", 24)))
+
+# Transactional outbox
+# Handlers (dotted paths) run by `relay_outbox` per event type; "*" receives every event
+OUTBOX_HANDLERS = {
+    "*": ["pure_authentication.outbox.log_events"],
+}
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 100))
+# Events still failing after this many attempts stay in the table for inspection
+OUTBOX_MAX_ATTEMPTS = 10
+# Delivered events are kept this long, then removed by `relay_outbox --purge`
+OUTBOX_RETENTION = timedelta(days=int(os.environ.get("OUTBOX_RETENTION_DAYS", 7)))
+
+# Sales rollups
+# `refresh_sales_rollups` only reads orders last changed at least this long ago, so
+# transactions still in flight when it runs commit before the watermark passes them
+SALES_ROLLUP_LAG = timedelta(seconds=int(os.environ.get("SALES_ROLLUP_LAG_SECONDS", 60)))
+
+# Query budgets
+# Record SQL count / time / duplicates / N+1 shapes per API request (see query_budget_middleware)
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "1" if DEBUG else "0") in TRUTH_LIST
+# Return the numbers as X-Query-* response headers
+QUERY_BUDGET_HEADERS = os.environ.get("QUERY_BUDGET_HEADERS") in TRUTH_LIST
+# Raise instead of logging when a view goes over its budget (meant for tests)
+QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT") in TRUTH_LIST
+QUERY_BUDGET_PATHS = ("/auth/api/", "/cart/", "/product/", "/order/")
+# A query shape repeated this many times in one request is reported as a likely N+1
+QUERY_BUDGET_REPEAT_THRESHOLD = 3
+# Max queries per request, by view class. The cart views cost the same whatever the number
+# of lines; lower these as the endpoints are fixed, never raise them silently.
+QUERY_BUDGETS = {
+    "auth_api.views.register.RegisterUsersView": 4,
+    "auth_api.views.login.LoginView": 4,
+    "auth_api.views.user_details.UserDetailView": 3,
+    "auth_api.views.forgot_password.ForgotPasswordView": 4,
+    "auth_api.views.update_password.UpdatePasswordView": 4,
+    "auth_api.views.update_profile.UpdateProfileView": 4,
+    "product.view.get_all_products.AllProductView": 1,
+    "product.view.get_product.GetProductView": 1,
+    # Both re-read the user, cart and products in each validation step, but never once per line
+    "cart.views.add_to_cart.AddToCartView": 28,
+    "cart.views.add_item.AddItemView": 28,
+    "cart.views.update_cart.UpdateCartView": 11,
+    "cart.views.get_cart.GetCartView": 8,
+    "cart.views.remove_from_cart.RemoveFromCartView": 13,
+    "cart.views.clear_cart.ClearCartView": 13,
+    # 16, plus the nextval that refills the order-number block once every ORDER_NUMBER_BLOCK_SIZE orders
+    "order.view.place_order.PlaceOrderView": 17,
+    "order.view.get_order_by_id.GetOrderByIdView": 1,
+    "order.view.order_history.OrderHistoryView": 2,
+    "order.view.sales_report.SalesReportView": 5,
+}
+
+# Metrics
+# Latency histograms, hot-path timers and row-lock wait times, aggregated per process
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") in TRUTH_LIST
+# /metrics/ only answers scrapes from these addresses
+METRICS_ALLOWED_IPS = tuple(os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(","))
+
+# Request profiling
+# Profile sampled requests, or requests with a signed PROFILING_HEADER (`profile_report --token`)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED") in TRUTH_LIST
+# Fraction of requests under PROFILING_PATHS profiled without a header (0 = header only)
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_PATHS = ("/auth/api/", "/cart/", "/product/", "/order/")
+# "sampling" (stack sampler, collapsed stacks) or "cprofile" (deterministic, higher overhead)
+PROFILING_MODE = os.environ.get("PROFILING_MODE", "sampling")
+PROFILING_INTERVAL = float(os.environ.get("PROFILING_INTERVAL", 0.005))
+PROFILING_HEADER = "X-Profile-Token"
+PROFILING_TOKEN_MAX_AGE = 600
+PROFILING_DIR = os.environ.get("PROFILING_DIR", str(BASE_DIR / "profiles"))
+# Only the newest N profiles are kept
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", 200))
+
 # Admin Logging Configuration
 # Enable admin logging to track admin actions
 ADMIN_LOG_ENTRIES = True
@@ -186,6 +297,21 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'outbox': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'query_budget': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -0,0 +1,18 @@
+from django.test import TransactionTestCase, override_settings
+
+from pure_authentication.benchmarks.data import SyntheticData
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_STRICT=True)
+class QueryBudgetTestCase(TransactionTestCase):
+    """
+    Drive views through the test client with every request checked against its
+    QUERY_BUDGETS entry: the middleware raises QueryBudgetExceeded when a view goes over.
+    A TransactionTestCase, since TestCase would add a SAVEPOINT / RELEASE pair to every
+    atomic block the view opens and count them against its budget. `self.data` is seeded
+    with `seed`, so each test class builds the same rows on every run.
+    """
+    seed = 0
+
+    def setUp(self):
+        self.data = SyntheticData(seed=self.seed)
@@ -24,6 +24,7 @@ from django.conf import settings
 import markdown
 from django.shortcuts import redirect
 from pure_authentication.views.apilist import api_list_view
+from pure_authentication.views.metrics import metrics_view
 
 def readme_view(request):
     readme_path = os.path.join(settings.BASE_DIR, 'README.md')
@@ -39,11 +40,12 @@ urlpatterns = [
     path("auth/api/", include("auth_api.urls")),
     path("product/", include("product.urls")),
     path("cart/", include("cart.urls")),
-    path("order/", include("cart.urls")),
+    path("order/", include("order.urls")),
     # Admin logging URLs
     path("admin-logs/", admin_log_view, name="admin_logs"),
     path("admin-dashboard/", admin_dashboard_view, name="admin_dashboard"),
     path("admin-logs-list/", AdminLogListView.as_view(), name="admin_logs_list"),
     path("apilist/", api_list_view, name="api_list"),
+    path("metrics/", metrics_view, name="metrics"),
     path('', lambda request: redirect('https://effulgent-baklava-87d356.netlify.app/', permanent=False), name='root'),
 ]
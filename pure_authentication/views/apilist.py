@@ -12,9 +12,15 @@ def api_list_view(request):
         {"url": "/cart/add_to_cart", "method": "POST", "name": "Add to Cart", "description": "Add product to cart"},
         {"url": "/cart/get_cart", "method": "GET", "name": "Get Cart", "description": "Retrieve user's cart"},
         {"url": "/cart/remove_from_cart", "method": "POST", "name": "Remove from Cart", "description": "Remove item from cart"},
+        {"url": "/cart/update_cart", "method": "PATCH", "name": "Update Cart", "description": "Apply add/set/remove operations to the cart"},
         {"url": "/cart/clear_cart", "method": "POST", "name": "Clear Cart", "description": "Clear all items from cart"},
-        {"url": "/order/get_all_orders", "method": "GET", "name": "Get All Orders", "description": "Retrieve all orders for user"},
+        {"url": "/order/order_history/", "method": "GET", "name": "Order History", "description": "Page through a user's orders, newest first (user_id, limit, cursor, include_items)"},
+        {"url": "/order/place_order/", "method": "POST", "name": "Place Order", "description": "Create an order from the user's cart; send an Idempotency-Key header to make retries safe"},
+        {"url": "/order/sales_report/", "method": "GET", "name": "Sales Report", "description": "Revenue, units and orders per hour/day by product, category or total, from the rollups (staff only)"},
+        {"url": "/order/transition_orders/", "method": "POST", "name": "Transition Orders", "description": "Move many orders to a new status in chunks; cancellations restock (staff only)"},
+        {"url": "/order/get_order/", "method": "GET", "name": "Get Order", "description": "Retrieve one order by id"},
         {"url": "/product/get_all_products", "method": "GET", "name": "Get All Products", "description": "List all products"},
         {"url": "/product/get_product", "method": "GET", "name": "Get Product", "description": "Get product details by ID or slug"},
+        {"url": "/product/import_products", "method": "POST", "name": "Import Products", "description": "Upsert products by SKU from a CSV/NDJSON upload (staff only)"},
     ]
     return render(request, "apilist.html", {"api_endpoints": api_endpoints}) 
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from pure_authentication.metrics import render_metrics
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this process, only reachable from METRICS_ALLOWED_IPS
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")